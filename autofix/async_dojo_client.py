@@ -0,0 +1,327 @@
+"""Asyncio DefectDojo API client for use inside the controller event loop."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Iterable
+
+import aiohttp
+
+from .config import Config
+from .decoding import get_decoder
+from .dojo_client import (
+    PRODUCT_BUFFER_ITEMS,
+    TransferStats,
+    _close_payload,
+    _finding_from_item,
+    _StreamEnd,
+)
+from .models import Finding, Severity
+from .paging import PageSizeTuner
+from .transport import RETRY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_session(config: Config, limit: int = 20) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session to share between AsyncDojoClient instances.
+
+    All clients built on the same session share one connection pool.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=max(limit, max(1, len(config.product_ids)) * config.defectdojo_concurrency)
+        ),
+        timeout=aiohttp.ClientTimeout(total=config.defectdojo_timeout),
+    )
+
+
+class AsyncDojoClient:
+    """
+    Non-blocking counterpart to DojoClient built on aiohttp.
+
+    Pass a shared ``session`` (see create_http_session) to reuse one
+    connection pool across clients; otherwise the client owns its session
+    and closes it in close() / ``async with``.
+    """
+
+    def __init__(self, config: Config, session: aiohttp.ClientSession | None = None):
+        self.config = config
+        self.base_url = config.defectdojo_url
+        self._owns_session = session is None
+        self.session = session or create_http_session(config)
+        self.headers = {
+            "Authorization": f"Token {config.defectdojo_api_key}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        }
+        self.stats = TransferStats()
+        self.decoder = get_decoder(config.defectdojo_json_decoder)
+        self.page_sizes = PageSizeTuner(
+            config.defectdojo_page_state_path,
+            initial=config.defectdojo_page_size,
+            target_seconds=config.defectdojo_page_seconds,
+        )
+
+    async def __aenter__(self) -> "AsyncDojoClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if this client created it."""
+        if self._owns_session and not self.session.closed:
+            await self.session.close()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        data: bytes | None = None,
+        allowed_statuses: frozenset[int] = frozenset(),
+    ) -> tuple[int, bytes]:
+        """
+        Send a request, retrying 429/5xx with jittered exponential backoff.
+
+        Raises aiohttp.ClientResponseError for error statuses not listed in
+        ``allowed_statuses``.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.session.request(
+                    method, url, params=params, data=data, headers=self.headers
+                ) as response:
+                    body = await response.read()
+                    if (
+                        response.status not in RETRY_STATUSES
+                        or attempt >= self.config.defectdojo_max_retries
+                    ):
+                        if response.status >= 400 and response.status not in allowed_statuses:
+                            response.raise_for_status()
+                        return response.status, body
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.config.defectdojo_max_retries:
+                    raise
+                retry_after = None
+
+            backoff = 0.5 * 2 ** attempt
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else (
+                backoff / 2 + random.uniform(0, backoff / 2)
+            )
+            attempt += 1
+            logger.debug(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def _get_page(self, url: str, params: dict) -> dict:
+        """Fetch and decode a single page."""
+        _, body = await self._request("GET", url, params=params)
+        data = self.decoder.decode_page(body)
+        self.stats.record_page(len(body), len(data.get("results", [])))
+        return data
+
+    async def _get_paginated(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        concurrency: int = 1,
+    ) -> AsyncIterator[dict]:
+        """
+        Fetch all pages from a paginated endpoint.
+
+        The first page gives the total ``count``; the remaining offsets are
+        fetched with up to ``concurrency`` requests in flight. Results are
+        yielded in offset order. The page size is picked by
+        ``self.page_sizes`` at the start of the stream (unless ``params``
+        pins a ``limit``), and page timings feed back into it for later
+        streams; unlike DojoClient the size does not change mid-stream.
+        """
+        url = f"{self.base_url}/api/v2/{endpoint}/"
+        params = {key: str(value) for key, value in (params or {}).items()}
+        fixed_limit = params.pop("limit", None)
+        limit = int(fixed_limit) if fixed_limit else self.page_sizes.limit_for(endpoint)
+
+        async def fetch(offset: int) -> dict:
+            start = time.perf_counter()
+            data = await self._get_page(url, {**params, "limit": str(limit), "offset": str(offset)})
+            if not fixed_limit:
+                self.page_sizes.record(
+                    endpoint, limit, time.perf_counter() - start, len(data.get("results", []))
+                )
+            return data
+
+        first = await fetch(0)
+        results = first.get("results", [])
+        for item in results:
+            yield item
+        if not first.get("next") or not results:
+            self.page_sizes.save()
+            return
+
+        # A short first page with more to come means the server caps the size
+        step = len(results)
+        if step < limit and not fixed_limit:
+            self.page_sizes.record_server_cap(endpoint, step)
+
+        pending: deque[asyncio.Task] = deque()
+        try:
+            for offset in range(step, first.get("count", 0), step):
+                pending.append(asyncio.create_task(fetch(offset)))
+                if len(pending) >= max(1, concurrency):
+                    for item in (await pending.popleft()).get("results", []):
+                        yield item
+
+            while pending:
+                for item in (await pending.popleft()).get("results", []):
+                    yield item
+        finally:
+            # Cancel in-flight pages if the consumer stops early or we're cancelled
+            for task in pending:
+                task.cancel()
+            self.page_sizes.save()
+
+    async def iter_open_findings(
+        self,
+        severity_levels: list[str] | None = None,
+        concurrency: int | None = None,
+        slim: bool = True,
+    ) -> AsyncIterator[Finding]:
+        """Stream open findings, one request stream per severity level."""
+        if severity_levels is None:
+            severity_levels = [Severity.CRITICAL.value, Severity.HIGH.value]
+        if concurrency is None:
+            concurrency = self.config.defectdojo_concurrency
+
+        params = {
+            "active": "true",
+            "duplicate": "false",
+            "is_mitigated": "false",
+        }
+
+        async def fetch(product_id: int | None) -> AsyncIterator[dict]:
+            product_params = {**params, "test__engagement__product": product_id} if product_id else params
+            for severity_level in severity_levels:
+                stream_params = {**product_params, "severity": severity_level}
+                async for item in self._get_paginated("findings", stream_params, concurrency):
+                    # Guard against servers that ignore the severity filter
+                    if item.get("severity", "") == severity_level:
+                        yield item
+
+        self.stats = TransferStats()
+        product_ids = self.config.product_ids or [None]
+        seen: set[int] = set()
+
+        if len(product_ids) == 1:
+            streams = [(product_ids[0], fetch(product_ids[0]))]
+            tasks = []
+        else:
+            # Fetch every product concurrently through bounded buffers and
+            # merge in configuration order; products ahead of the merge
+            # pause once their buffer is full
+            buffers = [asyncio.Queue(maxsize=PRODUCT_BUFFER_ITEMS) for _ in product_ids]
+            tasks = [
+                asyncio.create_task(_stream_into(fetch(pid), buffer))
+                for pid, buffer in zip(product_ids, buffers)
+            ]
+            streams = [(pid, _drain(buffer)) for pid, buffer in zip(product_ids, buffers)]
+
+        try:
+            for product_id, stream in streams:
+                async for item in stream:
+                    if item["id"] in seen:
+                        continue
+                    seen.add(item["id"])
+                    item["product_id"] = product_id
+                    self.stats.records_kept += 1
+                    yield _finding_from_item(item, slim=slim)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_open_findings(
+        self,
+        severity_levels: list[str] | None = None,
+        concurrency: int | None = None,
+    ) -> list[Finding]:
+        """Fetch open findings from DefectDojo, with full text fields."""
+        findings = [
+            finding
+            async for finding in self.iter_open_findings(severity_levels, concurrency, slim=False)
+        ]
+        logger.info(f"Fetched {len(findings)} open findings from DefectDojo")
+        return findings
+
+    async def get_finding_by_id(self, finding_id: int) -> Finding | None:
+        """Fetch a single finding by ID."""
+        url = f"{self.base_url}/api/v2/findings/{finding_id}/"
+        status, body = await self._request("GET", url, allowed_statuses=frozenset({404}))
+
+        if status == 404:
+            return None
+        return _finding_from_item(self.decoder.decode_finding(body))
+
+    async def close_finding(self, finding_id: int, notes: str = "") -> bool:
+        """Mark a finding as mitigated/closed."""
+        return await self._patch_finding(finding_id, _close_payload(notes))
+
+    async def close_findings(
+        self,
+        finding_ids: Iterable[int],
+        notes: str | dict[int, str] = "",
+        concurrency: int | None = None,
+    ) -> dict[int, bool]:
+        """Close many findings concurrently; see DojoClient.close_findings."""
+        if concurrency is None:
+            concurrency = self.config.defectdojo_concurrency
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        finding_ids = list(dict.fromkeys(finding_ids))
+        bodies: dict[str, bytes] = {}
+
+        async def close_one(finding_id: int) -> bool:
+            note = notes.get(finding_id, "") if isinstance(notes, dict) else notes
+            if note not in bodies:
+                bodies[note] = _close_payload(note)
+            async with semaphore:
+                return await self._patch_finding(finding_id, bodies[note])
+
+        outcomes = await asyncio.gather(*(close_one(fid) for fid in finding_ids))
+        return dict(zip(finding_ids, outcomes))
+
+    async def _patch_finding(self, finding_id: int, body: bytes) -> bool:
+        """Send a pre-encoded PATCH for one finding."""
+        url = f"{self.base_url}/api/v2/findings/{finding_id}/"
+        try:
+            status, _ = await self._request("PATCH", url, data=body)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to close finding {finding_id}: {e}")
+            return False
+        return status == 200
+
+
+async def _stream_into(items: AsyncIterator[dict], buffer: asyncio.Queue) -> None:
+    """Copy ``items`` into a bounded buffer, then a _StreamEnd carrying any error."""
+    end = _StreamEnd()
+    try:
+        async for item in items:
+            await buffer.put(item)
+    except Exception as e:
+        end.error = e
+    await buffer.put(end)
+
+
+async def _drain(buffer: asyncio.Queue) -> AsyncIterator[dict]:
+    """Yield buffered items until the stream ends, re-raising its error."""
+    while True:
+        item = await buffer.get()
+        if isinstance(item, _StreamEnd):
+            if item.error:
+                raise item.error
+            return
+        yield item
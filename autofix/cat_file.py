@@ -0,0 +1,137 @@
+"""Long-lived git cat-file coprocesses for reading repository objects."""
+
+import logging
+import subprocess
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectInfo(NamedTuple):
+    """What ``git cat-file --batch-check`` reports about an object."""
+
+    sha: str
+    type: str
+    size: int
+
+
+class CatFile:
+    """
+    Reads objects through ``git cat-file --batch`` and ``--batch-check``.
+
+    Each coprocess is started on first use and then answers every request
+    over its pipes, so reading a file at any ref (``"<ref>:<path>"``) or
+    checking whether it exists costs a pipe round trip instead of a fork.
+    Calls are serialized with a lock; a coprocess that exits is restarted
+    on the next request. Starts are recorded on ``stats`` (a GitStats) if
+    given.
+    """
+
+    def __init__(self, repo_path: Path, stats=None):
+        self.repo_path = repo_path
+        self.stats = stats
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def read(self, spec: str) -> bytes | None:
+        """
+        Contents of an object.
+
+        Args:
+            spec: Anything git rev-parse accepts, such as a blob ID or
+                ``"<ref>:<path>"``.
+
+        Returns:
+            The raw object bytes, or None if it does not exist.
+        """
+        with self._lock:
+            proc = self._request("--batch", spec)
+            info = self._read_header(proc, spec)
+            if info is None:
+                return None
+            content = _read_exact(proc.stdout, info.size)
+            proc.stdout.read(1)  # newline after the content
+            return content
+
+    def info(self, spec: str) -> ObjectInfo | None:
+        """Object ID, type and size, or None if it does not exist."""
+        with self._lock:
+            proc = self._request("--batch-check", spec)
+            return self._read_header(proc, spec)
+
+    def read_text(self, ref: str, path: str) -> str | None:
+        """A file's text at ``ref``, or None if missing, not a file or not UTF-8."""
+        content = self.read(f"{ref}:{path}")
+        if content is None:
+            return None
+        try:
+            return content.decode()
+        except UnicodeDecodeError:
+            return None
+
+    def close(self) -> None:
+        """Stop the coprocesses; they restart if used again."""
+        with self._lock:
+            for proc in self._procs.values():
+                _stop(proc)
+            self._procs.clear()
+
+    def __enter__(self) -> "CatFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _request(self, mode: str, spec: str) -> subprocess.Popen:
+        if "\n" in spec:
+            raise ValueError(f"Object name cannot contain a newline: {spec!r}")
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._procs[mode] = proc
+            if self.stats is not None:
+                self.stats.record(f"git cat-file {mode}", 0.0)
+            logger.debug(f"Started git cat-file {mode} in {self.repo_path}")
+        proc.stdin.write(spec.encode() + b"\n")
+        proc.stdin.flush()
+        return proc
+
+    def _read_header(self, proc: subprocess.Popen, spec: str) -> ObjectInfo | None:
+        header = proc.stdout.readline()
+        if not header:
+            raise RuntimeError(f"git cat-file exited while reading {spec}")
+        fields = header.decode().split()
+        # "<spec> missing" or "<spec> ambiguous"
+        if len(fields) != 3 or not fields[2].isdigit():
+            return None
+        return ObjectInfo(fields[0], fields[1], int(fields[2]))
+
+
+def _read_exact(stream, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            raise RuntimeError("git cat-file output ended early")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    try:
+        proc.stdin.close()
+        proc.wait(timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        proc.kill()
+        proc.wait()
+    finally:
+        proc.stdout.close()
@@ -8,12 +8,17 @@ from pathlib import Path
 import typer
 
 from .config import Config
-from .dojo_client import DojoClient, group_findings_by_image
+from .dojo_client import DojoClient, first_finding_by_image
+from .finding_store import FindingStore
 from .fixer import generate_fix_suggestions
-from .git_client import GitClient, apply_fix
+from .forge import ForgeClient, PullRequestSpec
+from .fix_batches import BATCH_KEYS, group_suggestions
+from .git_client import GitClient, apply_fix, apply_fix_batch
 from .helm.scanner import HelmScanner
 from .helm.roadmap import generate_roadmap
+from .models import FixResult
 from .slo_tracker import SLOTracker
+from .worktree_pool import WorktreePool
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +47,35 @@ def scan_and_fix(
         "-s",
         help="Severity levels to process",
     ),
+    concurrency: int = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        help="Pages to fetch from DefectDojo in parallel (default: DEFECTDOJO_CONCURRENCY)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        "-i",
+        help="Only fetch findings changed since the last run (uses FINDING_STORE_PATH)",
+    ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Fixes to apply in parallel, each in its own git worktree (default: GIT_WORKERS)",
+    ),
+    batch_by: str = typer.Option(
+        None,
+        "--batch-by",
+        "-b",
+        help=f"Group fixes into shared PRs by {', '.join(BATCH_KEYS)} (default: FIX_BATCH_BY)",
+    ),
+    branches: int = typer.Option(
+        None,
+        "--branches",
+        help="Most branches/PRs to open in batch mode (default: FIX_BATCH_BRANCHES)",
+    ),
 ) -> None:
     """Fetch findings from DefectDojo, generate fixes, and create PRs."""
     try:
@@ -50,74 +84,151 @@ def scan_and_fix(
         typer.echo(f"Configuration error: {e}", err=True)
         raise typer.Exit(1)
 
+    batch_by = (batch_by or config.fix_batch_by).lower()
+    if batch_by and batch_by not in BATCH_KEYS:
+        typer.echo(f"Configuration error: --batch-by must be one of {', '.join(BATCH_KEYS)}", err=True)
+        raise typer.Exit(1)
+
     typer.echo("🔍 Connecting to DefectDojo...")
     dojo_client = DojoClient(config)
-    git_client = GitClient(config)
     slo_tracker = SLOTracker(config)
 
-    # Fetch findings
-    typer.echo(f"📥 Fetching open {', '.join(severity)} findings...")
-    findings = dojo_client.fetch_open_findings(severity)
-
-    if not findings:
-        typer.echo("✅ No open findings found!")
-        return
-
-    typer.echo(f"Found {len(findings)} open findings")
-
-    # Group by image
-    grouped = group_findings_by_image(findings)
-    typer.echo(f"Grouped into {len(grouped)} unique images/components")
+    # Closing the client reaps its cat-file processes on every exit path
+    with GitClient(config) as git_client:
+        # Fetch findings
+        typer.echo(f"📥 Fetching open {', '.join(severity)} findings...")
+        if incremental:
+            # Sync the local snapshot, then group and de-duplicate in SQLite
+            store = FindingStore(config.finding_store_path)
+            try:
+                total_findings = dojo_client.sync_open_findings(store, severity, concurrency=concurrency)
+                grouped = store.group_by_image(severity)
+                representatives = store.image_representatives(severity)
+            finally:
+                store.close()
+        else:
+            # Stream slim findings, keeping only a count and the first per image
+            total_findings, grouped = first_finding_by_image(
+                dojo_client.iter_open_findings(severity, concurrency=concurrency)
+            )
+            representatives = list(grouped.values())
 
-    # Generate fix suggestions
-    typer.echo("🔧 Generating fix suggestions...")
-    suggestions = generate_fix_suggestions(findings)
+        if not total_findings:
+            typer.echo("✅ No open findings found!")
+            return
 
-    if not suggestions:
-        typer.echo("⚠️  No auto-fixable vulnerabilities found")
-        return
-
-    typer.echo(f"Generated {len(suggestions)} fix suggestions:")
-    for s in suggestions:
-        typer.echo(f"  • {s.current_image}: {s.current_tag} → {s.suggested_tag}")
+        typer.echo(f"Found {total_findings} open findings")
+        stats = dojo_client.stats
+        typer.echo(
+            f"Transferred {stats.records_transferred} records "
+            f"({stats.bytes_transferred / 1024:.1f} KiB), kept {stats.records_kept}"
+        )
+        http = dojo_client.session.metrics
+        typer.echo(
+            f"HTTP: {http.requests} requests, {http.retries} retries, "
+            f"{http.average_seconds * 1000:.0f} ms average latency"
+        )
+        typer.echo(f"Grouped into {len(grouped)} unique images/components")
 
-    if dry_run:
-        typer.echo("\n🏃 Dry run mode - no changes made")
-        return
+        # Generate fix suggestions
+        typer.echo("🔧 Generating fix suggestions...")
+        suggestions = generate_fix_suggestions(representatives)
 
-    # Start SLO tracking
-    slo_tracker.start_run(
-        total_findings=len(findings),
-        auto_fixable=len(suggestions),
-    )
+        if not suggestions:
+            typer.echo("⚠️  No auto-fixable vulnerabilities found")
+            return
 
-    # Apply fixes
-    typer.echo("\n🚀 Applying fixes...")
-    success_count = 0
+        # One read-only pass over the manifests finds the files every fix touches
+        plan = git_client.plan_manifest_updates(suggestions)
 
-    for suggestion in suggestions:
-        typer.echo(f"\nProcessing: {suggestion.full_current_image}...")
-        result = apply_fix(git_client, suggestion)
+        typer.echo(f"Generated {len(suggestions)} fix suggestions:")
+        for s in suggestions:
+            typer.echo(
+                f"  • {s.current_image}: {s.current_tag} → {s.suggested_tag} "
+                f"({len(plan[s])} files)"
+            )
+            if dry_run:
+                for path in plan[s]:
+                    typer.echo(f"      {path}")
+                pending = git_client.pending_fix_branch(s, plan[s])
+                if pending:
+                    typer.echo(f"      already bumped on {pending}")
+
+        if dry_run:
+            typer.echo("\n🏃 Dry run mode - no changes made")
+            return
+
+        # Start SLO tracking
+        slo_tracker.start_run(
+            total_findings=total_findings,
+            auto_fixable=len(suggestions),
+        )
 
-        if result.success:
-            typer.echo(f"  ✅ PR created: {result.pr_url}")
-            slo_tracker.record_fix(result.pr_url or "")
-            success_count += 1
+        # Apply fixes
+        typer.echo("\n🚀 Applying fixes...")
+        success_count = 0
+
+        def report(result: FixResult, record: bool = True) -> None:
+            nonlocal success_count
+            if result.success:
+                typer.echo(f"  ✅ PR created: {result.pr_url}")
+                if record:
+                    slo_tracker.record_fix(result.pr_url or "")
+                success_count += 1
+            else:
+                typer.echo(f"  ❌ Failed: {result.error}")
+
+        # Nothing to change for these, so don't create branches for them
+        for suggestion in suggestions:
+            if not plan[suggestion]:
+                typer.echo(f"\nProcessing: {suggestion.full_current_image}...")
+                typer.echo(f"  ❌ Failed: No manifests found referencing {suggestion.full_current_image}")
+        fixable = [s for s in suggestions if plan[s]]
+
+        workers = workers or config.git_workers
+        if batch_by:
+            batches = group_suggestions(
+                fixable, plan, batch_by, branches or config.fix_batch_branches, config.git_repo_path
+            )
+            for batch in batches:
+                typer.echo(f"\n📦 {batch.label}: {len(batch.suggestions)} fixes in one PR")
+                results = apply_fix_batch(git_client, batch.suggestions, batch.label)
+                for result in results:
+                    typer.echo(f"  {result.suggestion.full_current_image}")
+                    report(result, record=False)
+                # The batch shares one PR: record it once with all of its fixes
+                fixed = [result for result in results if result.success]
+                if fixed:
+                    slo_tracker.record_fix(fixed[0].pr_url or "", fixes=len(fixed))
+        elif workers > 1 and len(fixable) > 1:
+            typer.echo(f"Applying {len(fixable)} fixes with {workers} worktree workers")
+
+            def report_parallel(result: FixResult) -> None:
+                typer.echo(f"\nProcessed: {result.suggestion.full_current_image}")
+                report(result)
+
+            with WorktreePool(config, workers, stats=git_client.stats) as pool:
+                pool.apply_all(fixable, on_result=report_parallel)
         else:
-            typer.echo(f"  ❌ Failed: {result.error}")
+            for suggestion in fixable:
+                typer.echo(f"\nProcessing: {suggestion.full_current_image}...")
+                report(apply_fix(git_client, suggestion))
 
-    # Complete SLO tracking
-    record = slo_tracker.complete_run()
+        # Complete SLO tracking
+        record = slo_tracker.complete_run()
 
     # Summary
     typer.echo("\n" + "=" * 50)
     typer.echo("📊 Summary")
     typer.echo("=" * 50)
-    typer.echo(f"Total findings:    {len(findings)}")
+    typer.echo(f"Total findings:    {total_findings}")
     typer.echo(f"Auto-fixable:      {len(suggestions)}")
     typer.echo(f"Successfully fixed: {success_count}")
     if record:
         typer.echo(f"SLO:               {record.slo_percentage:.1f}%")
+    git_stats = git_client.stats
+    busiest = ", ".join(f"{cmd} ×{n}" for cmd, n in git_stats.by_command.most_common(3))
+    typer.echo(f"Git processes:     {git_stats.processes} in {git_stats.total_seconds:.1f}s ({busiest})")
 
 
 @app.command()
@@ -185,6 +296,23 @@ def list_findings(
         help="Severity levels to filter",
     ),
     limit: int = typer.Option(20, "--limit", "-l", help="Max findings to show"),
+    concurrency: int = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        help="Pages to fetch from DefectDojo in parallel (default: DEFECTDOJO_CONCURRENCY)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        "-i",
+        help="Sync changes into the local finding store and list from it",
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        help="List from the local finding store without contacting DefectDojo",
+    ),
 ) -> None:
     """List open findings from DefectDojo."""
     try:
@@ -193,25 +321,99 @@ def list_findings(
         typer.echo(f"Configuration error: {e}", err=True)
         raise typer.Exit(1)
 
-    dojo_client = DojoClient(config)
-    findings = dojo_client.fetch_open_findings(severity)
+    if incremental or offline:
+        store = FindingStore(config.finding_store_path)
+        try:
+            if offline:
+                total = store.count(severity)
+            else:
+                total = DojoClient(config).sync_open_findings(store, severity, concurrency=concurrency)
+            findings = store.load_findings(severity, limit=limit)
+        finally:
+            store.close()
+    else:
+        # Stream slim findings and keep only the ones being shown
+        dojo_client = DojoClient(config)
+        findings = []
+        total = 0
+        for finding in dojo_client.iter_open_findings(severity, concurrency=concurrency):
+            if total < limit:
+                findings.append(finding)
+            total += 1
 
     if not findings:
         typer.echo("No open findings found")
         return
 
-    typer.echo(f"Found {len(findings)} open findings:\n")
+    typer.echo(f"Found {total} open findings:\n")
 
     for finding in findings[:limit]:
         severity_icon = "🔴" if finding.severity.value == "Critical" else "🟠"
         typer.echo(f"{severity_icon} [{finding.severity.value}] {finding.title}")
         if finding.image_tag:
             typer.echo(f"   Image: {finding.image_tag}")
+        if len(config.product_ids) > 1:
+            typer.echo(f"   Product: {finding.product_id}")
         typer.echo(f"   ID: {finding.id}")
         typer.echo()
 
-    if len(findings) > limit:
-        typer.echo(f"... and {len(findings) - limit} more")
+    if total > limit:
+        typer.echo(f"... and {total - limit} more")
+
+
+@app.command()
+def close_findings(
+    image: str = typer.Argument(..., help="Fixed image reference (e.g., nginx:1.23.1)"),
+    note: str = typer.Option("", "--note", help="Note to attach to each closed finding"),
+    severity: list[str] = typer.Option(
+        ["Critical", "High", "Medium", "Low", "Info"],
+        "--severity",
+        "-s",
+        help="Severity levels to close",
+    ),
+    concurrency: int = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        help="Requests to DefectDojo in flight (default: DEFECTDOJO_CONCURRENCY)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-n",
+        help="Show what would be closed without making changes",
+    ),
+) -> None:
+    """Close all open findings for an image once its fix has merged."""
+    try:
+        config = Config.from_env()
+    except ValueError as e:
+        typer.echo(f"Configuration error: {e}", err=True)
+        raise typer.Exit(1)
+
+    dojo_client = DojoClient(config)
+    finding_ids = [
+        finding.id
+        for finding in dojo_client.iter_open_findings(severity, concurrency=concurrency)
+        if finding.image_tag == image
+    ]
+
+    if not finding_ids:
+        typer.echo(f"No open findings for {image}")
+        return
+
+    if dry_run:
+        typer.echo(f"🏃 Dry run - would close {len(finding_ids)} findings for {image}")
+        return
+
+    typer.echo(f"🔒 Closing {len(finding_ids)} findings for {image}...")
+    results = dojo_client.close_findings(finding_ids, note, concurrency=concurrency)
+
+    failed = [finding_id for finding_id, closed in results.items() if not closed]
+    typer.echo(f"✅ Closed {len(results) - len(failed)}/{len(results)} findings")
+    if failed:
+        typer.echo(f"❌ Failed: {', '.join(str(i) for i in failed)}")
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -566,6 +768,7 @@ def helm_upgrade_pr(
     from collections import defaultdict
 
     # Validate Git configuration
+    config = Config.from_env(require_defectdojo=False)
     git_token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GIT_TOKEN")
     repo_url = os.environ.get("GIT_REPO_URL")
 
@@ -650,12 +853,51 @@ def helm_upgrade_pr(
 
         processed_releases.append((release, old_version, new_version))
 
-    if batch:
-        # Batch mode: Group by priority and create one PR per priority
-        _create_batched_prs(processed_releases, git_root, scanner, step)
-    else:
-        # Individual mode: Create one PR per chart
-        _create_individual_prs(processed_releases, git_root, scanner, step)
+    # PRs go through the REST API over one pooled session
+    try:
+        forge = ForgeClient.for_remote(
+            config.git_platform,
+            repo_url,
+            git_token,
+            api_url=config.git_api_url,
+        )
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1)
+
+    try:
+        if batch:
+            # Batch mode: Group by priority and create one PR per priority
+            _create_batched_prs(
+                processed_releases, git_root, scanner, step, forge, config.git_pr_concurrency
+            )
+        else:
+            # Individual mode: Create one PR per chart
+            _create_individual_prs(
+                processed_releases, git_root, scanner, step, forge, config.git_pr_concurrency
+            )
+    finally:
+        forge.close()
+
+
+def _open_pending_prs(
+    forge: ForgeClient,
+    pending: list[tuple[str, PullRequestSpec]],
+    concurrency: int,
+) -> int:
+    """Open PRs for the pushed branches, ``concurrency`` at a time, and report each one."""
+    if not pending:
+        return 0
+
+    typer.echo(f"\n🔗 Opening {len(pending)} PR(s)...")
+    urls = forge.create_pull_requests([spec for _, spec in pending], concurrency)
+    for (label, spec), pr_url in zip(pending, urls):
+        if pr_url:
+            typer.echo(f"   ✅ {label}: PR created: {pr_url}")
+        else:
+            typer.echo(f"   ⚠️  {label}: PR creation failed")
+            typer.echo(f"   Branch '{spec.head}' is ready for manual PR creation")
+    return sum(1 for pr_url in urls if pr_url)
 
 
 def _create_batched_prs(
@@ -663,6 +905,8 @@ def _create_batched_prs(
     git_root: Path,
     scanner,
     step: bool,
+    forge: ForgeClient,
+    pr_concurrency: int,
 ) -> None:
     """Create one PR per priority level containing all upgrades of that priority."""
     import re
@@ -676,7 +920,7 @@ def _create_batched_prs(
 
     typer.echo("\n🚀 Creating batched upgrade PRs...")
 
-    success_count = 0
+    pending: list[tuple[str, PullRequestSpec]] = []
     priority_order = ["critical", "major", "minor"]
 
     for priority_level in priority_order:
@@ -797,21 +1041,12 @@ This PR contains **{len(changes)} {priority_level} upgrade(s)**.
 🤖 Generated by autofix-dojo
 """
 
-        pr_result = subprocess.run(
-            ["gh", "pr", "create", "--title", pr_title, "--body", pr_body, "--head", branch_name],
-            cwd=git_root, capture_output=True, text=True
-        )
+        pending.append((priority_level, PullRequestSpec(branch_name, pr_title, pr_body)))
 
         # Return to main branch
         subprocess.run(["git", "checkout", "master"], cwd=git_root, capture_output=True)
 
-        if pr_result.returncode == 0:
-            pr_url = pr_result.stdout.strip()
-            typer.echo(f"   ✅ PR created: {pr_url}")
-            success_count += 1
-        else:
-            typer.echo(f"   ⚠️  PR creation failed: {pr_result.stderr}")
-            typer.echo(f"   Branch '{branch_name}' is ready for manual PR creation")
+    success_count = _open_pending_prs(forge, pending, pr_concurrency)
 
     typer.echo("\n" + "=" * 50)
     typer.echo(f"📊 Created {success_count} batched PR(s)")
@@ -822,6 +1057,8 @@ def _create_individual_prs(
     git_root: Path,
     scanner,
     step: bool,
+    forge: ForgeClient,
+    pr_concurrency: int,
 ) -> None:
     """Create one PR per chart (original behavior)."""
     import re
@@ -829,7 +1066,7 @@ def _create_individual_prs(
 
     typer.echo("\n🚀 Creating individual upgrade PRs...")
 
-    success_count = 0
+    pending: list[tuple[str, PullRequestSpec]] = []
     for release, old_version, new_version in processed_releases:
         typer.echo(f"\nProcessing {release.chart}...")
 
@@ -917,19 +1154,11 @@ def _create_individual_prs(
 🤖 Generated by autofix-dojo
 """
 
-        pr_result = subprocess.run(
-            ["gh", "pr", "create", "--title", pr_title, "--body", pr_body, "--head", branch_name],
-            cwd=git_root, capture_output=True, text=True
-        )
+        pending.append((release.chart, PullRequestSpec(branch_name, pr_title, pr_body)))
 
         subprocess.run(["git", "checkout", "master"], cwd=git_root, capture_output=True)
 
-        if pr_result.returncode == 0:
-            pr_url = pr_result.stdout.strip()
-            typer.echo(f"   ✅ PR created: {pr_url}")
-            success_count += 1
-        else:
-            typer.echo(f"   ⚠️  PR creation failed: {pr_result.stderr}")
+    success_count = _open_pending_prs(forge, pending, pr_concurrency)
 
     typer.echo("\n" + "=" * 50)
     typer.echo(f"📊 Created {success_count}/{len(processed_releases)} upgrade PRs")
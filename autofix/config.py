@@ -1,7 +1,7 @@
 """Configuration management via environment variables."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -15,12 +15,30 @@ class Config:
     defectdojo_url: str
     defectdojo_api_key: str
     defectdojo_product_id: int | None = None
+    defectdojo_product_ids: list[int] = field(default_factory=list)
+    defectdojo_concurrency: int = 1
+    defectdojo_timeout: float = 30.0
+    defectdojo_max_retries: int = 5
+    defectdojo_cache_path: Path | None = None
+    defectdojo_cache_max_bytes: int = 64 * 1024 * 1024
+    defectdojo_json_decoder: str = "auto"  # "auto", "msgspec", "orjson" or "json"
+    defectdojo_page_size: int = 1000  # largest page size; shrinks when pages are slow
+    defectdojo_page_seconds: float = 5.0  # target response time per page
+    defectdojo_page_state_path: Path | None = None
 
     # Git settings
     git_repo_path: Path = Path(".")
     git_remote: str = "origin"
     git_main_branch: str = "main"
     git_platform: str = "github"  # "github" or "gitlab"
+    git_commit_mode: str = "worktree"  # "worktree" or "plumbing"
+    git_token: str | None = None  # enables REST PR creation; gh/glab are used otherwise
+    git_api_url: str | None = None  # default: derived from the remote URL
+    git_pr_concurrency: int = 4
+    git_workers: int = 1  # fixes applied in parallel, each in its own git worktree
+    git_worktree_dir: Path | None = None  # default: <git dir>/autofix/worktrees
+    fix_batch_by: str = ""  # "", "directory", "namespace" or "confidence"
+    fix_batch_branches: int = 1  # most branches/PRs a batched run opens
 
     # Argo CD settings
     argo_enabled: bool = False
@@ -28,32 +46,82 @@ class Config:
     # SLO tracking
     slo_db_path: Path = Path("slo_data.json")
 
+    # Local finding snapshot for incremental sync
+    finding_store_path: Path = Path("findings.db")
+
+    @property
+    def product_ids(self) -> list[int]:
+        """All DefectDojo products to query, without duplicates."""
+        ids = self.defectdojo_product_ids or (
+            [self.defectdojo_product_id] if self.defectdojo_product_id else []
+        )
+        return list(dict.fromkeys(ids))
+
     @classmethod
-    def from_env(cls) -> "Config":
-        """Load configuration from environment variables."""
+    def from_env(cls, require_defectdojo: bool = True) -> "Config":
+        """
+        Load configuration from environment variables.
+
+        Args:
+            require_defectdojo: Fail unless DEFECTDOJO_URL and
+                DEFECTDOJO_API_KEY are set. Commands that never talk to
+                DefectDojo pass False.
+        """
         load_dotenv()
 
-        defectdojo_url = os.getenv("DEFECTDOJO_URL")
-        defectdojo_api_key = os.getenv("DEFECTDOJO_API_KEY")
+        defectdojo_url = os.getenv("DEFECTDOJO_URL", "")
+        defectdojo_api_key = os.getenv("DEFECTDOJO_API_KEY", "")
 
-        if not defectdojo_url or not defectdojo_api_key:
+        if require_defectdojo and (not defectdojo_url or not defectdojo_api_key):
             raise ValueError(
                 "DEFECTDOJO_URL and DEFECTDOJO_API_KEY must be set"
             )
 
-        product_id_str = os.getenv("DEFECTDOJO_PRODUCT_ID")
-        product_id = int(product_id_str) if product_id_str else None
+        # DEFECTDOJO_PRODUCT_ID accepts a comma-separated list of products
+        product_ids = [
+            int(value)
+            for value in os.getenv("DEFECTDOJO_PRODUCT_ID", "").split(",")
+            if value.strip()
+        ]
 
         git_repo_path = os.getenv("GIT_REPO_PATH", ".")
+        cache_path = os.getenv("DEFECTDOJO_CACHE_PATH")
+        page_state_path = os.getenv("DEFECTDOJO_PAGE_STATE_PATH")
+        worktree_dir = os.getenv("GIT_WORKTREE_DIR")
+        git_platform = os.getenv("GIT_PLATFORM", "github").lower()
+        git_token = os.getenv("GIT_TOKEN") or (
+            os.getenv("GITHUB_TOKEN") or os.getenv("GH_TOKEN")
+            if git_platform == "github"
+            else os.getenv("GITLAB_TOKEN")
+        )
 
         return cls(
             defectdojo_url=defectdojo_url.rstrip("/"),
             defectdojo_api_key=defectdojo_api_key,
-            defectdojo_product_id=product_id,
+            defectdojo_product_id=product_ids[0] if product_ids else None,
+            defectdojo_product_ids=product_ids,
+            defectdojo_concurrency=int(os.getenv("DEFECTDOJO_CONCURRENCY", "1")),
+            defectdojo_timeout=float(os.getenv("DEFECTDOJO_TIMEOUT", "30")),
+            defectdojo_max_retries=int(os.getenv("DEFECTDOJO_MAX_RETRIES", "5")),
+            defectdojo_cache_path=Path(cache_path) if cache_path else None,
+            defectdojo_cache_max_bytes=int(os.getenv("DEFECTDOJO_CACHE_MAX_MB", "64")) * 1024 * 1024,
+            defectdojo_json_decoder=os.getenv("DEFECTDOJO_JSON_DECODER", "auto").lower(),
+            defectdojo_page_size=int(os.getenv("DEFECTDOJO_PAGE_SIZE", "1000")),
+            defectdojo_page_seconds=float(os.getenv("DEFECTDOJO_PAGE_SECONDS", "5")),
+            defectdojo_page_state_path=Path(page_state_path) if page_state_path else None,
             git_repo_path=Path(git_repo_path),
             git_remote=os.getenv("GIT_REMOTE", "origin"),
             git_main_branch=os.getenv("GIT_MAIN_BRANCH", "main"),
-            git_platform=os.getenv("GIT_PLATFORM", "github").lower(),
+            git_platform=git_platform,
+            git_commit_mode=os.getenv("GIT_COMMIT_MODE", "worktree").lower(),
+            git_token=git_token or None,
+            git_api_url=os.getenv("GIT_API_URL") or None,
+            git_pr_concurrency=int(os.getenv("GIT_PR_CONCURRENCY", "4")),
+            git_workers=int(os.getenv("GIT_WORKERS", "1")),
+            git_worktree_dir=Path(worktree_dir) if worktree_dir else None,
+            fix_batch_by=os.getenv("FIX_BATCH_BY", "").lower(),
+            fix_batch_branches=int(os.getenv("FIX_BATCH_BRANCHES", "1")),
             argo_enabled=os.getenv("ARGO_ENABLED", "false").lower() == "true",
             slo_db_path=Path(os.getenv("SLO_DB_PATH", "slo_data.json")),
+            finding_store_path=Path(os.getenv("FINDING_STORE_PATH", "findings.db")),
         )
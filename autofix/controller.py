@@ -2,6 +2,7 @@
 
 import argparse
 import asyncio
+import dataclasses
 import logging
 import os
 import signal
@@ -9,9 +10,13 @@ import sys
 from datetime import datetime, timezone
 from typing import Any
 
+import aiohttp
 from aiohttp import web
 from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
+from .async_dojo_client import AsyncDojoClient, create_http_session
+from .config import Config
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,29 +55,37 @@ LAST_SCAN_TIMESTAMP = Gauge(
 class AutofixController:
     """Controller that watches AutofixPolicy CRDs and reconciles state."""
 
-    def __init__(self, reconcile_interval: int = 60):
+    def __init__(self, reconcile_interval: int = 60, config: Config | None = None):
         self.reconcile_interval = reconcile_interval
+        self.config = config
         self.running = False
         self.policies: dict[str, dict[str, Any]] = {}
         self._shutdown_event = asyncio.Event()
+        self._http: aiohttp.ClientSession | None = None
 
     async def start(self) -> None:
         """Start the controller."""
         logger.info("Starting autofix-dojo controller")
         self.running = True
 
+        # One connection pool shared by every policy's DefectDojo client
+        if self.config:
+            self._http = create_http_session(self.config)
+
         # Start reconciliation loop
         reconcile_task = asyncio.create_task(self._reconcile_loop())
 
         # Wait for shutdown
         await self._shutdown_event.wait()
 
-        # Cleanup
+        # Cleanup: cancelling the loop cancels any in-flight DefectDojo requests
         reconcile_task.cancel()
         try:
             await reconcile_task
         except asyncio.CancelledError:
             pass
+        if self._http:
+            await self._http.close()
 
         logger.info("Controller stopped")
 
@@ -101,10 +114,43 @@ class AutofixController:
             # to list AutofixPolicy resources and reconcile each one
             # For now, this is a placeholder that demonstrates the pattern
             await self._mock_reconcile()
+
+            # Policies are independent, so reconcile them concurrently
+            results = await asyncio.gather(
+                *(self._reconcile_policy(name, policy) for name, policy in self.policies.items()),
+                return_exceptions=True,
+            )
+            for name, result in zip(self.policies, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Reconciliation of policy {name} failed: {result}")
+                    RECONCILE_TOTAL.labels(policy=name, status="error").inc()
+                else:
+                    RECONCILE_TOTAL.labels(policy=name, status="success").inc()
         except Exception as e:
             logger.error(f"Reconciliation failed: {e}")
             raise
 
+    async def _reconcile_policy(self, name: str, policy: dict[str, Any]) -> None:
+        """Reconcile a single AutofixPolicy: refresh its vulnerability gauges."""
+        vulnerabilities = policy.get("spec", {}).get("vulnerabilities", {})
+        if not self._http or not vulnerabilities.get("enabled", False):
+            return
+
+        severities = vulnerabilities.get("severities", ["Critical", "High"])
+        counts = dict.fromkeys(severities, 0)
+        # A policy may scope itself to its own DefectDojo products
+        config = self.config
+        if vulnerabilities.get("productIds"):
+            config = dataclasses.replace(config, defectdojo_product_ids=vulnerabilities["productIds"])
+        client = AsyncDojoClient(config, session=self._http)
+        async for finding in client.iter_open_findings(severities):
+            counts[finding.severity.value] += 1
+
+        for severity, count in counts.items():
+            VULNERABILITIES_FOUND.labels(policy=name, severity=severity).set(count)
+        LAST_SCAN_TIMESTAMP.labels(policy=name).set(datetime.now(timezone.utc).timestamp())
+        logger.info(f"Policy {name}: {sum(counts.values())} open findings")
+
     async def _mock_reconcile(self) -> None:
         """Mock reconciliation for demonstration."""
         # This would be replaced with actual K8s API calls
@@ -151,8 +197,15 @@ class HealthServer:
 
 async def main_async(args: argparse.Namespace) -> None:
     """Async main entry point."""
+    try:
+        config = Config.from_env()
+    except ValueError as e:
+        logger.warning(f"DefectDojo not configured, skipping vulnerability scans: {e}")
+        config = None
+
     controller = AutofixController(
-        reconcile_interval=int(args.reconcile_interval.rstrip("s"))
+        reconcile_interval=int(args.reconcile_interval.rstrip("s")),
+        config=config,
     )
 
     # Setup signal handlers
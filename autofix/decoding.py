@@ -0,0 +1,167 @@
+"""Pluggable JSON decoders for DefectDojo API responses.
+
+The stdlib decoder builds a dict for every field of every finding, including
+the dozens DefectDojo returns that autofix never reads. When msgspec is
+installed, finding pages are decoded straight into typed structs that keep
+only the fields Finding needs; unknown fields are skipped without being
+materialized. orjson is used as a faster generic decoder when msgspec is not
+available, and the stdlib json module is the fallback.
+
+Decoded items keep dict-style access (``item["id"]``, ``item.get(...)``), so
+the client code that consumes them does not care which decoder produced them.
+"""
+
+import json
+import logging
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+DECODER_NAMES = ("auto", "msgspec", "orjson", "json")
+
+
+class JSONDecoder:
+    """Generic decoder built on a ``loads`` function; items are plain dicts."""
+
+    name = "json"
+
+    def __init__(self, loads: Callable[[bytes], Any] = json.loads):
+        self.loads = loads
+
+    def decode_page(self, body: bytes) -> Any:
+        """Decode a paginated findings response."""
+        return self.loads(body)
+
+    def decode_finding(self, body: bytes) -> Any:
+        """Decode a single finding."""
+        return self.loads(body)
+
+
+class OrjsonDecoder(JSONDecoder):
+    """Generic decoder using orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        super().__init__(orjson.loads)
+
+
+if msgspec is not None:
+
+    class _ItemStruct(msgspec.Struct):
+        """Struct with the read-only dict API the client uses on API items."""
+
+        def get(self, key: str, default: Any = None) -> Any:
+            return getattr(self, key, default)
+
+        def __getitem__(self, key: str) -> Any:
+            return getattr(self, key)
+
+        def __setitem__(self, key: str, value: Any) -> None:
+            setattr(self, key, value)
+
+    class FindingItem(_ItemStruct):
+        """The subset of a DefectDojo finding that autofix reads."""
+
+        id: int
+        title: str | None = ""
+        severity: str = "Info"
+        component_name: str | None = None
+        component_version: str | None = None
+        file_path: str | None = None
+        description: str | None = ""
+        mitigation: str | None = ""
+        active: bool = True
+        verified: bool = False
+        duplicate: bool = False
+        is_mitigated: bool = False
+        last_status_update: str | None = None
+        updated: str | None = None
+        # Set by the client, never present in API responses
+        product_id: int | None = None
+
+    class FindingPage(_ItemStruct):
+        """A page of the findings list endpoint."""
+
+        count: int = 0
+        next: str | None = None
+        results: list[FindingItem] = []
+
+
+class MsgspecDecoder(JSONDecoder):
+    """
+    Decodes findings into FindingItem structs.
+
+    Responses that don't match the expected schema are decoded generically
+    instead of failing, so an unexpected field type never breaks a fetch.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        super().__init__(orjson.loads if orjson else json.loads)
+        self._page = msgspec.json.Decoder(FindingPage)
+        self._finding = msgspec.json.Decoder(FindingItem)
+
+    def decode_page(self, body: bytes) -> Any:
+        try:
+            return self._page.decode(body)
+        except msgspec.ValidationError as e:
+            logger.debug(f"Page did not match FindingPage, decoding generically: {e}")
+            return self.loads(body)
+
+    def decode_finding(self, body: bytes) -> Any:
+        try:
+            return self._finding.decode(body)
+        except msgspec.ValidationError as e:
+            logger.debug(f"Finding did not match FindingItem, decoding generically: {e}")
+            return self.loads(body)
+
+
+def available_decoders() -> list[str]:
+    """Names of the decoders usable in this environment, fastest first."""
+    names = []
+    if msgspec is not None:
+        names.append("msgspec")
+    if orjson is not None:
+        names.append("orjson")
+    names.append("json")
+    return names
+
+
+def get_decoder(name: str = "auto") -> JSONDecoder:
+    """
+    Build a decoder by name.
+
+    Args:
+        name: "msgspec", "orjson", "json", or "auto" for the fastest
+              one installed.
+
+    Returns:
+        The decoder instance.
+
+    Raises:
+        ValueError: If the name is unknown or its library is not installed.
+    """
+    if name == "auto":
+        name = available_decoders()[0]
+    if name not in DECODER_NAMES:
+        raise ValueError(f"Unknown JSON decoder {name!r}, expected one of {DECODER_NAMES}")
+    if name not in available_decoders():
+        raise ValueError(f"JSON decoder {name!r} is not installed")
+
+    if name == "msgspec":
+        return MsgspecDecoder()
+    if name == "orjson":
+        return OrjsonDecoder()
+    return JSONDecoder()
@@ -1,15 +1,62 @@
 """DefectDojo API client for fetching vulnerability findings."""
 
+import json
 import logging
-from typing import Iterator
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator
 
 import requests
+from urllib3.exceptions import ReadTimeoutError
 
 from .config import Config
+from .decoding import get_decoder
+from .finding_store import FindingStore
+from .http_cache import ResponseCache
 from .models import Finding, Severity
+from .paging import PageSizeTuner
+from .transport import ResilientSession
 
 logger = logging.getLogger(__name__)
 
+# Query parameter used to request findings changed since the last sync
+UPDATED_SINCE_PARAM = "last_status_update__gte"
+
+# Finding timestamps that can advance the sync watermark
+WATERMARK_FIELDS = ("last_status_update", "updated")
+
+# Items buffered per product while earlier products are still being merged
+PRODUCT_BUFFER_ITEMS = 1000
+
+
+@dataclass
+class TransferStats:
+    """Counts what was downloaded from DefectDojo versus what was kept."""
+
+    requests: int = 0
+    not_modified: int = 0
+    bytes_transferred: int = 0
+    records_transferred: int = 0
+    records_kept: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_page(self, num_bytes: int, num_records: int, not_modified: bool = False) -> None:
+        """Record one downloaded page (safe to call from worker threads)."""
+        with self._lock:
+            self.requests += 1
+            self.not_modified += int(not_modified)
+            self.bytes_transferred += num_bytes
+            self.records_transferred += num_records
+
+    @property
+    def records_discarded(self) -> int:
+        return self.records_transferred - self.records_kept
+
 
 class DojoClient:
     """Client for interacting with DefectDojo REST API."""
@@ -17,31 +64,271 @@ class DojoClient:
     def __init__(self, config: Config):
         self.config = config
         self.base_url = config.defectdojo_url
-        self.session = requests.Session()
+        # Size the pool so concurrent page fetches don't queue on connections:
+        # every product streams its pages with its own set of workers
+        self.session = ResilientSession(
+            timeout=config.defectdojo_timeout,
+            max_retries=config.defectdojo_max_retries,
+            pool_size=max(10, max(1, len(config.product_ids)) * config.defectdojo_concurrency),
+        )
         self.session.headers.update({
             "Authorization": f"Token {config.defectdojo_api_key}",
             "Content-Type": "application/json",
         })
+        self.stats = TransferStats()
+        self.decoder = get_decoder(config.defectdojo_json_decoder)
+        self.page_sizes = PageSizeTuner(
+            config.defectdojo_page_state_path,
+            initial=config.defectdojo_page_size,
+            target_seconds=config.defectdojo_page_seconds,
+        )
+        self.cache: ResponseCache | None = None
+        if config.defectdojo_cache_path:
+            self.cache = ResponseCache(
+                config.defectdojo_cache_path,
+                max_bytes=config.defectdojo_cache_max_bytes,
+            )
+
+    def _get_json(
+        self,
+        url: str,
+        params: dict | None = None,
+        allowed_statuses: frozenset[int] = frozenset(),
+        decode: Callable[[bytes], Any] | None = None,
+        retry_reads: bool = True,
+        memoize: bool = False,
+    ) -> tuple[int, Any]:
+        """
+        GET and decode a JSON resource, revalidating against the response cache.
+
+        When a cached copy exists the request carries If-None-Match /
+        If-Modified-Since, and a 304 returns the cached body without
+        re-downloading it. With ``memoize`` the decoded body is also kept in
+        memory so a 304 skips parsing; list pages leave it off so a scan
+        stays streaming. Statuses in ``allowed_statuses`` are
+        returned with no body instead of raising. ``decode`` defaults to the
+        page decoder. With ``retry_reads=False`` a read timeout is raised
+        immediately instead of being retried by the session.
+        """
+        decode = decode or self.decoder.decode_page
+        entry = None
+        headers = {}
+        if self.cache:
+            key = ResponseCache.make_key(url, params)
+            entry = self.cache.get(key)
+            if entry:
+                headers = entry.conditional_headers()
+
+        response = self.session.get(url, params=params, headers=headers, retry_reads=retry_reads)
+
+        if response.status_code == 304 and entry:
+            data = self.cache.decode(entry, decode, memoize=memoize)
+            self.stats.record_page(0, len(data.get("results", [])), not_modified=True)
+            return 200, data
+        if response.status_code in allowed_statuses:
+            return response.status_code, None
 
-    def _get_paginated(self, endpoint: str, params: dict | None = None) -> Iterator[dict]:
-        """Fetch all pages from a paginated endpoint."""
+        response.raise_for_status()
+        data = decode(response.content)
+        self.stats.record_page(len(response.content), len(data.get("results", [])))
+
+        if self.cache:
+            self.cache.put(
+                key,
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                decoded=data if memoize else None,
+            )
+        return response.status_code, data
+
+    def _get_page(self, url: str, params: dict, retry_reads: bool = True) -> dict:
+        """Fetch and decode a single page."""
+        _, data = self._get_json(url, params, retry_reads=retry_reads)
+        return data
+
+    def _get_paginated(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        concurrency: int = 1,
+    ) -> Iterator[dict]:
+        """
+        Fetch all pages from a paginated endpoint by offset.
+
+        The page size comes from ``self.page_sizes`` and adapts as pages are
+        fetched, unless ``params`` pins a ``limit``. With concurrency > 1 the
+        first page is fetched to learn the total ``count``, then the
+        remaining offsets are fetched in parallel. Results are always
+        yielded in offset order.
+        """
         url = f"{self.base_url}/api/v2/{endpoint}"
-        params = params or {}
-        params.setdefault("limit", 100)
+        params = dict(params or {})
+        fixed_limit = int(params.pop("limit")) if "limit" in params else None
 
-        while url:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        try:
+            if concurrency > 1:
+                yield from self._get_paginated_concurrent(
+                    endpoint, url, params, concurrency, fixed_limit
+                )
+            else:
+                yield from self._get_range(endpoint, url, params, 0, None, fixed_limit)
+        finally:
+            self.page_sizes.save()
 
-            yield from data.get("results", [])
+    def _get_sized_page(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict,
+        offset: int,
+        limit: int,
+        adaptive: bool = True,
+    ) -> dict:
+        """
+        Fetch ``limit`` results at ``offset``, feeding the timing to the tuner.
+
+        When adaptive, a page that times out is retried at a smaller size,
+        so the page returned may hold fewer than ``limit`` results. Read
+        timeouts are then not retried by the session first: the next
+        attempt should already ask for less.
+        """
+        while True:
+            start = time.perf_counter()
+            try:
+                data = self._get_page(
+                    url, {**params, "limit": limit, "offset": offset}, retry_reads=not adaptive
+                )
+            except requests.RequestException as e:
+                if not adaptive or not _is_timeout(e) or not self.page_sizes.record_timeout(endpoint, limit):
+                    raise
+                limit = min(limit, self.page_sizes.limit_for(endpoint))
+                logger.warning(f"Page of {endpoint} timed out, retrying with limit={limit}")
+                continue
+
+            if adaptive:
+                num_records = len(data.get("results", []))
+                self.page_sizes.record(endpoint, limit, time.perf_counter() - start, num_records)
+                if num_records < limit and data.get("next"):
+                    self.page_sizes.record_server_cap(endpoint, num_records)
+            return data
+
+    def _get_range(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict,
+        offset: int,
+        end: int | None,
+        fixed_limit: int | None,
+    ) -> Iterator[dict]:
+        """Fetch pages one at a time from ``offset`` up to ``end`` (or the last page)."""
+        while end is None or offset < end:
+            limit = fixed_limit or self.page_sizes.limit_for(endpoint)
+            if end is not None:
+                limit = min(limit, end - offset)
+            data = self._get_sized_page(endpoint, url, params, offset, limit, not fixed_limit)
+            results = data.get("results", [])
 
-            url = data.get("next")
-            params = {}  # Next URL includes params
+            yield from results
+
+            if not results or not data.get("next"):
+                return
+            offset += len(results)
+
+    def _get_paginated_concurrent(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict,
+        concurrency: int,
+        fixed_limit: int | None,
+    ) -> Iterator[dict]:
+        """Fetch pages by offset with a bounded worker pool."""
+        limit = fixed_limit or self.page_sizes.limit_for(endpoint)
+        first = self._get_sized_page(endpoint, url, params, 0, limit, not fixed_limit)
+        results = first.get("results", [])
+        yield from results
+
+        if not first.get("next") or not results:
+            return
+
+        count = first.get("count", 0)
+        offset = len(results)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        # Keep a bounded window of in-flight pages so memory stays flat
+        # and results can be yielded in order as soon as they complete.
+        pending: deque[tuple[int, int, Future]] = deque()
+        try:
+            while offset < count or pending:
+                while offset < count and len(pending) < concurrency * 2:
+                    limit = fixed_limit or self.page_sizes.limit_for(endpoint)
+                    pending.append((offset, limit, executor.submit(
+                        self._get_sized_page, endpoint, url, params, offset, limit, not fixed_limit
+                    )))
+                    offset += limit
+
+                start, limit, future = pending.popleft()
+                results = future.result().get("results", [])
+                yield from results
+
+                # A page that shrank after a timeout, or that the server
+                # capped, leaves a gap before the next page; fill it in order.
+                end = min(start + limit, count)
+                if results and start + len(results) < end:
+                    yield from self._get_range(
+                        endpoint, url, params, start + len(results), end, fixed_limit
+                    )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_open_findings(
+        self,
+        severity_levels: list[str] | None = None,
+        concurrency: int | None = None,
+        slim: bool = True,
+    ) -> Iterator[Finding]:
+        """
+        Stream open findings from DefectDojo page by page.
+
+        The severity filter is applied server-side with one request stream
+        per severity level; the streams are merged in the order given.
+        Nothing beyond the pages in flight is held in memory. Transfer
+        counters are available in ``self.stats`` as the iterator advances.
+
+        Args:
+            severity_levels: List of severity levels to filter (e.g., ["Critical", "High"])
+                           Defaults to Critical and High if not specified.
+            concurrency: Number of pages to fetch in parallel.
+                         Defaults to DEFECTDOJO_CONCURRENCY.
+            slim: Drop the description and mitigation text, which can be
+                  kilobytes per finding and are not needed to suggest fixes.
+
+        Yields:
+            Finding objects matching the criteria.
+        """
+        if severity_levels is None:
+            severity_levels = [Severity.CRITICAL.value, Severity.HIGH.value]
+        if concurrency is None:
+            concurrency = self.config.defectdojo_concurrency
+
+        self.stats = TransferStats()
+        for item in self._iter_open_items(severity_levels, concurrency):
+            self.stats.records_kept += 1
+            yield _finding_from_item(item, slim=slim)
+
+        logger.info(f"Fetched {self.stats.records_kept} open findings from DefectDojo")
+        logger.info(
+            f"Transferred {self.stats.records_transferred} records "
+            f"({self.stats.bytes_transferred} bytes in {self.stats.requests} requests), "
+            f"kept {self.stats.records_kept}"
+        )
 
     def fetch_open_findings(
         self,
         severity_levels: list[str] | None = None,
+        concurrency: int | None = None,
     ) -> list[Finding]:
         """
         Fetch open findings from DefectDojo.
@@ -49,101 +336,386 @@ class DojoClient:
         Args:
             severity_levels: List of severity levels to filter (e.g., ["Critical", "High"])
                            Defaults to Critical and High if not specified.
+            concurrency: Number of pages to fetch in parallel.
+                         Defaults to DEFECTDOJO_CONCURRENCY.
+
+        Returns:
+            List of Finding objects matching the criteria, with full text fields.
+        """
+        return list(self.iter_open_findings(severity_levels, concurrency, slim=False))
+
+    def _for_each_product(
+        self,
+        fetch: Callable[[dict], Iterable[dict]],
+    ) -> Iterator[dict]:
+        """
+        Run ``fetch`` once per configured product and merge the results.
+
+        ``fetch`` receives the product-scoping query parameters. With several
+        products they are fetched concurrently and merged in configuration
+        order; each item is tagged with ``product_id`` and duplicate finding
+        IDs are dropped. Each product streams through a bounded buffer, so
+        products ahead of the merge pause once it fills instead of holding
+        all of their findings in memory. A single product (or none) is
+        streamed directly.
+        """
+        product_ids = self.config.product_ids
+        seen: set[int] = set()
+
+        def tagged(product_id: int | None, items: Iterable[dict]) -> Iterator[dict]:
+            for item in items:
+                if item["id"] in seen:
+                    continue
+                seen.add(item["id"])
+                item["product_id"] = product_id
+                yield item
+
+        if len(product_ids) <= 1:
+            product_id = product_ids[0] if product_ids else None
+            params = {"test__engagement__product": product_id} if product_id else {}
+            yield from tagged(product_id, fetch(params))
+            return
+
+        stop = threading.Event()
+        buffers = [queue.Queue(maxsize=PRODUCT_BUFFER_ITEMS) for _ in product_ids]
+        executor = ThreadPoolExecutor(max_workers=len(product_ids))
+        try:
+            for product_id, buffer in zip(product_ids, buffers):
+                executor.submit(
+                    _stream_into, fetch({"test__engagement__product": product_id}), buffer, stop
+                )
+            for product_id, buffer in zip(product_ids, buffers):
+                yield from tagged(product_id, _drain(buffer))
+        finally:
+            # Unblock producers if the consumer stopped early
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _iter_open_items(
+        self,
+        severity_levels: list[str],
+        concurrency: int,
+    ) -> Iterator[dict]:
+        """Yield raw open finding items, one request stream per product and severity."""
+
+        def fetch(product_params: dict) -> Iterator[dict]:
+            params = {
+                "active": "true",
+                "duplicate": "false",
+                "is_mitigated": "false",
+                **product_params,
+            }
+            for severity_level in severity_levels:
+                stream_params = {**params, "severity": severity_level}
+                for item in self._get_paginated("findings", stream_params, concurrency):
+                    # Guard against servers that ignore the severity filter
+                    if item.get("severity", "") != severity_level:
+                        continue
+                    yield item
+
+        yield from self._for_each_product(fetch)
+
+    def sync_open_findings(
+        self,
+        store: FindingStore,
+        severity_levels: list[str] | None = None,
+        concurrency: int | None = None,
+    ) -> int:
+        """
+        Incrementally sync open findings into a local store.
+
+        The first run (or a run asking for severities or a product the store
+        has not tracked) does a full fetch. Later runs only fetch findings
+        changed since the stored watermark and merge them into the snapshot:
+        findings that are still open are upserted, closed ones are removed.
+
+        Args:
+            store: FindingStore holding the snapshot and watermark.
+            severity_levels: Severity levels to keep in the snapshot.
+            concurrency: Number of pages to fetch in parallel.
 
         Returns:
-            List of Finding objects matching the criteria.
+            Number of open findings of the given severities in the snapshot.
         """
         if severity_levels is None:
             severity_levels = [Severity.CRITICAL.value, Severity.HIGH.value]
+        if concurrency is None:
+            concurrency = self.config.defectdojo_concurrency
 
-        params = {
-            "active": "true",
-            "duplicate": "false",
-            "is_mitigated": "false",
-        }
+        started_at = datetime.now(timezone.utc)
+        product = ",".join(str(pid) for pid in self.config.product_ids)
+        watermark = store.get_state("watermark")
+        tracked = json.loads(store.get_state("severities") or "[]")
 
-        if self.config.defectdojo_product_id:
-            params["test__engagement__product"] = self.config.defectdojo_product_id
+        self.stats = TransferStats()
+        full_sync = (
+            watermark is None
+            or store.get_state("product") != product
+            or not set(severity_levels) <= set(tracked)
+        )
 
-        findings = []
-        for item in self._get_paginated("findings", params):
-            severity = item.get("severity", "")
-            if severity not in severity_levels:
-                continue
+        # Fetch everything before touching the store, and apply it in one
+        # transaction: a sync that fails partway keeps the last snapshot
+        if full_sync:
+            logger.info("Running full findings sync")
+            tracked = sorted(set(tracked) | set(severity_levels))
+            items = list(self._iter_open_items(tracked, concurrency))
+            new_watermark = _max_watermark(items)
+        else:
+            logger.info(f"Running delta findings sync since {watermark}")
+            items = list(self._for_each_product(
+                lambda product_params: self._get_paginated(
+                    "findings", {**product_params, UPDATED_SINCE_PARAM: watermark}, concurrency
+                )
+            ))
+            new_watermark = _max_watermark(items, default=watermark)
 
-            finding = Finding(
-                id=item["id"],
-                title=item.get("title", ""),
-                severity=Severity(severity),
-                component_name=item.get("component_name"),
-                component_version=item.get("component_version"),
-                file_path=item.get("file_path"),
-                description=item.get("description", ""),
-                mitigation=item.get("mitigation", ""),
-                active=item.get("active", True),
-                verified=item.get("verified", False),
-                duplicate=item.get("duplicate", False),
-            )
-            findings.append(finding)
+        with store.transaction():
+            if full_sync:
+                store.clear()
+                store.upsert_findings(_finding_from_item(item) for item in items)
+            else:
+                still_open = [
+                    item for item in items
+                    if _is_open(item) and item.get("severity") in tracked
+                ]
+                open_ids = {item["id"] for item in still_open}
+                store.upsert_findings(_finding_from_item(item) for item in still_open)
+                store.delete_findings(item["id"] for item in items if item["id"] not in open_ids)
+            store.set_state("watermark", new_watermark or started_at.isoformat())
+            store.set_state("severities", json.dumps(tracked))
+            store.set_state("product", product)
 
-        logger.info(f"Fetched {len(findings)} open findings from DefectDojo")
-        return findings
+        total = store.count(severity_levels)
+        self.stats.records_kept = total
+        logger.info(
+            f"Synced {len(items)} changed findings, "
+            f"{total} open findings in snapshot"
+        )
+        return total
 
     def get_finding_by_id(self, finding_id: int) -> Finding | None:
         """Fetch a single finding by ID."""
         url = f"{self.base_url}/api/v2/findings/{finding_id}/"
-        response = self.session.get(url)
+        status, item = self._get_json(
+            url, allowed_statuses=frozenset({404}), decode=self.decoder.decode_finding, memoize=True
+        )
 
-        if response.status_code == 404:
+        if status == 404:
             return None
-
-        response.raise_for_status()
-        item = response.json()
-
-        return Finding(
-            id=item["id"],
-            title=item.get("title", ""),
-            severity=Severity(item.get("severity", "Info")),
-            component_name=item.get("component_name"),
-            component_version=item.get("component_version"),
-            file_path=item.get("file_path"),
-            description=item.get("description", ""),
-            mitigation=item.get("mitigation", ""),
-            active=item.get("active", True),
-            verified=item.get("verified", False),
-            duplicate=item.get("duplicate", False),
-        )
+        return _finding_from_item(item)
 
     def close_finding(self, finding_id: int, notes: str = "") -> bool:
         """Mark a finding as mitigated/closed."""
+        return self._patch_finding(finding_id, _close_payload(notes))
+
+    def close_findings(
+        self,
+        finding_ids: Iterable[int],
+        notes: str | dict[int, str] = "",
+        concurrency: int | None = None,
+    ) -> dict[int, bool]:
+        """
+        Close many findings concurrently.
+
+        Findings that share the same note share one pre-encoded request body,
+        so closing every finding for a fixed image costs one payload build
+        no matter how many findings reference it.
+
+        Args:
+            finding_ids: IDs of the findings to close.
+            notes: One note for all findings, or a mapping of ID to note.
+            concurrency: Number of PATCH requests in flight.
+                         Defaults to DEFECTDOJO_CONCURRENCY.
+
+        Returns:
+            Mapping of finding ID to whether it was closed.
+        """
+        if concurrency is None:
+            concurrency = self.config.defectdojo_concurrency
+
+        finding_ids = list(dict.fromkeys(finding_ids))
+        bodies: dict[str, bytes] = {}
+        requests_to_send = []
+        for finding_id in finding_ids:
+            note = notes.get(finding_id, "") if isinstance(notes, dict) else notes
+            if note not in bodies:
+                bodies[note] = _close_payload(note)
+            requests_to_send.append((finding_id, bodies[note]))
+
+        logger.info(
+            f"Closing {len(finding_ids)} findings with {len(bodies)} distinct notes"
+        )
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            outcomes = executor.map(lambda req: self._patch_finding(*req), requests_to_send)
+            results = dict(zip(finding_ids, outcomes))
+
+        closed = sum(results.values())
+        if closed < len(results):
+            logger.warning(f"Closed {closed}/{len(results)} findings")
+        return results
+
+    def _patch_finding(self, finding_id: int, body: bytes) -> bool:
+        """Send a pre-encoded PATCH for one finding."""
         url = f"{self.base_url}/api/v2/findings/{finding_id}/"
-        payload = {
-            "active": False,
-            "is_mitigated": True,
-        }
-        if notes:
-            payload["notes"] = [{"entry": notes}]
-
-        response = self.session.patch(url, json=payload)
+        try:
+            response = self.session.patch(url, data=body)
+        except requests.RequestException as e:
+            logger.error(f"Failed to close finding {finding_id}: {e}")
+            return False
         return response.status_code == 200
 
 
-def group_findings_by_image(findings: list[Finding]) -> dict[str, list[Finding]]:
+def _close_payload(notes: str) -> bytes:
+    """Encode the PATCH body that marks a finding as mitigated."""
+    payload: dict = {
+        "active": False,
+        "is_mitigated": True,
+    }
+    if notes:
+        payload["notes"] = [{"entry": notes}]
+    return json.dumps(payload).encode()
+
+
+def _finding_from_item(item: dict, slim: bool = False) -> Finding:
+    """Build a Finding from a DefectDojo API item, optionally without long text fields."""
+    return Finding(
+        id=item["id"],
+        title=item.get("title", ""),
+        severity=Severity(item.get("severity", "Info")),
+        component_name=item.get("component_name"),
+        component_version=item.get("component_version"),
+        file_path=item.get("file_path"),
+        description="" if slim else item.get("description", ""),
+        mitigation="" if slim else item.get("mitigation", ""),
+        active=item.get("active", True),
+        verified=item.get("verified", False),
+        duplicate=item.get("duplicate", False),
+        product_id=item.get("product_id"),
+    )
+
+
+@dataclass
+class _StreamEnd:
+    """Marks the end of a product's buffered stream, carrying its error if it failed."""
+
+    error: BaseException | None = None
+
+
+def _stream_into(items: Iterable[dict], buffer: queue.Queue, stop: threading.Event) -> None:
+    """Copy ``items`` into a bounded buffer until exhausted or ``stop`` is set."""
+    end = _StreamEnd()
+    try:
+        for item in items:
+            if not _put(buffer, item, stop):
+                return
+    except Exception as e:
+        end.error = e
+    finally:
+        close = getattr(items, "close", None)
+        if close:
+            close()
+    _put(buffer, end, stop)
+
+
+def _put(buffer: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put into a bounded buffer, giving up once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(buffer: queue.Queue) -> Iterator[dict]:
+    """Yield buffered items until the stream ends, re-raising its error."""
+    while True:
+        item = buffer.get()
+        if isinstance(item, _StreamEnd):
+            if item.error:
+                raise item.error
+            return
+        yield item
+
+
+def _is_timeout(error: requests.RequestException) -> bool:
+    """Whether a request failed because the server was too slow to answer."""
+    if isinstance(error, requests.Timeout):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        # Gateway errors are what a proxy returns when the app server times out
+        return error.response.status_code in (502, 504)
+    # Read timeouts that exhausted the retry policy surface as ConnectionError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ReadTimeoutError)
+
+
+def _is_open(item: dict) -> bool:
+    """Whether an API item is an active, non-duplicate, unmitigated finding."""
+    return (
+        item.get("active", True)
+        and not item.get("duplicate", False)
+        and not item.get("is_mitigated", False)
+    )
+
+
+def _max_watermark(items: list[dict], default: str | None = None) -> str | None:
+    """Latest change timestamp across items, as a UTC ISO string."""
+    latest = datetime.fromisoformat(default) if default else None
+    for item in items:
+        for key in WATERMARK_FIELDS:
+            value = item.get(key)
+            if not value:
+                continue
+            stamp = datetime.fromisoformat(value)
+            if stamp.tzinfo is None:
+                stamp = stamp.replace(tzinfo=timezone.utc)
+            if latest is None or stamp > latest:
+                latest = stamp
+    return latest.astimezone(timezone.utc).isoformat() if latest else None
+
+
+def group_findings_by_image(findings: Iterable[Finding]) -> dict[str, list[Finding]]:
     """
     Group findings by their associated container image.
 
+    Accepts any iterable, so it can consume iter_open_findings directly.
+
     Returns:
         Dictionary mapping image:tag to list of findings.
     """
     grouped: dict[str, list[Finding]] = {}
 
     for finding in findings:
-        image_tag = finding.image_tag
-        if image_tag:
-            grouped.setdefault(image_tag, []).append(finding)
-        else:
-            # Group by component name if no version
-            key = finding.component_name or "unknown"
-            grouped.setdefault(key, []).append(finding)
+        grouped.setdefault(_image_key(finding), []).append(finding)
 
     return grouped
+
+
+def first_finding_by_image(findings: Iterable[Finding]) -> tuple[int, dict[str, Finding]]:
+    """
+    Count findings and keep the first one seen for each image, in one pass.
+
+    Uses the same keys as group_findings_by_image, but holds one finding
+    per image instead of every finding, so memory stays flat while
+    consuming iter_open_findings.
+
+    Returns:
+        The number of findings and a mapping of image:tag to its first finding.
+    """
+    total = 0
+    first: dict[str, Finding] = {}
+
+    for finding in findings:
+        total += 1
+        first.setdefault(_image_key(finding), finding)
+
+    return total, first
+
+
+def _image_key(finding: Finding) -> str:
+    """The image:tag a finding belongs to, or its component name if it has no version."""
+    return finding.image_tag or finding.component_name or "unknown"
@@ -0,0 +1,264 @@
+"""Local SQLite store for DefectDojo findings and sync state."""
+
+import logging
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterable, Iterator
+
+from .models import Finding, Severity
+
+logger = logging.getLogger(__name__)
+
+FINDING_COLUMNS = (
+    "id",
+    "title",
+    "severity",
+    "component_name",
+    "component_version",
+    "file_path",
+    "description",
+    "mitigation",
+    "active",
+    "verified",
+    "duplicate",
+    "product_id",
+)
+
+
+class FindingStore:
+    """Persists a snapshot of open findings plus sync watermarks in SQLite."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._in_transaction = False
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create tables if they don't exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS findings (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    component_name TEXT,
+                    component_version TEXT,
+                    file_path TEXT,
+                    description TEXT NOT NULL DEFAULT '',
+                    mitigation TEXT NOT NULL DEFAULT '',
+                    active INTEGER NOT NULL DEFAULT 1,
+                    verified INTEGER NOT NULL DEFAULT 0,
+                    duplicate INTEGER NOT NULL DEFAULT 0,
+                    product_id INTEGER
+                )
+                """
+            )
+            # Stores created before multi-product support lack product_id
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(findings)")}
+            if "product_id" not in columns:
+                self._conn.execute("ALTER TABLE findings ADD COLUMN product_id INTEGER")
+            # Image lookups use the composite index (it also serves
+            # component_name alone); severity/active back the open-finding filters.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_findings_image "
+                "ON findings (component_name, component_version)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_findings_version "
+                "ON findings (component_version)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_findings_severity "
+                "ON findings (severity)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_findings_active "
+                "ON findings (active)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                """
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Commit every write made inside the block together.
+
+        If the block raises, all of its writes are rolled back, so readers
+        keep seeing the previous snapshot.
+        """
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._in_transaction = False
+
+    def _writing(self) -> ContextManager:
+        """Commit a write now, unless it is part of a transaction()."""
+        return nullcontext() if self._in_transaction else self._conn
+
+    def get_state(self, key: str) -> str | None:
+        """Get a sync state value."""
+        row = self._conn.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        """Set a sync state value."""
+        with self._writing():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    def clear(self) -> None:
+        """Remove all findings and sync state."""
+        with self._writing():
+            self._conn.execute("DELETE FROM findings")
+            self._conn.execute("DELETE FROM sync_state")
+
+    def upsert_findings(self, findings: Iterable[Finding]) -> int:
+        """Insert or replace findings. Returns the number written."""
+        rows = [
+            (
+                f.id,
+                f.title,
+                f.severity.value,
+                f.component_name,
+                f.component_version,
+                f.file_path,
+                f.description,
+                f.mitigation,
+                int(f.active),
+                int(f.verified),
+                int(f.duplicate),
+                f.product_id,
+            )
+            for f in findings
+        ]
+        placeholders = ", ".join("?" for _ in FINDING_COLUMNS)
+        with self._writing():
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO findings ({', '.join(FINDING_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+        return len(rows)
+
+    def delete_findings(self, finding_ids: Iterable[int]) -> int:
+        """Delete findings by ID. Returns the number deleted."""
+        with self._writing():
+            cursor = self._conn.executemany(
+                "DELETE FROM findings WHERE id = ?",
+                ((finding_id,) for finding_id in finding_ids),
+            )
+        return cursor.rowcount
+
+    def count(self, severity_levels: list[str] | None = None) -> int:
+        """Number of active findings, optionally restricted to severities."""
+        where, params = _open_filter(severity_levels)
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM findings WHERE {where}", params
+        ).fetchone()[0]
+
+    def load_findings(
+        self,
+        severity_levels: list[str] | None = None,
+        limit: int | None = None,
+    ) -> list[Finding]:
+        """Load active findings, optionally restricted to the given severities."""
+        where, params = _open_filter(severity_levels)
+        query = f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings WHERE {where} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [_row_to_finding(row) for row in self._conn.execute(query, params)]
+
+    def group_by_image(
+        self,
+        severity_levels: list[str] | None = None,
+    ) -> dict[str, list[Finding]]:
+        """
+        Group active findings by image, like group_findings_by_image.
+
+        Rows come back sorted by the image index, so grouping is a single
+        ordered scan.
+        """
+        where, params = _open_filter(severity_levels)
+        query = (
+            f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings WHERE {where} "
+            "ORDER BY component_name, component_version, id"
+        )
+
+        grouped: dict[str, list[Finding]] = {}
+        for row in self._conn.execute(query, params):
+            finding = _row_to_finding(row)
+            key = finding.image_tag or finding.component_name or "unknown"
+            grouped.setdefault(key, []).append(finding)
+        return grouped
+
+    def image_representatives(
+        self,
+        severity_levels: list[str] | None = None,
+    ) -> list[Finding]:
+        """
+        Return the lowest-ID active finding for each distinct image.
+
+        This is the set generate_fix_suggestions needs, since it emits at
+        most one suggestion per image.
+        """
+        where, params = _open_filter(severity_levels)
+        query = (
+            f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings WHERE id IN ("
+            f"SELECT MIN(id) FROM findings WHERE {where} "
+            "AND component_name IS NOT NULL AND component_version IS NOT NULL "
+            "GROUP BY component_name, component_version"
+            ") ORDER BY id"
+        )
+        return [_row_to_finding(row) for row in self._conn.execute(query, params)]
+
+
+def _open_filter(severity_levels: list[str] | None) -> tuple[str, list]:
+    """Build the WHERE clause selecting active findings of the given severities."""
+    where = "active = 1"
+    params: list = []
+    if severity_levels:
+        where += f" AND severity IN ({', '.join('?' for _ in severity_levels)})"
+        params.extend(severity_levels)
+    return where, params
+
+
+def _row_to_finding(row: tuple) -> Finding:
+    """Convert a findings table row into a Finding."""
+    return Finding(
+        id=row[0],
+        title=row[1],
+        severity=Severity(row[2]),
+        component_name=row[3],
+        component_version=row[4],
+        file_path=row[5],
+        description=row[6],
+        mitigation=row[7],
+        active=bool(row[8]),
+        verified=bool(row[9]),
+        duplicate=bool(row[10]),
+        product_id=row[11],
+    )
@@ -0,0 +1,96 @@
+"""Group fix suggestions into a bounded number of branches."""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+import yaml
+
+from .models import FixSuggestion
+
+logger = logging.getLogger(__name__)
+
+BATCH_KEYS = ("directory", "namespace", "confidence")
+
+
+@dataclass
+class FixBatch:
+    """Suggestions that go into one branch, commit and PR."""
+
+    keys: list[str]
+    suggestions: list[FixSuggestion] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        """Short description of what the batch groups, for titles and output."""
+        if len(self.keys) <= 3:
+            return ", ".join(self.keys)
+        return f"{', '.join(self.keys[:3])} (+{len(self.keys) - 3} more)"
+
+
+def group_suggestions(
+    suggestions: list[FixSuggestion],
+    plan: dict[FixSuggestion, list[str]],
+    by: str,
+    branches: int,
+    repo_path: Path,
+) -> list[FixBatch]:
+    """
+    Split suggestions into at most ``branches`` batches.
+
+    Suggestions are keyed by the directory or Kubernetes namespace of the
+    first manifest they change, or by their confidence. When there are
+    more keys than branches, whole groups are packed into the branches,
+    largest first, so each key stays in a single PR.
+
+    Args:
+        suggestions: Suggestions to group; those with no planned files are skipped.
+        plan: Files each suggestion changes, from GitClient.plan_manifest_updates.
+        by: One of BATCH_KEYS.
+        branches: Maximum number of batches.
+        repo_path: Root the planned paths are relative to.
+
+    Returns:
+        Batches ordered by their first key.
+    """
+    if by not in BATCH_KEYS:
+        raise ValueError(f"Unknown batch key {by!r}; expected one of {', '.join(BATCH_KEYS)}")
+
+    namespaces: dict[str, str] = {}
+    groups: dict[str, list[FixSuggestion]] = {}
+    for suggestion in suggestions:
+        files = sorted(plan.get(suggestion, []))
+        if not files:
+            continue
+        if by == "confidence":
+            key = suggestion.confidence
+        elif by == "directory":
+            key = str(PurePosixPath(files[0]).parent)
+        else:
+            if files[0] not in namespaces:
+                namespaces[files[0]] = _namespace(repo_path / files[0])
+            key = namespaces[files[0]]
+        groups.setdefault(key, []).append(suggestion)
+
+    bins = [FixBatch(keys=[]) for _ in range(min(max(1, branches), len(groups)))]
+    for key, members in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+        lightest = min(bins, key=lambda batch: len(batch.suggestions))
+        lightest.keys.append(key)
+        lightest.suggestions.extend(members)
+
+    for batch in bins:
+        batch.keys.sort()
+    return sorted(bins, key=lambda batch: batch.keys[0])
+
+
+def _namespace(file_path: Path) -> str:
+    """metadata.namespace of the first resource in a manifest that sets one."""
+    try:
+        for document in yaml.safe_load_all(file_path.read_text()):
+            if isinstance(document, dict):
+                metadata = document.get("metadata")
+                if isinstance(metadata, dict) and metadata.get("namespace"):
+                    return str(metadata["namespace"])
+    except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+        logger.debug(f"Could not read namespace from {file_path}: {e}")
+    return "default"
@@ -2,7 +2,7 @@
 
 import logging
 import re
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 from .models import Finding, FixSuggestion
 
@@ -188,12 +188,15 @@ def suggest_new_image_tag(current_tag: str, image_name: str = "") -> str | None:
     return None
 
 
-def generate_fix_suggestions(findings: list[Finding]) -> list[FixSuggestion]:
+def generate_fix_suggestions(findings: Iterable[Finding]) -> list[FixSuggestion]:
     """
-    Generate fix suggestions for a list of findings.
+    Generate fix suggestions for a stream of findings.
+
+    Only the set of images already seen is kept, so findings can be
+    consumed straight from DojoClient.iter_open_findings.
 
     Args:
-        findings: List of vulnerability findings.
+        findings: Iterable of vulnerability findings.
 
     Returns:
         List of fix suggestions (one per unique image).
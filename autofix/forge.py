@@ -0,0 +1,282 @@
+"""GitHub/GitLab REST client for opening pull requests without the gh/glab CLIs."""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from .http_cache import CachedResponse, ResponseCache
+from .transport import ResilientSession
+
+logger = logging.getLogger(__name__)
+
+# Longest we wait for a rate limit to reset before giving up on a request
+MAX_RATE_LIMIT_WAIT = 300.0
+
+# Attempts for a request the forge rejected because of rate limiting
+RATE_LIMIT_ATTEMPTS = 3
+
+
+class ForgeError(Exception):
+    """A forge API request failed."""
+
+
+@dataclass(frozen=True)
+class PullRequestSpec:
+    """A pull/merge request to open."""
+
+    head: str
+    title: str
+    body: str
+    base: str | None = None  # the repository's default branch when None
+
+
+class ForgeClient:
+    """
+    Opens pull requests through the GitHub or GitLab REST API.
+
+    All requests share one pooled ResilientSession, so a run pays for
+    connection setup and authentication once instead of once per PR as
+    with the CLIs. GETs are conditional: responses are remembered with
+    their ETag and a 304 reuses them (GitHub does not count 304s against
+    the rate limit). Rate-limit headers are tracked across threads. When
+    the budget is spent, or a request is rejected with Retry-After, every
+    worker waits for the reset instead of burning retries.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        repo: str,
+        token: str,
+        api_url: str,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        pool_size: int = 10,
+    ):
+        self.platform = platform
+        self.repo = repo
+        self.api_url = api_url.rstrip("/")
+        self.session = ResilientSession(timeout=timeout, max_retries=max_retries, pool_size=pool_size)
+        if platform == "github":
+            self.session.headers.update({
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            })
+        else:
+            self.session.headers["PRIVATE-TOKEN"] = token
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._validated: dict[str, CachedResponse] = {}
+        self._default_branch: str | None = None
+
+    @classmethod
+    def for_remote(
+        cls,
+        platform: str,
+        remote_url: str,
+        token: str,
+        api_url: str | None = None,
+        **kwargs,
+    ) -> "ForgeClient":
+        """Client for the repository a git remote URL points at."""
+        host, repo = parse_remote(remote_url)
+        if not api_url:
+            if platform == "github":
+                api_url = "https://api.github.com" if host == "github.com" else f"https://{host}/api/v3"
+            else:
+                api_url = f"https://{host}/api/v4"
+        return cls(platform, repo, token, api_url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def default_branch(self) -> str:
+        """The repository's default branch, looked up once."""
+        if self._default_branch is None:
+            self._default_branch = self._get_json(self._repo_path())["default_branch"]
+        return self._default_branch
+
+    def create_pull_request(self, spec: PullRequestSpec) -> str:
+        """
+        Open a pull/merge request and return its web URL.
+
+        If one is already open for the same branches, its URL is returned,
+        so retrying a run does not fail on PRs it opened before.
+
+        Raises:
+            ForgeError: If the forge rejects the request.
+        """
+        base = spec.base or self.default_branch()
+        if self.platform == "github":
+            response = self._request("POST", f"{self._repo_path()}/pulls", json={
+                "title": spec.title,
+                "body": spec.body,
+                "head": spec.head,
+                "base": base,
+            })
+            if response.status_code == 422 and "already exists" in response.text:
+                return self._existing_pull_request(spec.head, base)
+            return self._checked(response)["html_url"]
+
+        response = self._request("POST", f"{self._repo_path()}/merge_requests", json={
+            "title": spec.title,
+            "description": spec.body,
+            "source_branch": spec.head,
+            "target_branch": base,
+            "remove_source_branch": True,
+        })
+        if response.status_code == 409:
+            return self._existing_pull_request(spec.head, base)
+        return self._checked(response)["web_url"]
+
+    def create_pull_requests(
+        self,
+        specs: list[PullRequestSpec],
+        concurrency: int = 4,
+    ) -> list[str | None]:
+        """
+        Open many pull requests concurrently over the shared session.
+
+        Returns:
+            Each PR's URL, or None where it could not be created, in order.
+        """
+
+        def create(spec: PullRequestSpec) -> str | None:
+            try:
+                return self.create_pull_request(spec)
+            except (ForgeError, requests.RequestException) as e:
+                logger.error(f"Failed to create PR for {spec.head}: {e}")
+                return None
+
+        if concurrency <= 1 or len(specs) <= 1:
+            return [create(spec) for spec in specs]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(specs))) as executor:
+            return list(executor.map(create, specs))
+
+    def _existing_pull_request(self, head: str, base: str) -> str:
+        if self.platform == "github":
+            owner = self.repo.split("/")[0]
+            pulls = self._get_json(
+                f"{self._repo_path()}/pulls",
+                {"head": f"{owner}:{head}", "base": base, "state": "open"},
+            )
+            key = "html_url"
+        else:
+            pulls = self._get_json(
+                f"{self._repo_path()}/merge_requests",
+                {"source_branch": head, "target_branch": base, "state": "opened"},
+            )
+            key = "web_url"
+        if not pulls:
+            raise ForgeError(f"A pull request for {head} exists but could not be found")
+        return pulls[0][key]
+
+    def _repo_path(self) -> str:
+        if self.platform == "github":
+            return f"/repos/{self.repo}"
+        return f"/projects/{quote(self.repo, safe='')}"
+
+    def _get_json(self, path: str, params: dict | None = None) -> Any:
+        """GET a JSON resource, revalidating a remembered copy with its ETag."""
+        key = ResponseCache.make_key(path, params)
+        entry = self._validated.get(key)
+        response = self._request(
+            "GET", path, params=params, headers=entry.conditional_headers() if entry else None
+        )
+        if response.status_code == 304 and entry:
+            return json.loads(entry.body)
+
+        data = self._checked(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validated[key] = CachedResponse(key, etag, last_modified, response.content)
+        return data
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, waiting out rate limits first and retrying when rejected by one."""
+        for attempt in range(RATE_LIMIT_ATTEMPTS):
+            self._wait_for_rate_limit()
+            response = self.session.request(method, f"{self.api_url}{path}", **kwargs)
+            if not self._note_rate_limit(response):
+                return response
+            logger.warning(f"{method} {path} was rate limited (attempt {attempt + 1})")
+        return response
+
+    def _note_rate_limit(self, response: requests.Response) -> bool:
+        """Record the rate-limit state a response reports; True if it was rejected."""
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining", headers.get("RateLimit-Remaining"))
+        reset = headers.get("X-RateLimit-Reset", headers.get("RateLimit-Reset"))
+        retry_after = headers.get("Retry-After")
+
+        resume_at = 0.0
+        if retry_after and retry_after.isdigit():
+            resume_at = time.time() + int(retry_after)
+        elif remaining == "0" and reset and reset.isdigit():
+            resume_at = float(reset)
+        if resume_at:
+            with self._lock:
+                self._resume_at = max(self._resume_at, resume_at)
+
+        limited = response.status_code == 429 or (
+            response.status_code == 403 and (remaining == "0" or retry_after is not None)
+        )
+        if limited and not resume_at:
+            # Rejected without saying for how long: back off briefly
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.time() + 1.0)
+        return limited
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.time()
+        if delay <= 0:
+            return
+        if delay > MAX_RATE_LIMIT_WAIT:
+            raise ForgeError(f"Rate limited for another {delay:.0f}s")
+        logger.info(f"Waiting {delay:.1f}s for the forge rate limit to reset")
+        time.sleep(delay)
+
+    @staticmethod
+    def _checked(response: requests.Response) -> Any:
+        if response.status_code >= 400:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            detail = data.get("message", response.text) if isinstance(data, dict) else response.text
+            raise ForgeError(f"{response.request.method} {response.url} failed ({response.status_code}): {detail}")
+        return response.json()
+
+
+def parse_remote(remote_url: str) -> tuple[str, str]:
+    """
+    Host and repository path from a git remote URL.
+
+    Handles ``https://host/owner/repo.git``, ``ssh://git@host/owner/repo``
+    and scp-style ``git@host:owner/repo.git``; GitLab subgroups are kept.
+    """
+    url = remote_url.strip()
+    if "://" in url:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if parts.port and parts.scheme in ("http", "https"):
+            host = f"{host}:{parts.port}"
+        path = parts.path
+    else:
+        host, _, path = url.partition(":")
+        host = host.rpartition("@")[2]
+    path = path.strip("/").removesuffix(".git")
+    if not host or "/" not in path:
+        raise ValueError(f"Cannot tell the repository from remote URL {remote_url!r}")
+    return host, path
@@ -1,13 +1,23 @@
 """Git integration for creating branches, commits, and pull requests."""
 
 import logging
-import re
 import subprocess
+import tempfile
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable
 
+import requests
+
+from .cat_file import CatFile
 from .config import Config
+from .forge import ForgeClient, ForgeError, PullRequestSpec
+from .git_process import GitStats, run_git
+from .image_index import ImageRefIndex, default_cache_path
+from .manifest_index import ManifestIndex
+from .manifest_rewriter import ManifestRewriter, rewrite_file
 from .models import FixResult, FixSuggestion
 
 logger = logging.getLogger(__name__)
@@ -16,23 +26,35 @@ logger = logging.getLogger(__name__)
 class GitClient:
     """Client for Git operations and PR creation."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, stats: GitStats | None = None):
         self.config = config
+        # Shared by clients that work for the same run, such as worktree workers
+        self.stats = stats or GitStats()
         self.repo_path = config.git_repo_path
         self.remote = config.git_remote
         self.main_branch = config.git_main_branch
         self.platform = config.git_platform
-
-    def _run_git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        self.commit_mode = config.git_commit_mode
+        self._base: str | None = None
+        self._objects: CatFile | None = None
+        self._forge: ForgeClient | None = None
+        self._forge_checked = False
+        self._manifest_index: ManifestIndex | None = None
+        self._image_index: ImageRefIndex | None = None
+        # Files rewritten this run, which a checkout may have changed back
+        self._touched: set[str] = set()
+
+    def _run_git(
+        self,
+        *args: str,
+        check: bool = True,
+        input: str | bytes | None = None,
+        env: dict[str, str] | None = None,
+        text: bool = True,
+    ) -> subprocess.CompletedProcess:
         """Run a git command in the repo directory."""
-        cmd = ["git", *args]
-        logger.debug(f"Running: {' '.join(cmd)}")
-        return subprocess.run(
-            cmd,
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-            check=check,
+        return run_git(
+            self.repo_path, *args, stats=self.stats, check=check, input=input, env=env, text=text
         )
 
     def _run_cli(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
@@ -40,13 +62,52 @@ class GitClient:
         cli = "gh" if self.platform == "github" else "glab"
         cmd = [cli, *args]
         logger.debug(f"Running: {' '.join(cmd)}")
-        return subprocess.run(
-            cmd,
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-            check=check,
-        )
+        start = time.monotonic()
+        try:
+            return subprocess.run(
+                cmd,
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+                check=check,
+            )
+        finally:
+            self.stats.record(f"{cli} {args[0]}", time.monotonic() - start)
+
+    def objects(self) -> CatFile:
+        """Reader for files at any ref, backed by long-lived cat-file processes."""
+        if self._objects is None:
+            self._objects = CatFile(self.repo_path, self.stats)
+        return self._objects
+
+    def forge(self) -> ForgeClient | None:
+        """REST client for the remote's forge, or None to use the gh/glab CLI."""
+        if not self._forge_checked:
+            self._forge_checked = True
+            if self.config.git_token:
+                try:
+                    remote_url = self._run_git("remote", "get-url", self.remote).stdout
+                    self._forge = ForgeClient.for_remote(
+                        self.platform, remote_url, self.config.git_token, self.config.git_api_url
+                    )
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    logger.warning(f"Using the {self.platform} CLI for PRs: {e}")
+        return self._forge
+
+    def close(self) -> None:
+        """Stop background git processes and save the image index."""
+        if self._objects:
+            self._objects.close()
+        if self._forge:
+            self._forge.close()
+        if self._image_index:
+            self._image_index.save()
+
+    def __enter__(self) -> "GitClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def ensure_clean_state(self) -> bool:
         """Ensure working directory is clean."""
@@ -56,16 +117,63 @@ class GitClient:
             return False
         return True
 
-    def checkout_main(self) -> None:
-        """Checkout and update main branch."""
+    def checkout_main(self, pull: bool = True) -> None:
+        """Checkout and (unless ``pull`` is False) update main branch."""
         self._run_git("checkout", self.main_branch)
-        self._run_git("pull", self.remote, self.main_branch)
+        if pull:
+            self._run_git("pull", self.remote, self.main_branch)
+
+        self._revalidate_indexes()
+
+    def _revalidate_indexes(self) -> None:
+        """Bring the manifest and image indexes in line with the checked-out tree."""
+        if self._manifest_index is None:
+            return
+        if self._manifest_index.head != self._head():
+            # The pull may have added or removed manifests; the image index
+            # catches up from git diff the next time it is opened
+            if self._image_index:
+                self._image_index.save()
+            self._manifest_index = None
+            self._image_index = None
+        else:
+            for path in self._touched:
+                self._manifest_index.refresh(path)
+                if self._image_index:
+                    self._image_index.rescan(path)
+        self._touched.clear()
+
+    def _head(self) -> str | None:
+        """Commit ID of HEAD, or None before the first commit."""
+        result = self._run_git("rev-parse", "--verify", "-q", "HEAD", check=False)
+        return result.stdout.strip() or None
+
+    def manifest_index(self) -> ManifestIndex:
+        """The repo's manifests, indexed on first use and reused for every image."""
+        if self._manifest_index is None:
+            self._manifest_index = ManifestIndex.build(self.repo_path, self.stats)
+        return self._manifest_index
+
+    def image_index(self) -> ImageRefIndex:
+        """Inverted index of image references, loaded from the repo's cache dir."""
+        if self._image_index is None:
+            self._image_index = ImageRefIndex.open(
+                self.repo_path,
+                self.manifest_index(),
+                default_cache_path(self.repo_path, self.stats),
+                self.stats,
+            )
+        return self._image_index
 
-    def create_branch(self, prefix: str = "autofix") -> str:
-        """Create a new branch for the fix."""
+    def new_branch_name(self, prefix: str = "autofix") -> str:
+        """Generate a unique branch name for a fix."""
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         short_id = uuid.uuid4().hex[:8]
-        branch_name = f"{prefix}/{timestamp}_{short_id}"
+        return f"{prefix}/{timestamp}_{short_id}"
+
+    def create_branch(self, prefix: str = "autofix") -> str:
+        """Create a new branch for the fix."""
+        branch_name = self.new_branch_name(prefix)
 
         self._run_git("checkout", "-b", branch_name)
         logger.info(f"Created branch: {branch_name}")
@@ -75,6 +183,7 @@ class GitClient:
         self,
         old_image: str,
         new_image: str,
+        paths: Iterable[str] | None = None,
     ) -> list[str]:
         """
         Search and update Kubernetes manifests with new image tag.
@@ -82,62 +191,280 @@ class GitClient:
         Args:
             old_image: Full old image reference (e.g., nginx:1.23.1)
             new_image: Full new image reference (e.g., nginx:1.23.4)
+            paths: Files to consider; defaults to those the image index
+                   lists for the image.
 
         Returns:
             List of files that were modified.
         """
         changed_files = []
+        images = self.image_index()
 
-        # File patterns to search
-        patterns = ["*.yaml", "*.yml", "values*.yaml", "Chart.yaml"]
+        # Only files the index says reference the image (or its tag) are read
+        for path in images.files_for(old_image) if paths is None else paths:
+            if self._update_file(self.repo_path / path, old_image, new_image):
+                self._mark_rewritten(path)
+                changed_files.append(path)
 
-        for pattern in patterns:
-            for file_path in self.repo_path.rglob(pattern):
-                if self._update_file(file_path, old_image, new_image):
-                    rel_path = str(file_path.relative_to(self.repo_path))
-                    changed_files.append(rel_path)
+        images.save()
 
         logger.info(f"Updated {len(changed_files)} files")
         return changed_files
 
+    def plan_manifest_updates(
+        self,
+        suggestions: Iterable[FixSuggestion],
+    ) -> dict[FixSuggestion, list[str]]:
+        """Files each suggestion would change, from one read-only pass per file."""
+        return self._rewrite_manifests(suggestions, write=False)
+
+    def update_manifests_for_images(
+        self,
+        suggestions: Iterable[FixSuggestion],
+    ) -> dict[FixSuggestion, list[str]]:
+        """
+        Apply many suggestions to the working tree at once.
+
+        Every candidate manifest is read and written at most once, whatever
+        the number of suggestions; see ManifestRewriter.
+
+        Returns:
+            Mapping of suggestion to the files it changed.
+        """
+        return self._rewrite_manifests(suggestions, write=True)
+
+    def _rewrite_manifests(
+        self,
+        suggestions: Iterable[FixSuggestion],
+        write: bool,
+    ) -> dict[FixSuggestion, list[str]]:
+        suggestions = list(suggestions)
+        rewriter = ManifestRewriter([
+            (s.full_current_image, s.full_suggested_image) for s in suggestions
+        ])
+        images = self.image_index()
+        candidates = sorted({
+            path for s in suggestions for path in images.files_for(s.full_current_image)
+        })
+
+        results = rewriter.rewrite_files(self.repo_path, candidates, write=write)
+        changed = [(path, result) for path, result in results.items() if result.changed]
+
+        if write:
+            for path, _ in changed:
+                self._mark_rewritten(path)
+            images.save()
+        return {
+            s: [path for path, result in changed if i in result.applied]
+            for i, s in enumerate(suggestions)
+        }
+
+    def _mark_rewritten(self, path: str) -> None:
+        """Update both indexes after a manifest was rewritten."""
+        self.manifest_index().refresh(path)
+        self.image_index().rescan(path)
+        self._touched.add(path)
+
     def _update_file(self, file_path: Path, old_image: str, new_image: str) -> bool:
-        """Update image references in a single file."""
-        try:
-            content = file_path.read_text()
-        except Exception as e:
-            logger.warning(f"Could not read {file_path}: {e}")
-            return False
+        """Update image references in a single file; see manifest_rewriter.rewrite_file."""
+        result = rewrite_file(file_path, old_image, new_image)
+        return result is not None and result.changed
 
-        # Patterns to match image references
-        patterns = [
-            # Standard Kubernetes: image: nginx:1.23.1
-            (rf'(image:\s*["\']?){re.escape(old_image)}(["\']?)', rf'\g<1>{new_image}\g<2>'),
-            # Helm values: repository: nginx, tag: 1.23.1
-            (rf'(tag:\s*["\']?){re.escape(old_image.split(":")[-1])}(["\']?)',
-             rf'\g<1>{new_image.split(":")[-1]}\g<2>'),
-        ]
+    def resolve_base(self, refresh: bool = False) -> str:
+        """
+        Commit that plumbing-mode fixes are built on.
 
-        modified = False
-        new_content = content
+        Fetches the main branch once per client (or again with ``refresh``)
+        and prefers the remote-tracking ref, falling back to the local branch.
+        """
+        if self._base and not refresh:
+            return self._base
 
-        for pattern, replacement in patterns:
-            if re.search(pattern, new_content):
-                new_content = re.sub(pattern, replacement, new_content)
-                modified = True
+        self._run_git("fetch", self.remote, self.main_branch, check=False)
+        remote_ref = f"refs/remotes/{self.remote}/{self.main_branch}^{{commit}}"
+        result = self._run_git("rev-parse", "--verify", "-q", remote_ref, check=False)
+        if result.returncode != 0:
+            result = self._run_git("rev-parse", "--verify", f"{self.main_branch}^{{commit}}")
+        self._base = result.stdout.strip()
+        return self._base
+
+    def find_files_at(self, ref: str, needles: Iterable[str]) -> list[str]:
+        """Manifests at ``ref`` containing any of the strings, searched in the object store."""
+        patterns = [arg for needle in sorted(set(needles)) for arg in ("-e", needle)]
+        result = self._run_git(
+            "grep", "-l", "-z", "-F", *patterns, ref, "--", "*.yaml", "*.yml",
+            check=False,
+        )
+        # Exit status 1 just means nothing matched
+        if result.returncode not in (0, 1):
+            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+        prefix = f"{ref}:"
+        return [path.removeprefix(prefix) for path in result.stdout.split("\0") if path]
 
-        if modified:
-            file_path.write_text(new_content)
-            return True
+    def read_blobs(self, ref: str, paths: Iterable[str]) -> dict[str, tuple[str, bytes]]:
+        """
+        File modes and contents at ``ref``, read from the object store.
 
-        return False
+        Returns:
+            Mapping of path to (mode, content) for the paths that exist.
+        """
+        paths = list(paths)
+        if not paths:
+            return {}
+
+        entries: dict[str, tuple[str, str]] = {}
+        listing = self._run_git("ls-tree", "-r", "-z", ref, "--", *paths)
+        for record in listing.stdout.split("\0"):
+            if not record:
+                continue
+            meta, path = record.split("\t", 1)
+            mode, kind, sha = meta.split()
+            if kind == "blob":
+                entries[path] = (mode, sha)
+
+        blobs = {}
+        for path, (mode, sha) in entries.items():
+            content = self.objects().read(sha)
+            if content is not None:
+                blobs[path] = (mode, content)
+        return blobs
+
+    def commit_files(
+        self,
+        branch_name: str,
+        parent: str,
+        files: dict[str, tuple[str, bytes]],
+        message: str,
+    ) -> str:
+        """
+        Create ``branch_name`` with one commit on ``parent`` that sets ``files``.
+
+        Uses plumbing only: blobs are written with hash-object, the tree is
+        built in a temporary index (read-tree, update-index, write-tree),
+        and the commit is made with commit-tree and update-ref. Neither the
+        working tree nor the real index is touched, and the fork count does
+        not depend on the number of files.
+
+        Args:
+            branch_name: Branch to create; must not exist yet.
+            parent: Commit to build on.
+            files: Mapping of path to (mode, content).
+            message: Commit message.
+
+        Returns:
+            The new commit ID.
+        """
+        with tempfile.TemporaryDirectory(prefix="autofix-") as tmp:
+            blob_files = []
+            for i, (_, content) in enumerate(files.values()):
+                blob_file = Path(tmp) / f"blob-{i}"
+                blob_file.write_bytes(content)
+                blob_files.append(str(blob_file))
+            shas = self._run_git(
+                "hash-object", "-w", "--no-filters", "--stdin-paths",
+                input="\n".join(blob_files) + "\n",
+            ).stdout.split()
+
+            env = {"GIT_INDEX_FILE": str(Path(tmp) / "index")}
+            self._run_git("read-tree", parent, env=env)
+            index_info = "".join(
+                f"{mode} {sha}\t{path}\0"
+                for (path, (mode, _)), sha in zip(files.items(), shas)
+            )
+            self._run_git("update-index", "-z", "--index-info", input=index_info, env=env)
+            tree = self._run_git("write-tree", env=env).stdout.strip()
+
+        commit = self._run_git("commit-tree", tree, "-p", parent, "-m", message).stdout.strip()
+        # An empty old value makes update-ref refuse to overwrite an existing branch
+        self._run_git("update-ref", f"refs/heads/{branch_name}", commit, "")
+        logger.info(f"Committed {len(files)} files to {branch_name} without checkout")
+        return commit
+
+    def fix_branches(self, prefix: str = "autofix/") -> list[str]:
+        """Remote-tracking fix branches, most recently committed first."""
+        result = self._run_git(
+            "for-each-ref", "--sort=-committerdate", "--format=%(refname:short)",
+            f"refs/remotes/{self.remote}/{prefix}",
+            check=False,
+        )
+        return result.stdout.split() if result.returncode == 0 else []
+
+    def pending_fix_branch(self, suggestion: FixSuggestion, paths: Iterable[str]) -> str | None:
+        """
+        A fix branch on which every one of ``paths`` no longer references the old image.
+
+        Files are read at each branch through :meth:`objects`, so checking
+        many branches costs a single for-each-ref fork.
+
+        Returns:
+            The first such branch, or None.
+        """
+        paths = list(paths)
+        if not paths:
+            return None
+        rewriter = ManifestRewriter([(suggestion.full_current_image, suggestion.full_suggested_image)])
+        for branch in self.fix_branches():
+            contents = [self.objects().read_text(branch, path) for path in paths]
+            if all(text is not None and not rewriter.rewrite(text)[1] for text in contents):
+                return branch
+        return None
+
+    def build_fix_commit(
+        self,
+        branch_name: str,
+        suggestions: Iterable[FixSuggestion],
+        message: str,
+        base: str | None = None,
+    ) -> dict[FixSuggestion, list[str]]:
+        """
+        Commit the suggestions' manifest changes onto ``base`` as a new branch.
+
+        Candidate files are found with git grep at ``base`` and rewritten in
+        memory from their blobs, so the working tree is never read or
+        written. No branch is created if nothing changes.
+
+        Returns:
+            Mapping of suggestion to the files it changed.
+        """
+        suggestions = list(suggestions)
+        base = base or self.resolve_base()
+        rewriter = ManifestRewriter([
+            (s.full_current_image, s.full_suggested_image) for s in suggestions
+        ])
+        needles = {
+            needle
+            for s in suggestions
+            for needle in (s.full_current_image, s.full_current_image.split(":")[-1])
+        }
+
+        changes: dict[str, tuple[str, bytes]] = {}
+        files: dict[int, list[str]] = {i: [] for i in range(len(suggestions))}
+        for path, (mode, content) in self.read_blobs(base, self.find_files_at(base, needles)).items():
+            try:
+                text = content.decode()
+            except UnicodeDecodeError:
+                continue
+            new_text, applied = rewriter.rewrite(text)
+            if new_text == text:
+                continue
+            changes[path] = (mode, new_text.encode())
+            for index in sorted(applied):
+                files[index].append(path)
+
+        if changes:
+            self.commit_files(branch_name, base, changes, message)
+        return {s: files[i] for i, s in enumerate(suggestions)}
 
     def commit_changes(self, files: list[str], message: str) -> bool:
         """Stage and commit changes."""
         if not files:
             return False
 
-        for file in files:
-            self._run_git("add", file)
+        # One git add for any number of files, with paths fed on stdin
+        self._run_git(
+            "add", "--pathspec-from-file=-", "--pathspec-file-nul",
+            input="\0".join(files) + "\0",
+        )
 
         self._run_git("commit", "-m", message)
         logger.info(f"Committed changes: {message}")
@@ -158,7 +485,24 @@ class GitClient:
         title: str,
         body: str,
     ) -> str | None:
-        """Create a pull request using gh/glab CLI."""
+        """
+        Create a pull request and return its URL.
+
+        Uses the forge's REST API over a pooled session when a token is
+        configured (see forge()), and the gh/glab CLI otherwise.
+        """
+        forge = self.forge()
+        if forge:
+            try:
+                pr_url = forge.create_pull_request(
+                    PullRequestSpec(branch_name, title, body, self.main_branch)
+                )
+            except (ForgeError, requests.RequestException) as e:
+                logger.error(f"Failed to create PR: {e}")
+                return None
+            logger.info(f"Created PR: {pr_url}")
+            return pr_url
+
         if self.platform == "github":
             result = self._run_cli(
                 "pr", "create",
@@ -196,6 +540,9 @@ def apply_fix(
     """
     Apply a fix suggestion: create branch, update files, commit, push, and create PR.
 
+    With GIT_COMMIT_MODE=plumbing the branch is built from blobs without
+    checking anything out; see GitClient.build_fix_commit.
+
     Args:
         git_client: GitClient instance
         suggestion: Fix suggestion to apply
@@ -203,6 +550,9 @@ def apply_fix(
     Returns:
         FixResult with details of what happened.
     """
+    if git_client.commit_mode == "plumbing":
+        return _apply_fix_plumbing(git_client, suggestion)
+
     result = FixResult(suggestion=suggestion)
 
     try:
@@ -225,21 +575,187 @@ def apply_fix(
 
         if not changed_files:
             result.error = f"No manifests found referencing {old_image}"
-            git_client.checkout_main()
             return result
 
         # Commit changes
-        commit_msg = f"Auto-fix: bump {suggestion.current_image} from {suggestion.current_tag} to {suggestion.suggested_tag}\n\nVulnerability remediation for finding #{suggestion.finding_id}"
-        git_client.commit_changes(changed_files, commit_msg)
+        git_client.commit_changes(changed_files, _commit_message(suggestion))
 
-        # Push branch
-        if not git_client.push_branch(branch_name):
-            result.error = "Failed to push branch"
+        _push_and_open_pr(git_client, suggestion, result)
+
+    except Exception as e:
+        logger.exception(f"Error applying fix: {e}")
+        result.error = str(e)
+
+    finally:
+        # Return to main branch; the next fix pulls before branching
+        try:
+            git_client.checkout_main(pull=False)
+        except Exception:
+            pass
+
+    return result
+
+
+def _apply_fix_plumbing(git_client: GitClient, suggestion: FixSuggestion) -> FixResult:
+    """apply_fix without touching the working tree."""
+    result = FixResult(suggestion=suggestion)
+
+    try:
+        branch_name = git_client.new_branch_name()
+        changes = git_client.build_fix_commit(
+            branch_name, [suggestion], _commit_message(suggestion)
+        )
+        result.files_changed = changes[suggestion]
+
+        if not result.files_changed:
+            result.error = f"No manifests found referencing {suggestion.full_current_image}"
             return result
 
-        # Create PR
-        pr_title = f"[Autofix] Bump {suggestion.current_image} to {suggestion.suggested_tag}"
-        pr_body = f"""## Automated Vulnerability Fix
+        result.branch_name = branch_name
+        _push_and_open_pr(git_client, suggestion, result)
+
+    except Exception as e:
+        logger.exception(f"Error applying fix: {e}")
+        result.error = str(e)
+
+    return result
+
+
+def apply_fix_batch(
+    git_client: GitClient,
+    suggestions: list[FixSuggestion],
+    label: str = "",
+) -> list[FixResult]:
+    """
+    Apply many fix suggestions on one branch with one commit and one PR.
+
+    Pushes and PRs no longer grow with the number of suggestions. Every
+    result shares the branch and PR; a suggestion that changed no files
+    gets an error and does not count as fixed.
+
+    Args:
+        git_client: GitClient instance
+        suggestions: Fix suggestions to apply together
+        label: What the batch groups, shown in the PR title
+
+    Returns:
+        One FixResult per suggestion, in order.
+    """
+    results = [FixResult(suggestion=s) for s in suggestions]
+    message = _batch_commit_message(suggestions, label)
+    plumbing = git_client.commit_mode == "plumbing"
+
+    try:
+        if plumbing:
+            branch_name = git_client.new_branch_name()
+            changes = git_client.build_fix_commit(branch_name, suggestions, message)
+        else:
+            if not git_client.ensure_clean_state():
+                raise RuntimeError("Working directory not clean")
+            git_client.checkout_main()
+            branch_name = git_client.create_branch()
+            changes = git_client.update_manifests_for_images(suggestions)
+
+        changed_files = sorted({path for files in changes.values() for path in files})
+        for result in results:
+            result.files_changed = changes[result.suggestion]
+            if not result.files_changed:
+                result.error = f"No manifests found referencing {result.suggestion.full_current_image}"
+        if not changed_files:
+            return results
+
+        if not plumbing:
+            git_client.commit_changes(changed_files, message)
+
+        fixed = [r for r in results if r.files_changed]
+        for result in fixed:
+            result.branch_name = branch_name
+        if not git_client.push_branch(branch_name):
+            for result in fixed:
+                result.error = "Failed to push branch"
+            return results
+
+        pr_url = git_client.create_pull_request(
+            branch_name,
+            _batch_pr_title(fixed, label),
+            _batch_pr_body(fixed, changed_files),
+        )
+        for result in fixed:
+            result.pr_url = pr_url
+            result.success = pr_url is not None
+
+    except Exception as e:
+        logger.exception(f"Error applying fix batch: {e}")
+        for result in results:
+            result.error = result.error or str(e)
+
+    finally:
+        if not plumbing:
+            try:
+                git_client.checkout_main(pull=False)
+            except Exception:
+                pass
+
+    return results
+
+
+def _batch_commit_message(suggestions: list[FixSuggestion], label: str) -> str:
+    scope = f" in {label}" if label else ""
+    lines = [
+        f"- {s.current_image}: {s.current_tag} -> {s.suggested_tag} (finding #{s.finding_id})"
+        for s in suggestions
+    ]
+    return f"Auto-fix: bump {len(suggestions)} images{scope}\n\n" + "\n".join(lines)
+
+
+def _batch_pr_title(results: list[FixResult], label: str) -> str:
+    if len(results) == 1:
+        s = results[0].suggestion
+        return f"[Autofix] Bump {s.current_image} to {s.suggested_tag}"
+    scope = f" in {label}" if label else ""
+    return f"[Autofix] Bump {len(results)} images{scope}"
+
+
+def _batch_pr_body(results: list[FixResult], changed_files: list[str]) -> str:
+    rows = "\n".join(
+        f"| `{r.suggestion.current_image}` | `{r.suggestion.current_tag}` | "
+        f"`{r.suggestion.suggested_tag}` | #{r.suggestion.finding_id} | {r.suggestion.confidence} |"
+        for r in results
+    )
+    return f"""## Automated Vulnerability Fixes
+
+This PR was automatically generated by autofix-dojo and bumps {len(results)} images.
+
+### Changes
+| Image | Current version | New version | Finding ID | Confidence |
+|-------|-----------------|-------------|------------|------------|
+{rows}
+
+### Files Changed
+{chr(10).join(f'- `{f}`' for f in changed_files)}
+
+---
+*Generated by [autofix-dojo](https://github.com/your-org/autofix-dojo)*
+"""
+
+
+def _commit_message(suggestion: FixSuggestion) -> str:
+    return f"Auto-fix: bump {suggestion.current_image} from {suggestion.current_tag} to {suggestion.suggested_tag}\n\nVulnerability remediation for finding #{suggestion.finding_id}"
+
+
+def _push_and_open_pr(git_client: GitClient, suggestion: FixSuggestion, result: FixResult) -> None:
+    """Push the fix branch and open its PR, recording the outcome on ``result``."""
+    branch_name = result.branch_name
+    changed_files = result.files_changed
+
+    # Push branch
+    if not git_client.push_branch(branch_name):
+        result.error = "Failed to push branch"
+        return
+
+    # Create PR
+    pr_title = f"[Autofix] Bump {suggestion.current_image} to {suggestion.suggested_tag}"
+    pr_body = f"""## Automated Vulnerability Fix
 
 This PR was automatically generated by autofix-dojo.
 
@@ -260,19 +776,7 @@ This PR was automatically generated by autofix-dojo.
 *Generated by [autofix-dojo](https://github.com/your-org/autofix-dojo)*
 """
 
-        pr_url = git_client.create_pull_request(branch_name, pr_title, pr_body)
-        result.pr_url = pr_url
-        result.success = pr_url is not None
-
-    except Exception as e:
-        logger.exception(f"Error applying fix: {e}")
-        result.error = str(e)
-
-    finally:
-        # Return to main branch
-        try:
-            git_client.checkout_main()
-        except Exception:
-            pass
+    pr_url = git_client.create_pull_request(branch_name, pr_title, pr_body)
+    result.pr_url = pr_url
+    result.success = pr_url is not None
 
-    return result
@@ -0,0 +1,63 @@
+"""Running git subprocesses and accounting for them."""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GitStats:
+    """Subprocesses a run spawned for git and gh/glab, and the time spent in them."""
+
+    processes: int = 0
+    total_seconds: float = 0.0
+    by_command: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, command: str, seconds: float) -> None:
+        """Record one spawned process (safe to call from worker threads)."""
+        with self._lock:
+            self.processes += 1
+            self.total_seconds += seconds
+            self.by_command[command] += 1
+
+
+def run_git(
+    repo_path: Path,
+    *args: str,
+    stats: GitStats | None = None,
+    check: bool = True,
+    input: str | bytes | None = None,
+    env: dict[str, str] | None = None,
+    text: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    Run a git command in ``repo_path``, recording it on ``stats`` if given.
+
+    Raises:
+        subprocess.CalledProcessError: If ``check`` and git fails.
+        OSError: If git cannot be started.
+    """
+    cmd = ["git", *args]
+    logger.debug(f"Running: {' '.join(cmd)}")
+    start = time.monotonic()
+    try:
+        return subprocess.run(
+            cmd,
+            cwd=repo_path,
+            capture_output=True,
+            text=text,
+            check=check,
+            input=input,
+            env={**os.environ, **env} if env else None,
+        )
+    finally:
+        if stats is not None:
+            stats.record(f"git {args[0]}", time.monotonic() - start)
@@ -0,0 +1,185 @@
+"""On-disk HTTP response cache with conditional-request validators."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# Decoded detail responses kept in memory so a 304 skips JSON decoding.
+# Only callers that pass ``memoize=True`` use it; list pages are decoded
+# again so a full scan never holds every finding in memory.
+DECODED_MEMO_SIZE = 256
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body and the validators to revalidate it."""
+
+    key: str
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that turn a GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Caches response bodies in SQLite, keyed by URL and query parameters.
+
+    Entries carry their ETag/Last-Modified validators. Total body size is
+    bounded by ``max_bytes``; the least recently used entries are evicted
+    first so the cache is safe on a small volume.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 64 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._decoded: OrderedDict[str, Any] = OrderedDict()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)"
+            )
+
+    @staticmethod
+    def make_key(url: str, params: dict | None = None) -> str:
+        """Stable cache key for a URL plus query parameters."""
+        query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Look up a cached response."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return CachedResponse(key=key, etag=row[0], last_modified=row[1], body=row[2])
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        body: bytes,
+        etag: str | None,
+        last_modified: str | None,
+        decoded: Any = None,
+    ) -> None:
+        """
+        Store a response that carries validators, then enforce the size bound.
+
+        ``decoded``, when given, is kept in the in-memory memo so a later 304
+        for the same key is not decoded again. Pass it only for small detail
+        responses.
+        """
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, url, etag, last_modified, body, size, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, url, etag, last_modified, body, len(body), time.time()),
+                )
+                self._evict()
+            if decoded is not None:
+                self._remember(key, decoded)
+
+    def decode(
+        self,
+        entry: CachedResponse,
+        loads: Callable[[bytes], Any] = json.loads,
+        memoize: bool = False,
+    ) -> Any:
+        """
+        Return the decoded body for a revalidated (304) entry.
+
+        Marks the entry as recently used and reuses the in-memory decoded
+        copy when there is one; otherwise the body is decoded with ``loads``
+        and, with ``memoize``, kept for the next revalidation.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), entry.key)
+                )
+            decoded = self._decoded.get(entry.key)
+            if decoded is not None:
+                self._decoded.move_to_end(entry.key)
+                return decoded
+
+        decoded = loads(entry.body)
+        if memoize:
+            with self._lock:
+                self._remember(entry.key, decoded)
+        return decoded
+
+    def total_bytes(self) -> int:
+        """Total size of cached bodies."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _remember(self, key: str, decoded: Any) -> None:
+        """Keep a decoded body in the bounded in-memory memo (lock held)."""
+        self._decoded[key] = decoded
+        self._decoded.move_to_end(key)
+        while len(self._decoded) > DECODED_MEMO_SIZE:
+            self._decoded.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evict = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+        for (key,) in evict:
+            self._decoded.pop(key, None)
+        logger.debug(f"Evicted {len(evict)} cached responses")
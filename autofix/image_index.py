@@ -0,0 +1,241 @@
+"""Persistent inverted index of image references in a GitOps repository."""
+
+import bisect
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .git_process import GitStats, run_git
+from .manifest_index import ManifestIndex
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# The references GitClient rewrites: "image: <name:tag>" and "tag: <tag>".
+# Values are indexed whole; lookups match by prefix, like the rewrite regexes.
+IMAGE_REF_RE = re.compile(r'(image|tag):\s*["\']?([^\s"\']+)')
+
+
+@dataclass(frozen=True, slots=True)
+class ImageRef:
+    """One image or tag value in a manifest, with its position."""
+
+    path: str
+    kind: str  # "image" or "tag"
+    value: str
+    line: int  # 1-based
+    start: int  # column span of the value on that line
+    end: int
+
+
+class ImageRefIndex:
+    """
+    Maps image references and tags to the manifests and line spans holding them.
+
+    The index is persisted as JSON (per file: its size, mtime and
+    references) under the repository's git directory. On open it is brought
+    up to date incrementally: files reported by ``git diff --name-only``
+    since the indexed commit, files whose size or mtime changed, and new
+    files are rescanned; deleted files are dropped. Only those files are
+    read, so a run that fixes a handful of images reads a handful of files.
+    """
+
+    def __init__(self, repo_path: Path, cache_path: Path | None = None):
+        self.repo_path = repo_path
+        self.cache_path = cache_path
+        self.head: str | None = None
+        self._files: dict[str, dict] = {}
+        self._by_value: dict[str, dict[str, set[str]]] = {"image": defaultdict(set), "tag": defaultdict(set)}
+        self._sorted: dict[str, list[str]] = {}
+        self._dirty = False
+
+    @classmethod
+    def open(
+        cls,
+        repo_path: Path,
+        manifests: ManifestIndex,
+        cache_path: Path | None = None,
+        stats: GitStats | None = None,
+    ) -> "ImageRefIndex":
+        """Load the saved index (if any) and sync it with the work tree."""
+        index = cls(repo_path, cache_path)
+        changed: Iterable[str] | None = ()
+        if index._load():
+            if index.head and manifests.head and index.head != manifests.head:
+                changed = _git_changed_paths(repo_path, index.head, manifests.head, stats)
+                if changed is None:
+                    logger.info("Indexed commit is gone, rebuilding image index")
+                    index = cls(repo_path, cache_path)
+        index.sync(manifests, changed or ())
+        if index.head != manifests.head:
+            index.head = manifests.head
+            index._dirty = True
+        return index
+
+    def _load(self) -> bool:
+        if not self.cache_path or not self.cache_path.exists():
+            return False
+        try:
+            saved = json.loads(self.cache_path.read_text())
+            if saved.get("version") != INDEX_VERSION:
+                return False
+            self.head = saved.get("head")
+            self._files = saved["files"]
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable image index {self.cache_path}: {e}")
+            return False
+        for path, record in self._files.items():
+            self._add_values(path, record["refs"])
+        return True
+
+    def save(self) -> None:
+        """Write the index to its cache file, if it changed."""
+        if not self.cache_path or not self._dirty:
+            return
+        payload = json.dumps({"version": INDEX_VERSION, "head": self.head, "files": self._files})
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save image index to {self.cache_path}: {e}")
+
+    def sync(self, manifests: ManifestIndex, changed: Iterable[str] = ()) -> int:
+        """
+        Rescan new, changed and listed files and drop deleted ones.
+
+        Returns:
+            Number of files rescanned.
+        """
+        changed = set(changed)
+        for path in list(self._files):
+            if path not in manifests:
+                self._remove(path)
+
+        rescanned = 0
+        for entry in manifests:
+            record = self._files.get(entry.path)
+            if (
+                record is None
+                or entry.path in changed
+                or record["size"] != entry.size
+                or record["mtime_ns"] != entry.mtime_ns
+            ):
+                self.rescan(entry.path)
+                rescanned += 1
+
+        if rescanned:
+            logger.info(f"Image index: rescanned {rescanned} of {len(manifests)} manifests")
+        return rescanned
+
+    def rescan(self, path: str) -> None:
+        """Re-read one file and replace its references."""
+        self._remove(path)
+        file_path = self.repo_path / path
+        try:
+            st = os.stat(file_path)
+            content = file_path.read_text()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Not indexing {path}: {e}")
+            return
+
+        refs = _scan(content)
+        self._files[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "refs": refs}
+        self._add_values(path, refs)
+        self._dirty = True
+
+    def files_for(self, image: str) -> list[str]:
+        """
+        Files that may reference ``image`` by full name or by tag.
+
+        Matches values starting with the image, or with its tag, exactly as
+        the rewrite patterns in GitClient do.
+        """
+        tag = image.split(":")[-1]
+        paths = self._prefix_paths("image", image) | self._prefix_paths("tag", tag)
+        return sorted(paths)
+
+    def refs_for(self, image: str) -> list[ImageRef]:
+        """References to ``image`` (by full name or tag), in file and line order."""
+        tag = image.split(":")[-1]
+        refs = []
+        for path in self.files_for(image):
+            for kind, value, line, start, end in self._files[path]["refs"]:
+                if value.startswith(image if kind == "image" else tag):
+                    refs.append(ImageRef(path, kind, value, line, start, end))
+        return refs
+
+    def _prefix_paths(self, kind: str, prefix: str) -> set[str]:
+        if kind not in self._sorted:
+            self._sorted[kind] = sorted(self._by_value[kind])
+        values = self._sorted[kind]
+        paths: set[str] = set()
+        for i in range(bisect.bisect_left(values, prefix), len(values)):
+            if not values[i].startswith(prefix):
+                break
+            paths |= self._by_value[kind][values[i]]
+        return paths
+
+    def _add_values(self, path: str, refs: list) -> None:
+        for kind, value, *_ in refs:
+            self._by_value[kind][value].add(path)
+        self._sorted.clear()
+
+    def _remove(self, path: str) -> None:
+        record = self._files.pop(path, None)
+        if not record:
+            return
+        for kind, value, *_ in record["refs"]:
+            paths = self._by_value[kind].get(value)
+            if paths:
+                paths.discard(path)
+                if not paths:
+                    del self._by_value[kind][value]
+        self._sorted.clear()
+        self._dirty = True
+
+
+def _scan(content: str) -> list[list]:
+    """Image/tag references in a file as [kind, value, line, start, end] lists."""
+    line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+    refs = []
+    for match in IMAGE_REF_RE.finditer(content):
+        offset = match.start(2)
+        line = bisect.bisect_right(line_starts, offset)
+        column = offset - line_starts[line - 1]
+        refs.append([match.group(1), match.group(2), line, column, column + len(match.group(2))])
+    return refs
+
+
+def _git_changed_paths(
+    repo_path: Path,
+    since: str,
+    head: str,
+    stats: GitStats | None = None,
+) -> list[str] | None:
+    """Paths changed between two commits, relative to repo_path; None if unknown."""
+    result = run_git(
+        repo_path, "diff", "--name-only", "--relative", "-z", since, head,
+        stats=stats, check=False, text=False,
+    )
+    if result.returncode != 0:
+        return None
+    return [p for p in result.stdout.decode().split("\0") if p]
+
+
+def default_cache_path(repo_path: Path, stats: GitStats | None = None) -> Path | None:
+    """Where the index lives: <git dir>/autofix/image-index.json, or None outside git."""
+    result = run_git(
+        repo_path, "rev-parse", "--git-path", "autofix/image-index.json", stats=stats, check=False
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return repo_path / result.stdout.strip()
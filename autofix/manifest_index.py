@@ -0,0 +1,130 @@
+"""One-pass index of the YAML manifests in a repository."""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .git_process import GitStats, run_git
+
+logger = logging.getLogger(__name__)
+
+# Manifest file extensions (values*.yaml and Chart.yaml are covered by .yaml)
+MANIFEST_SUFFIXES = (".yaml", ".yml")
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestFile:
+    """A manifest in the index, with the stat it was indexed at."""
+
+    path: str  # relative to the repo root, "/"-separated
+    size: int
+    mtime_ns: int
+
+
+class ManifestIndex:
+    """
+    The YAML files of a repository, found with a single walk.
+
+    Inside a git work tree the file list comes from ``git ls-files``, which
+    honours .gitignore and never descends into .git. Elsewhere the tree is
+    walked once with os.walk, skipping .git directories. Each file is
+    recorded with its size and mtime so callers can tell whether it changed
+    since it was indexed.
+    """
+
+    def __init__(self, repo_path: Path, files: list[ManifestFile], head: str | None = None):
+        self.repo_path = repo_path
+        self.head = head
+        self._files = {f.path: f for f in files}
+
+    @classmethod
+    def build(cls, repo_path: Path, stats: GitStats | None = None) -> "ManifestIndex":
+        """Walk ``repo_path`` once and index every manifest in it."""
+        listed = _git_ls_manifests(repo_path, stats)
+        if listed is None:
+            listed = _walk_manifests(repo_path)
+            head = None
+        else:
+            head = _git_head(repo_path, stats)
+
+        files = []
+        for rel_path in listed:
+            entry = _stat(repo_path, rel_path)
+            if entry:
+                files.append(entry)
+
+        logger.debug(f"Indexed {len(files)} manifests under {repo_path}")
+        return cls(repo_path, files, head)
+
+    def __iter__(self) -> Iterator[ManifestFile]:
+        return iter(self._files.values())
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._files
+
+    def get(self, rel_path: str) -> ManifestFile | None:
+        """Look up a manifest by its repo-relative path."""
+        return self._files.get(rel_path)
+
+    def is_stale(self, rel_path: str) -> bool:
+        """Whether a file's size or mtime differs from what was indexed."""
+        entry = self._files.get(rel_path)
+        return entry is None or _stat(self.repo_path, rel_path) != entry
+
+    def refresh(self, rel_path: str) -> None:
+        """Re-stat one file, e.g. after rewriting it."""
+        entry = _stat(self.repo_path, rel_path)
+        if entry:
+            self._files[rel_path] = entry
+        else:
+            self._files.pop(rel_path, None)
+
+
+def _stat(repo_path: Path, rel_path: str) -> ManifestFile | None:
+    try:
+        st = os.stat(repo_path / rel_path)
+    except OSError:
+        # Listed by git but deleted from the work tree
+        return None
+    return ManifestFile(path=rel_path, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+def _git_ls_manifests(repo_path: Path, stats: GitStats | None = None) -> list[str] | None:
+    """Tracked and untracked, non-ignored manifests; None outside a git work tree."""
+    try:
+        result = run_git(
+            repo_path,
+            "ls-files", "-z", "--cached", "--others", "--exclude-standard",
+            "--", *(f"*{suffix}" for suffix in MANIFEST_SUFFIXES),
+            stats=stats,
+            check=False,
+            text=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    # A path is listed once per stage during a merge conflict
+    return list(dict.fromkeys(p for p in result.stdout.decode().split("\0") if p))
+
+
+def _git_head(repo_path: Path, stats: GitStats | None = None) -> str | None:
+    result = run_git(repo_path, "rev-parse", "--verify", "-q", "HEAD", stats=stats, check=False)
+    return result.stdout.strip() or None
+
+
+def _walk_manifests(repo_path: Path) -> list[str]:
+    """Manifests found by walking the directory tree, skipping .git."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(repo_path):
+        dirnames[:] = sorted(d for d in dirnames if d != ".git")
+        rel_dir = os.path.relpath(dirpath, repo_path)
+        for name in sorted(filenames):
+            if name.endswith(MANIFEST_SUFFIXES):
+                found.append(name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/"))
+    return found
@@ -0,0 +1,291 @@
+"""Rewrite image references in manifests, in memory first and atomically on disk."""
+
+import difflib
+import logging
+import os
+import re
+import stat
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+from .values_locator import locate_tags, replace_tags, same_repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ByteChange:
+    """One changed span: ``old`` at byte ``offset`` of the original became ``new``."""
+
+    offset: int
+    old: bytes
+    new: bytes
+
+
+@dataclass
+class FileRewrite:
+    """Outcome of rewriting one file."""
+
+    path: Path
+    replacements: int = 0
+    changes: list[ByteChange] = field(default_factory=list)
+    # Indexes of the ManifestRewriter replacements that matched
+    applied: set[int] = field(default_factory=set)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changes)
+
+
+@lru_cache(maxsize=1024)
+def image_pattern(old_image: str, new_image: str) -> tuple[re.Pattern, str]:
+    """Compiled ``image: <old_image>`` pattern and its replacement, cached per image."""
+    # Standard Kubernetes: image: nginx:1.23.1
+    return (
+        re.compile(rf'(image:\s*["\']?){re.escape(old_image)}(["\']?)'),
+        rf'\g<1>{new_image}\g<2>',
+    )
+
+
+def rewrite_image(content: str, old_image: str, new_image: str) -> tuple[str, int]:
+    """
+    Apply one image bump in memory; returns (content, references replaced).
+
+    ``image:`` references are replaced with one subn scan. Helm-style tags
+    are only replaced where values_locator pairs them with the image's
+    repository, so unrelated charts sharing a version string are left alone.
+    """
+    pattern, replacement = image_pattern(old_image, new_image)
+    content, images = pattern.subn(replacement, content)
+    # Helm values: repository: nginx, tag: 1.23.1
+    content, tags = replace_tags(content, old_image, new_image)
+    return content, images + tags
+
+
+def rewrite_file(
+    file_path: Path,
+    old_image: str,
+    new_image: str,
+    write: bool = True,
+) -> FileRewrite | None:
+    """
+    Bump one image in a file, writing it only if its bytes change.
+
+    Args:
+        file_path: Manifest to rewrite.
+        old_image: Full old image reference (e.g., nginx:1.23.1)
+        new_image: Full new image reference (e.g., nginx:1.23.4)
+        write: Write the result back; False only computes the changes.
+
+    Returns:
+        What changed, or None if the file could not be read.
+    """
+
+    def bump(content: str) -> tuple[str, list[int]]:
+        new_content, replacements = rewrite_image(content, old_image, new_image)
+        return new_content, [0] * replacements
+
+    return _rewrite_path(file_path, bump, write)
+
+
+def _rewrite_path(
+    file_path: Path,
+    rewrite: Callable[[str], tuple[str, list[int]]],
+    write: bool,
+) -> FileRewrite | None:
+    """
+    Read a file, rewrite it in memory and write it back only if its bytes change.
+
+    ``rewrite`` returns the new content and the replacement index of each
+    edit it made. Both rewrite_file and ManifestRewriter go through here.
+    """
+    try:
+        original = file_path.read_bytes()
+        content = original.decode()
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Could not read {file_path}: {e}")
+        return None
+
+    new_content, edits = rewrite(content)
+    result = FileRewrite(file_path, len(edits), applied=set(edits))
+    if new_content == content:
+        return result
+
+    updated = new_content.encode()
+    result.changes = byte_changes(original, updated)
+    for change in result.changes:
+        logger.debug(f"{file_path}@{change.offset}: {change.old!r} -> {change.new!r}")
+    if write:
+        write_atomic(file_path, updated)
+    return result
+
+
+def byte_changes(old: bytes, new: bytes) -> list[ByteChange]:
+    """
+    Changed spans between two versions of a file.
+
+    Image bumps never add or remove lines, so lines are compared pairwise
+    and trimmed to the differing bytes; other edits fall back to difflib.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    if len(old_lines) != len(new_lines):
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        return [
+            ByteChange(i1, old[i1:i2], new[j1:j2])
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != "equal"
+        ]
+
+    changes = []
+    offset = 0
+    for old_line, new_line in zip(old_lines, new_lines):
+        if old_line != new_line:
+            prefix = len(os.path.commonprefix([old_line, new_line]))
+            suffix = len(os.path.commonprefix([old_line[prefix:][::-1], new_line[prefix:][::-1]]))
+            changes.append(ByteChange(
+                offset + prefix,
+                old_line[prefix:len(old_line) - suffix],
+                new_line[prefix:len(new_line) - suffix],
+            ))
+        offset += len(old_line)
+    return changes
+
+
+def write_atomic(file_path: Path, content: bytes) -> None:
+    """
+    Replace a file's content via a temp file and rename.
+
+    Readers, and a crash at any point, see either the old or the new
+    content, never a partial write. The file's permissions are kept and a
+    symlinked manifest is updated at its target.
+    """
+    target = Path(os.path.realpath(file_path))
+    mode = stat.S_IMODE(os.stat(target).st_mode)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class ManifestRewriter:
+    """
+    Applies several image bumps with one combined matcher.
+
+    Each replacement is an ``(old_image, new_image)`` pair and rewrites the
+    same references rewrite_image does: ``image: <old_image>``, and
+    ``tag: <old_tag>`` where it is paired with the image's repository. All
+    old images go into a single regex alternation behind the literal
+    ``image:`` key, and tags come from one values_locator parse, so a file
+    is scanned once however many replacements there are. Longer images are
+    tried first, and when two replacements share an old image and tag the
+    first one being applied wins. Replacements never chain: every edit is
+    located in the original content.
+    """
+
+    def __init__(self, replacements: Sequence[tuple[str, str]]):
+        self.replacements = list(replacements)
+        # Old value -> (new value, replacement index), in replacement order
+        self._images: dict[str, list[tuple[str, int]]] = {}
+        # Old tag -> (new tag, replacement index, image name)
+        self._tags: dict[str, list[tuple[str, int, str]]] = {}
+        for i, (old_image, new_image) in enumerate(self.replacements):
+            self._images.setdefault(old_image, []).append((new_image, i))
+            name, _, old_tag = old_image.rpartition(":")
+            if name:
+                self._tags.setdefault(old_tag, []).append((new_image.rpartition(":")[2], i, name))
+
+        self._pattern = re.compile(rf'image:\s*["\']?(?P<image>{_alternation(self._images)})')
+
+    def rewrite(self, content: str, only: set[int] | None = None) -> tuple[str, set[int]]:
+        """
+        Apply the replacements to one file's content.
+
+        Args:
+            content: Text to rewrite.
+            only: Indexes of the replacements to apply; all when None.
+
+        Returns:
+            The new content and the indexes of the replacements that matched.
+        """
+        new_content, edits = self._apply(content, only)
+        return new_content, set(edits)
+
+    def _apply(self, content: str, only: set[int] | None) -> tuple[str, list[int]]:
+        """Apply the replacements; returns the content and each edit's replacement index."""
+        # (start, end, new value, replacement index), as spans of the original
+        edits: list[tuple[int, int, str, int]] = []
+        for match in self._pattern.finditer(content):
+            for new_value, index in self._images[match.group("image")]:
+                if only is None or index in only:
+                    edits.append((match.start("image"), match.end("image"), new_value, index))
+                    break
+
+        # Only parse files that contain one of the old tags at all
+        if any(tag in content for tag in self._tags):
+            for ref in locate_tags(content):
+                for new_value, index, name in self._tags.get(ref.value, ()):
+                    if (only is None or index in only) and same_repository(ref.repository, name):
+                        edits.append((ref.start, ref.end, new_value, index))
+                        break
+
+        applied: list[int] = []
+        parts = []
+        pos = 0
+        for start, end, new_value, index in sorted(edits):
+            if start < pos:
+                continue
+            parts.append(content[pos:start])
+            parts.append(new_value)
+            applied.append(index)
+            pos = end
+        parts.append(content[pos:])
+        return "".join(parts), applied
+
+    def rewrite_files(
+        self,
+        repo_path: Path,
+        paths: Iterable[str],
+        write: bool = True,
+        only: set[int] | None = None,
+    ) -> dict[str, FileRewrite]:
+        """
+        Rewrite each file once, writing it only if its bytes change.
+
+        Args:
+            repo_path: Root the paths are relative to.
+            paths: Candidate files.
+            write: Write changed files back; False only computes the plan.
+            only: Indexes of the replacements to apply; all when None.
+
+        Returns:
+            Mapping of each readable path, in the order given, to what
+            changed in it and which replacements matched.
+        """
+        results: dict[str, FileRewrite] = {}
+        for path in paths:
+            result = _rewrite_path(repo_path / path, lambda content: self._apply(content, only), write)
+            if result is not None:
+                results[path] = result
+
+        logger.info(f"Scanned {len(results)} manifests for {len(self.replacements)} image updates")
+        return results
+
+
+def _alternation(values: Iterable[str]) -> str:
+    """Regex alternation of literal values, longest first; never matches if empty."""
+    escaped = [re.escape(value) for value in sorted(values, key=len, reverse=True)]
+    return "|".join(escaped) if escaped else "(?!)"
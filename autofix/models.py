@@ -1,5 +1,6 @@
 """Data models for the autofix service."""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -15,9 +16,20 @@ class Severity(str, Enum):
     INFO = "Info"
 
 
-@dataclass
+def _intern(value: str | None) -> str | None:
+    """Intern a repeated string so identical values share one object."""
+    return sys.intern(value) if value else value
+
+
+@dataclass(slots=True, frozen=True)
 class Finding:
-    """Represents a vulnerability finding from DefectDojo."""
+    """
+    Represents a vulnerability finding from DefectDojo.
+
+    Slotted and immutable so large finding sets stay compact; titles and
+    component names repeat across findings and are interned, and the
+    image key is computed once at construction.
+    """
 
     id: int
     title: str
@@ -30,16 +42,25 @@ class Finding:
     active: bool = True
     verified: bool = False
     duplicate: bool = False
+    product_id: int | None = None
+    _image_tag: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "title", _intern(self.title))
+        object.__setattr__(self, "component_name", _intern(self.component_name))
+        object.__setattr__(self, "component_version", _intern(self.component_version))
+        if self.component_name and self.component_version:
+            object.__setattr__(
+                self, "_image_tag", _intern(f"{self.component_name}:{self.component_version}")
+            )
 
     @property
     def image_tag(self) -> str | None:
         """Extract image:tag from component info if available."""
-        if self.component_name and self.component_version:
-            return f"{self.component_name}:{self.component_version}"
-        return None
+        return self._image_tag
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FixSuggestion:
     """Represents a suggested fix for a vulnerability."""
 
@@ -49,17 +70,29 @@ class FixSuggestion:
     suggested_tag: str
     confidence: str = "medium"  # low, medium, high
     reason: str = ""
+    _full_current_image: str = field(default="", init=False, repr=False, compare=False)
+    _full_suggested_image: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "current_image", _intern(self.current_image))
+        object.__setattr__(self, "confidence", _intern(self.confidence))
+        object.__setattr__(
+            self, "_full_current_image", f"{self.current_image}:{self.current_tag}"
+        )
+        object.__setattr__(
+            self, "_full_suggested_image", f"{self.current_image}:{self.suggested_tag}"
+        )
 
     @property
     def full_current_image(self) -> str:
-        return f"{self.current_image}:{self.current_tag}"
+        return self._full_current_image
 
     @property
     def full_suggested_image(self) -> str:
-        return f"{self.current_image}:{self.suggested_tag}"
+        return self._full_suggested_image
 
 
-@dataclass
+@dataclass(slots=True)
 class FixResult:
     """Result of applying a fix."""
 
@@ -0,0 +1,122 @@
+"""Adaptive page sizing for paginated DefectDojo endpoints."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class PageSizeTuner:
+    """
+    Picks the page size (``limit``) for each paginated endpoint.
+
+    Paging starts large to keep round trips down. A page slower than
+    ``target_seconds`` shrinks the size in proportion, and a timeout halves
+    it. While pages come back full and well under target, the size doubles
+    again, but never past a size that timed out or that the server capped
+    during this run. The size reached for each endpoint is saved to
+    ``state_path`` so later runs start from it.
+    """
+
+    def __init__(
+        self,
+        state_path: Path | None = None,
+        initial: int = 1000,
+        minimum: int = 50,
+        target_seconds: float = 5.0,
+    ):
+        self.state_path = state_path
+        self.initial = initial
+        self.minimum = min(minimum, initial)
+        self.target_seconds = target_seconds
+        self._lock = threading.Lock()
+        self._limits: dict[str, int] = {}
+        self._ceilings: dict[str, int] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            saved = json.loads(self.state_path.read_text())
+            self._limits = {
+                endpoint: max(self.minimum, min(self.initial, int(limit)))
+                for endpoint, limit in saved.items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable page size state {self.state_path}: {e}")
+
+    def limit_for(self, endpoint: str) -> int:
+        """Page size to request next for an endpoint."""
+        with self._lock:
+            return self._limits.get(endpoint, self.initial)
+
+    def record(self, endpoint: str, limit: int, seconds: float, num_records: int) -> None:
+        """
+        Adjust the page size after a page fetched in ``seconds``.
+
+        Args:
+            endpoint: Endpoint the page came from.
+            limit: Page size that was requested.
+            seconds: Time the request took.
+            num_records: Number of results in the page.
+        """
+        with self._lock:
+            current = self._limits.get(endpoint, self.initial)
+            ceiling = self._ceilings.get(endpoint, self.initial)
+            if seconds > self.target_seconds:
+                new = max(self.minimum, int(limit * self.target_seconds / seconds))
+                new = min(current, new)
+            elif seconds < self.target_seconds / 2 and num_records >= limit and limit >= current:
+                new = min(ceiling, current * 2)
+            else:
+                return
+            self._set(endpoint, new)
+
+    def record_timeout(self, endpoint: str, limit: int) -> bool:
+        """
+        Halve the page size after a page timed out.
+
+        Returns:
+            False if the size was already at the minimum, so retrying with
+            a smaller page is pointless.
+        """
+        with self._lock:
+            if limit <= self.minimum:
+                return False
+            self._ceilings[endpoint] = min(self._ceilings.get(endpoint, self.initial), limit // 2)
+            self._set(endpoint, min(self._limits.get(endpoint, self.initial), max(self.minimum, limit // 2)))
+            return True
+
+    def record_server_cap(self, endpoint: str, limit: int) -> None:
+        """Remember that the server returns at most ``limit`` results per page."""
+        with self._lock:
+            self._ceilings[endpoint] = limit
+            self._set(endpoint, min(self._limits.get(endpoint, self.initial), limit))
+
+    def _set(self, endpoint: str, limit: int) -> None:
+        """Update an endpoint's size (lock held)."""
+        if self._limits.get(endpoint, self.initial) == limit:
+            return
+        logger.debug(f"Page size for {endpoint}: {limit}")
+        self._limits[endpoint] = limit
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the tuned sizes to the state file, if they changed."""
+        with self._lock:
+            if not self.state_path or not self._dirty:
+                return
+            payload = json.dumps(self._limits, indent=2, sort_keys=True)
+            self._dirty = False
+
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        try:
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save page size state to {self.state_path}: {e}")
@@ -57,11 +57,11 @@ class SLOTracker:
         logger.info(f"Started SLO tracking run: {record.timestamp}")
         return record
 
-    def record_fix(self, pr_url: str) -> None:
-        """Record a successful fix."""
+    def record_fix(self, pr_url: str, fixes: int = 1) -> None:
+        """Record a PR and the number of successful fixes it carries."""
         data = self._load_data()
         if data["current"]:
-            data["current"]["auto_fixed"] += 1
+            data["current"]["auto_fixed"] += fixes
             data["current"]["prs_created"].append(pr_url)
             self._save_data(data)
 
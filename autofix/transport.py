@@ -0,0 +1,164 @@
+"""Pooled HTTP transport with timeouts, retries and request metrics."""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from prometheus_client import Counter, Histogram
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# PATCH is included because the clients only send idempotent updates
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "autofix_http_request_seconds",
+    "Latency of outgoing HTTP requests, including retries",
+    ["host", "method"],
+)
+HTTP_RETRIES_TOTAL = Counter(
+    "autofix_http_retries_total",
+    "Number of retried outgoing HTTP requests",
+    ["host", "method"],
+)
+
+
+class JitteredRetry(Retry):
+    """Retry policy that adds random jitter to the exponential backoff."""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        # Equal jitter: keep half the backoff, randomise the other half
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request."""
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+@dataclass
+class TransportMetrics:
+    """In-process request counters for a session."""
+
+    requests: int = 0
+    retries: int = 0
+    total_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, seconds: float, retries: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += retries
+            self.total_seconds += seconds
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+class ResilientSession(requests.Session):
+    """
+    requests.Session with sized connection pools, per-request timeouts,
+    exponential backoff with jitter on 429/5xx (honouring Retry-After),
+    gzip negotiation and latency/retry metrics.
+
+    Pass ``retry_reads=False`` to a request to fail on its first read
+    timeout instead of retrying it, for callers that react to timeouts
+    themselves (such as by asking for a smaller page).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        pool_size: int = 10,
+    ):
+        super().__init__()
+        self.metrics = TransportMetrics()
+
+        retry = JitteredRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = TimeoutHTTPAdapter(
+            timeout,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+
+        # Used instead of the adapters above while retry_reads=False
+        read_once = TimeoutHTTPAdapter(
+            timeout,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry.new(read=0),
+        )
+        self._read_once_adapters = {"http://": read_once, "https://": read_once}
+        self._local = threading.local()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *args,
+        retry_reads: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        start = time.perf_counter()
+        self._local.retry_reads = retry_reads
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        finally:
+            self._local.retry_reads = True
+        elapsed = time.perf_counter() - start
+
+        retry_state = getattr(response.raw, "retries", None)
+        retries = len(retry_state.history) if retry_state else 0
+
+        host = urlsplit(url).netloc
+        HTTP_REQUEST_SECONDS.labels(host=host, method=method.upper()).observe(elapsed)
+        if retries:
+            HTTP_RETRIES_TOTAL.labels(host=host, method=method.upper()).inc(retries)
+            logger.debug(f"{method.upper()} {url} succeeded after {retries} retries")
+
+        self.metrics.record(elapsed, retries)
+        return response
+
+    def get_adapter(self, url: str) -> HTTPAdapter:
+        if not getattr(self._local, "retry_reads", True):
+            for prefix, adapter in self._read_once_adapters.items():
+                if url.lower().startswith(prefix):
+                    return adapter
+        return super().get_adapter(url)
+
+    def close(self) -> None:
+        super().close()
+        for adapter in set(self._read_once_adapters.values()):
+            adapter.close()
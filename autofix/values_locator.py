@@ -0,0 +1,137 @@
+"""Locate Helm-style repository/tag pairs in YAML by node position."""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Keys naming the image a sibling "tag:" belongs to
+REPOSITORY_KEYS = ("repository", "image")
+
+# Registry implied by image names without one, and its legacy aliases
+DEFAULT_REGISTRY = "docker.io"
+DEFAULT_REGISTRY_ALIASES = frozenset({"docker.io", "index.docker.io", "registry-1.docker.io"})
+
+
+@dataclass(frozen=True, slots=True)
+class TagRef:
+    """A ``tag:`` scalar and the repository in the same mapping."""
+
+    repository: str  # "<registry>/<repository>" when a registry sibling is set
+    value: str
+    start: int  # character span of the value, inside any quotes
+    end: int
+
+
+@lru_cache(maxsize=256)
+def locate_tags(content: str) -> tuple[TagRef, ...]:
+    """
+    Every ``tag:`` that sits next to a ``repository:`` (or scalar ``image:``).
+
+    The content is composed into YAML nodes once (results are cached per
+    content), so values are paired by structure rather than by nearby text,
+    and the spans come from the nodes' marks. Content that is not valid
+    YAML, such as an unrendered Helm template, has no pairs.
+
+    Returns:
+        Pairs in file order.
+    """
+    try:
+        documents = list(yaml.compose_all(content, Loader=yaml.SafeLoader))
+    except yaml.YAMLError as e:
+        logger.debug(f"Not locating tags in unparseable YAML: {e}")
+        return ()
+
+    refs: set[TagRef] = set()
+    stack = [node for node in documents if node is not None]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        # Aliases point at nodes already visited
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, yaml.MappingNode):
+            ref = _pair(node)
+            if ref:
+                refs.add(ref)
+            stack.extend(value for _, value in node.value)
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(node.value)
+    return tuple(sorted(refs, key=lambda ref: ref.start))
+
+
+@lru_cache(maxsize=1024)
+def canonical_repository(name: str) -> str:
+    """
+    An image name in Docker's fully qualified form, without tag or digest.
+
+    ``nginx``, ``library/nginx`` and ``docker.io/library/nginx`` all become
+    ``docker.io/library/nginx``; ``bitnami/nginx`` becomes
+    ``docker.io/bitnami/nginx``. As in Docker, the first component is a
+    registry only if it contains a "." or ":" or is "localhost".
+    """
+    name = name.strip().partition("@")[0]
+    registry, _, path = name.partition("/")
+    if not path or not ("." in registry or ":" in registry or registry == "localhost"):
+        registry, path = DEFAULT_REGISTRY, name
+    elif registry in DEFAULT_REGISTRY_ALIASES:
+        registry = DEFAULT_REGISTRY
+    # A tag is a ":" after the last "/"; a registry port comes before it
+    head, _, last = path.rpartition("/")
+    last = last.partition(":")[0]
+    path = f"{head}/{last}" if head else last
+    if registry == DEFAULT_REGISTRY and "/" not in path:
+        path = f"library/{path}"
+    return f"{registry}/{path}"
+
+
+def same_repository(repository: str, image: str) -> bool:
+    """Whether a values repository and an image name refer to the same image."""
+    return canonical_repository(repository) == canonical_repository(image)
+
+
+def replace_tags(content: str, old_image: str, new_image: str) -> tuple[str, int]:
+    """
+    Bump the tag of ``old_image`` wherever it is paired with its repository.
+
+    Returns:
+        The new content and the number of tags replaced.
+    """
+    name, _, old_tag = old_image.rpartition(":")
+    new_tag = new_image.rpartition(":")[2]
+    if not name or old_tag not in content:
+        return content, 0
+
+    refs = [
+        ref for ref in locate_tags(content)
+        if ref.value == old_tag and same_repository(ref.repository, name)
+    ]
+    for ref in reversed(refs):
+        content = content[:ref.start] + new_tag + content[ref.end:]
+    return content, len(refs)
+
+
+def _pair(node: yaml.MappingNode) -> TagRef | None:
+    scalars = {
+        key.value: value
+        for key, value in node.value
+        if isinstance(key, yaml.ScalarNode) and isinstance(value, yaml.ScalarNode)
+    }
+    tag = scalars.get("tag")
+    repository = next((scalars[key] for key in REPOSITORY_KEYS if key in scalars), None)
+    if tag is None or repository is None or not repository.value or tag.style not in (None, '"', "'"):
+        return None
+
+    name = repository.value
+    registry = scalars.get("registry")
+    if registry is not None and registry.value:
+        name = f"{registry.value}/{name}"
+
+    start, end = tag.start_mark.index, tag.end_mark.index
+    if tag.style:
+        start, end = start + 1, end - 1
+    return TagRef(name, tag.value, start, end)
@@ -0,0 +1,157 @@
+"""Apply independent fixes in parallel, one git worktree per worker."""
+
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .config import Config
+from .git_client import GitClient, GitStats, apply_fix
+from .git_process import run_git
+from .models import FixResult, FixSuggestion
+
+logger = logging.getLogger(__name__)
+
+
+class WorktreeGitClient(GitClient):
+    """
+    GitClient for a worker's linked worktree.
+
+    The main branch can only be checked out in one worktree, so workers
+    start each fix from a detached checkout of the commit the pool fetched.
+    Pushes skip ``-u`` so parallel workers don't contend for the shared
+    config file.
+    """
+
+    def __init__(self, config: Config, base: str, stats: GitStats | None = None):
+        super().__init__(config, stats)
+        self._base = base
+
+    def checkout_main(self, pull: bool = True) -> None:
+        """Reset the worktree to a clean, detached checkout of the base commit."""
+        self._run_git("checkout", "-q", "--detach", "-f", self._base)
+        self._run_git("clean", "-fdq")
+
+        self._revalidate_indexes()
+
+    def push_branch(self, branch_name: str) -> bool:
+        """Push branch to remote without recording an upstream."""
+        result = self._run_git("push", self.remote, branch_name, check=False)
+        if result.returncode != 0:
+            logger.error(f"Failed to push branch: {result.stderr}")
+            return False
+        logger.info(f"Pushed branch: {branch_name}")
+        return True
+
+
+class WorktreePool:
+    """
+    Runs apply_fix for many suggestions concurrently.
+
+    Each worker owns a linked worktree under ``root`` (by default
+    ``<git dir>/autofix/worktrees``), so branch, edit, commit, push and PR
+    creation proceed side by side without sharing a working directory.
+    The main repo is fetched once; worktrees are kept and reused by later
+    runs, which only need a checkout instead of a fresh clone. Close the
+    pool (or use it with ``with``) to stop the clients' git processes and
+    the shared forge session.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        workers: int | None = None,
+        root: Path | None = None,
+        stats: GitStats | None = None,
+    ):
+        self.config = config
+        self.workers = max(1, workers or config.git_workers)
+        self.main = GitClient(config, stats)
+        self.stats = self.main.stats
+        self.root = (
+            root or config.git_worktree_dir or default_worktree_root(config.git_repo_path, self.stats)
+        )
+        self._clients: list[WorktreeGitClient] = []
+
+    def clients(self) -> list[WorktreeGitClient]:
+        """One client per worker, adding any worktrees that don't exist yet."""
+        if self._clients:
+            return self._clients
+
+        base = self.main.resolve_base()
+        # One pooled REST session for every worker's PRs
+        forge = self.main.forge()
+        # Forget worktrees whose directories were deleted, so they can be re-added
+        self.main._run_git("worktree", "prune")
+        self.root.mkdir(parents=True, exist_ok=True)
+        for slot in range(self.workers):
+            path = self.root / f"worker-{slot}"
+            client = WorktreeGitClient(replace(self.config, git_repo_path=path), base, self.stats)
+            client._forge, client._forge_checked = forge, True
+            if (path / ".git").exists():
+                # Discard anything an interrupted run left behind
+                client.checkout_main()
+                logger.debug(f"Reusing worktree {path}")
+            else:
+                self.main._run_git("worktree", "add", "-q", "--detach", "-f", str(path), base)
+                logger.info(f"Added worktree {path}")
+            self._clients.append(client)
+        return self._clients
+
+    def close(self) -> None:
+        """Close every worker client and the main client, including the shared forge."""
+        for client in self._clients:
+            client.close()
+        self._clients = []
+        self.main.close()
+
+    def __enter__(self) -> "WorktreePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def apply_all(
+        self,
+        suggestions: Iterable[FixSuggestion],
+        on_result: Callable[[FixResult], None] | None = None,
+    ) -> list[FixResult]:
+        """
+        Apply every suggestion, up to ``workers`` at a time.
+
+        Args:
+            suggestions: Independent fixes to apply.
+            on_result: Called from the calling thread as each fix finishes.
+
+        Returns:
+            Results in the order the suggestions were given.
+        """
+        suggestions = list(suggestions)
+        free: queue.Queue[WorktreeGitClient] = queue.Queue()
+        for client in self.clients()[:len(suggestions)]:
+            free.put(client)
+
+        def run(suggestion: FixSuggestion) -> FixResult:
+            client = free.get()
+            try:
+                return apply_fix(client, suggestion)
+            finally:
+                free.put(client)
+
+        results: dict[int, FixResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, free.qsize())) as executor:
+            futures = {executor.submit(run, s): i for i, s in enumerate(suggestions)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result:
+                    on_result(result)
+        return [results[i] for i in range(len(suggestions))]
+
+
+def default_worktree_root(repo_path: Path, stats: GitStats | None = None) -> Path:
+    """Where worker worktrees live: <git dir>/autofix/worktrees."""
+    result = run_git(repo_path, "rev-parse", "--git-path", "autofix/worktrees", stats=stats)
+    return (repo_path / result.stdout.strip()).resolve()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Measure decode time per DefectDojo findings page for each JSON decoder.
+
+Pages are rendered by the fake DefectDojo server (tests/fake_dojo.py) and
+padded with the extra fields a real DefectDojo returns, so the decoders see
+realistic payloads. Reports the time to decode one page and the time to
+decode it and build Finding objects.
+
+Usage:
+    python scripts/bench_decode.py [--repeat 50] [--limits 100 500 1000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from autofix.decoding import available_decoders, get_decoder  # noqa: E402
+from autofix.dojo_client import _finding_from_item  # noqa: E402
+from tests.fake_dojo import FakeDojo  # noqa: E402
+
+# A sample of the fields DefectDojo returns that autofix never reads
+UNUSED_FIELDS = {
+    "url": None,
+    "tags": ["kubernetes", "container"],
+    "date": "2024-01-01",
+    "sla_start_date": None,
+    "cwe": 1035,
+    "cvssv3": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+    "cvssv3_score": 9.8,
+    "epss_score": 0.00043,
+    "epss_percentile": 0.0912,
+    "impact": "Remote code execution in the affected component.",
+    "steps_to_reproduce": None,
+    "severity_justification": None,
+    "references": "https://nvd.nist.gov/vuln/detail/CVE-2024-0001",
+    "test": 12,
+    "found_by": [1],
+    "reporter": 1,
+    "numerical_severity": "S1",
+    "hash_code": "4c1f0e5b7e0b5a1e6b2ad7d0a2c9f3a5d6b1e7c8f9a0b1c2d3e4f5a6b7c8d9e0",
+    "vuln_id_from_tool": "CVE-2024-0001",
+    "sast_source_object": None,
+    "nb_occurences": 1,
+    "service": None,
+    "planned_remediation_date": None,
+    "effort_for_fixing": None,
+    "risk_accepted": False,
+    "under_review": False,
+    "false_p": False,
+    "out_of_scope": False,
+    "static_finding": False,
+    "dynamic_finding": True,
+    "created": "2024-01-01T00:00:00Z",
+    "scanner_confidence": None,
+    "publish_date": None,
+    "unique_id_from_tool": None,
+    "vulnerability_ids": [{"vulnerability_id": "CVE-2024-0001"}],
+}
+
+
+def make_page(limit: int) -> bytes:
+    page = FakeDojo(count=limit * 2).page({"limit": str(limit)}, "http://fake/api/v2/findings/")
+    for item in page["results"]:
+        item.update(UNUSED_FIELDS)
+    return json.dumps(page).encode()
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoders per findings page")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    decoders = [get_decoder(name) for name in available_decoders()]
+    print(f"{'limit':>6}{'KiB':>8}  {'decoder':<9}{'decode ms':>11}{'+Finding ms':>13}{'speedup':>9}")
+
+    for limit in args.limits:
+        body = make_page(limit)
+        timings = {}
+        for decoder in decoders:
+            timings[decoder.name] = (
+                best_of(args.repeat, lambda: decoder.decode_page(body)),
+                best_of(args.repeat, lambda: [
+                    _finding_from_item(item, slim=True)
+                    for item in decoder.decode_page(body)["results"]
+                ]),
+            )
+
+        # Speedup of decode + Finding construction over the stdlib decoder
+        baseline = timings["json"][1]
+        for name, (decode, build) in timings.items():
+            print(
+                f"{limit:>6}{len(body) / 1024:>8.0f}  {name:<9}"
+                f"{decode * 1000:>11.2f}{build * 1000:>13.2f}{baseline / build:>8.1f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
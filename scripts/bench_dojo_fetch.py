@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark DefectDojo fetch strategies against the local fake server.
+
+Runs each strategy against the same synthetic dataset served by
+tests/fake_dojo.py and reports wall time, requests and throughput, so fetch
+changes can be compared offline and reproducibly.
+
+Usage:
+    python scripts/bench_dojo_fetch.py [--findings 100000] [--latency 0.02]
+                                       [--concurrency 8] [--error-rate 0]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from autofix.async_dojo_client import AsyncDojoClient  # noqa: E402
+from autofix.config import Config  # noqa: E402
+from autofix.dojo_client import DojoClient  # noqa: E402
+from tests.fake_dojo import FakeDojo  # noqa: E402
+
+SEVERITIES = ["Critical", "High"]
+
+
+def run_blocking(config: Config, concurrency: int) -> tuple[int, object]:
+    client = DojoClient(config)
+    count = sum(1 for _ in client.iter_open_findings(SEVERITIES, concurrency=concurrency))
+    return count, client.stats
+
+
+def run_async(config: Config, concurrency: int) -> tuple[int, object]:
+    async def fetch():
+        async with AsyncDojoClient(config) as client:
+            count = 0
+            async for _ in client.iter_open_findings(SEVERITIES, concurrency=concurrency):
+                count += 1
+            return count, client.stats
+
+    return asyncio.run(fetch())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DefectDojo fetch strategies")
+    parser.add_argument("--findings", type=int, default=100_000)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per response")
+    parser.add_argument("--latency-per-item", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    fake = FakeDojo(
+        count=args.findings,
+        latency=args.latency,
+        latency_per_item=args.latency_per_item,
+        error_rate=args.error_rate,
+    )
+    strategies = [
+        ("blocking, sequential", run_blocking, 1),
+        (f"blocking, {args.concurrency} threads", run_blocking, args.concurrency),
+        (f"asyncio, {args.concurrency} in flight", run_async, args.concurrency),
+    ]
+
+    print(
+        f"{args.findings} findings, {args.latency * 1000:.0f} ms latency, "
+        f"{args.error_rate:.0%} errors\n"
+    )
+    print(f"{'strategy':<28}{'seconds':>9}{'requests':>10}{'findings':>10}{'MiB':>8}{'findings/s':>12}")
+
+    with fake.run_in_thread() as base_url:
+        config = Config(
+            defectdojo_url=base_url,
+            defectdojo_api_key="bench",
+            defectdojo_max_retries=10,
+        )
+        for name, run, concurrency in strategies:
+            start = time.perf_counter()
+            count, stats = run(config, concurrency)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<28}{elapsed:>9.2f}{stats.requests:>10}{count:>10}"
+                f"{stats.bytes_transferred / 2**20:>8.1f}{count / elapsed:>12.0f}"
+            )
+
+    print(f"\nServer: {fake.stats.requests} requests, {fake.stats.errors} injected errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Measure the memory footprint of Finding objects at scale.
+
+Compares the slotted, interned Finding model against an equivalent plain
+dataclass (per-instance __dict__, no interning) for the same workload.
+
+Usage:
+    python scripts/bench_models.py [count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from autofix.models import Finding, Severity  # noqa: E402
+
+
+@dataclass
+class PlainFinding:
+    """The pre-slots Finding layout, kept here for comparison."""
+
+    id: int
+    title: str
+    severity: Severity
+    component_name: str | None = None
+    component_version: str | None = None
+    file_path: str | None = None
+    description: str = ""
+    mitigation: str = ""
+    active: bool = True
+    verified: bool = False
+    duplicate: bool = False
+
+    @property
+    def image_tag(self) -> str | None:
+        if self.component_name and self.component_version:
+            return f"{self.component_name}:{self.component_version}"
+        return None
+
+
+IMAGES = [f"registry.example.com/team-{i % 40}/service-{i}" for i in range(400)]
+SEVERITIES = [Severity.CRITICAL, Severity.HIGH]
+
+
+def build(cls: type, count: int) -> list:
+    """Build findings the way the client does: fresh strings per decoded item."""
+    findings = []
+    for i in range(count):
+        image = IMAGES[i % len(IMAGES)]
+        findings.append(
+            cls(
+                id=i,
+                # Strings decoded from JSON are distinct objects even when equal
+                title="".join(["CVE-2024-", str(1000 + i % 2000)]),
+                severity=SEVERITIES[i % 2],
+                component_name="".join([image]),
+                component_version="".join(["1.", str(i % 12), ".0"]),
+            )
+        )
+    return findings
+
+
+def measure(cls: type, count: int) -> tuple[int, float, float]:
+    """Return (peak bytes, build seconds, image_tag access seconds)."""
+    gc.collect()
+    start = time.perf_counter()
+    findings = build(cls, count)
+    build_time = time.perf_counter() - start
+    del findings
+
+    # Trace allocations in a separate pass so tracing doesn't skew timings
+    gc.collect()
+    tracemalloc.start()
+    findings = build(cls, count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for finding in findings:
+            finding.image_tag
+    access_time = time.perf_counter() - start
+
+    del findings
+    return peak, build_time, access_time
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"Benchmarking {count:,} findings\n")
+    print(f"{'Model':<16} {'Peak MiB':>10} {'B/finding':>10} {'Build s':>9} {'3x image_tag s':>15}")
+    results = {}
+    for cls in (PlainFinding, Finding):
+        peak, build_time, access_time = measure(cls, count)
+        results[cls.__name__] = peak
+        print(
+            f"{cls.__name__:<16} {peak / 1024 / 1024:>10.1f} {peak / count:>10.0f} "
+            f"{build_time:>9.3f} {access_time:>15.3f}"
+        )
+
+    saved = 1 - results["Finding"] / results["PlainFinding"]
+    print(f"\nSlotted Finding uses {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
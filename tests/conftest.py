@@ -0,0 +1,54 @@
+"""Shared fixtures for tests that work on real git repositories."""
+
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run git in ``repo`` with a test identity and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def git_identity(monkeypatch) -> None:
+    """Give commits made through GitClient, which passes no -c identity, an author."""
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@example.com")
+
+
+@pytest.fixture
+def make_repo(tmp_path: Path, git_identity) -> Callable[..., Path]:
+    """
+    Factory for a work tree at ``tmp_path/work`` with one commit on main.
+
+    Call it with ``{path: text or bytes}``. Unless ``remote=False``, the
+    commit is also cloned to a bare ``tmp_path/remote.git``, added as
+    ``origin`` and fetched.
+    """
+
+    def make(files: dict[str, str | bytes], remote: bool = True) -> Path:
+        work = tmp_path / "work"
+        for rel_path, content in files.items():
+            path = work / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+        git(work, "init", "-q", "-b", "main")
+        git(work, "add", ".")
+        git(work, "commit", "-q", "-m", "initial")
+        if remote:
+            git(tmp_path, "clone", "-q", "--bare", str(work), str(tmp_path / "remote.git"))
+            git(work, "remote", "add", "origin", str(tmp_path / "remote.git"))
+            git(work, "fetch", "-q", "origin")
+        return work
+
+    return make
@@ -0,0 +1,329 @@
+"""
+A lightweight stand-in for the DefectDojo findings API.
+
+Serves ``/api/v2/findings/`` with synthetic findings so DojoClient and
+AsyncDojoClient can be exercised and benchmarked without a real DefectDojo.
+Findings are derived from their ID, so the same settings always produce the
+same data. They are rendered only when a page is served, which keeps memory
+flat at a million findings.
+
+Supports the query parameters the clients send (``active``, ``duplicate``,
+``is_mitigated``, ``severity``, ``test__engagement__product``,
+``last_status_update__gte``, ``limit``, ``offset``), PATCH for closing
+findings, ETag revalidation, and latency / error injection.
+
+Run standalone:
+    python -m tests.fake_dojo --findings 100000 --latency 0.02 --port 8080
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import heapq
+import json
+import random
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from urllib.parse import urlencode
+
+from aiohttp import web
+
+# Fraction of findings per severity, in percent
+SEVERITY_WEIGHTS = (("Critical", 5), ("High", 20), ("Medium", 35), ("Low", 30), ("Info", 10))
+
+# Timestamp of finding 1; each later ID was updated one second after the last
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+FILLER = (
+    "The affected package ships a vulnerable version of a transitive "
+    "dependency. Upgrading the base image resolves the issue. "
+)
+
+
+@dataclass
+class FakeStats:
+    """What the fake server has served so far."""
+
+    requests: int = 0
+    errors: int = 0
+    not_modified: int = 0
+    bytes_sent: int = 0
+    patched: list[int] = field(default_factory=list)
+
+
+class FakeDojo:
+    """
+    Synthetic DefectDojo findings API.
+
+    Args:
+        count: Number of findings to generate (IDs 1..count).
+        products: Product IDs the findings are spread across.
+        latency: Seconds added to every response.
+        latency_per_item: Extra seconds per finding in a page, to model
+                          the cost of serializing large pages.
+        error_rate: Probability that a request fails with 503.
+        max_limit: Largest page size honoured, like DRF's max_limit.
+        description_bytes: Size of each finding's description text.
+        seed: Seed for error injection.
+    """
+
+    def __init__(
+        self,
+        count: int = 1000,
+        products: tuple[int, ...] = (1,),
+        latency: float = 0.0,
+        latency_per_item: float = 0.0,
+        error_rate: float = 0.0,
+        max_limit: int | None = None,
+        description_bytes: int = 800,
+        seed: int = 0,
+    ):
+        self.count = count
+        self.products = tuple(products)
+        self.latency = latency
+        self.latency_per_item = latency_per_item
+        self.error_rate = error_rate
+        self.max_limit = max_limit
+        self.description = (FILLER * (description_bytes // len(FILLER) + 1))[:description_bytes]
+        self.fail_next = 0
+        self.stats = FakeStats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Findings changed through PATCH: id -> (active, is_mitigated, updated)
+        self._overrides: dict[int, tuple[bool, bool, datetime]] = {}
+        self._matching: dict[tuple, list[int]] = {}
+        self._buckets = self._build_buckets()
+
+    def _attributes(self, finding_id: int) -> tuple[int, str, bool, bool, bool]:
+        """Product, severity, active, duplicate and is_mitigated for an ID."""
+        h = (finding_id * 2654435761) & 0xFFFFFFFF
+        roll = h % 100
+        for severity, weight in SEVERITY_WEIGHTS:
+            if roll < weight:
+                break
+            roll -= weight
+        product = self.products[(h >> 7) % len(self.products)]
+        active = (h >> 11) % 50 != 0
+        duplicate = (h >> 17) % 40 == 0
+        mitigated = not active and (h >> 3) % 2 == 0
+        if finding_id in self._overrides:
+            active, mitigated, _ = self._overrides[finding_id]
+        return product, severity, active, duplicate, mitigated
+
+    def _updated(self, finding_id: int) -> datetime:
+        if finding_id in self._overrides:
+            return self._overrides[finding_id][2]
+        return BASE_TIME + timedelta(seconds=finding_id)
+
+    def _build_buckets(self) -> dict[tuple, list[int]]:
+        """Index IDs by their filterable attributes, each bucket sorted."""
+        buckets: dict[tuple, list[int]] = {}
+        for finding_id in range(1, self.count + 1):
+            buckets.setdefault(self._attributes(finding_id), []).append(finding_id)
+        return buckets
+
+    def item(self, finding_id: int) -> dict:
+        """Render one finding as the API returns it."""
+        product, severity, active, duplicate, mitigated = self._attributes(finding_id)
+        image = (finding_id * 40503) % 997
+        updated = self._updated(finding_id).isoformat()
+        return {
+            "id": finding_id,
+            "title": f"CVE-{2020 + finding_id % 5}-{finding_id:05d}",
+            "severity": severity,
+            "component_name": f"registry.example.com/team-{image % 40}/service-{image}",
+            "component_version": f"1.{image % 30}.{finding_id % 7}",
+            "file_path": None,
+            "description": self.description,
+            "mitigation": "Upgrade to the latest patched image.",
+            "active": active,
+            "verified": finding_id % 3 == 0,
+            "duplicate": duplicate,
+            "is_mitigated": mitigated,
+            "product": product,
+            "last_status_update": updated,
+            "updated": updated,
+        }
+
+    def matching_ids(self, query: dict) -> list[int]:
+        """IDs matching the query filters, in ascending order (cached)."""
+        key = tuple(sorted(
+            (name, query[name])
+            for name in (
+                "active", "duplicate", "is_mitigated", "severity",
+                "test__engagement__product", "last_status_update__gte",
+            )
+            if name in query
+        ))
+        with self._lock:
+            if key in self._matching:
+                return self._matching[key]
+
+        filters = dict(key)
+
+        def wanted(bucket: tuple) -> bool:
+            product, severity, active, duplicate, mitigated = bucket
+            return (
+                _flag(filters, "active", active)
+                and _flag(filters, "duplicate", duplicate)
+                and _flag(filters, "is_mitigated", mitigated)
+                and filters.get("severity", severity) == severity
+                and int(filters.get("test__engagement__product", product)) == product
+            )
+
+        ids: list[int] = list(heapq.merge(
+            *(ids for bucket, ids in self._buckets.items() if wanted(bucket))
+        ))
+        if "last_status_update__gte" in filters:
+            since = datetime.fromisoformat(filters["last_status_update__gte"].replace(" ", "+"))
+            ids = [i for i in ids if self._updated(i) >= since]
+
+        with self._lock:
+            self._matching[key] = ids
+        return ids
+
+    def close(self, finding_id: int) -> None:
+        """Mark a finding mitigated, as a PATCH from the client would."""
+        with self._lock:
+            old = self._attributes(finding_id)
+            self._buckets[old].remove(finding_id)
+            self._overrides[finding_id] = (False, True, datetime.now(timezone.utc))
+            bisect.insort(self._buckets.setdefault(self._attributes(finding_id), []), finding_id)
+            self._matching.clear()
+            self.stats.patched.append(finding_id)
+
+    def page(self, query: dict, base_url: str) -> dict:
+        """Build one DRF-style limit/offset page for a query."""
+        ids = self.matching_ids(query)
+        limit = int(query.get("limit", 25))
+        if self.max_limit:
+            limit = min(limit, self.max_limit)
+        offset = int(query.get("offset", 0))
+
+        def link(new_offset: int) -> str:
+            return f"{base_url}?{urlencode({**query, 'limit': limit, 'offset': new_offset})}"
+
+        return {
+            "count": len(ids),
+            "next": link(offset + limit) if offset + limit < len(ids) else None,
+            "previous": link(max(0, offset - limit)) if offset > 0 else None,
+            "results": [self.item(i) for i in ids[offset:offset + limit]],
+        }
+
+    async def _delay(self, num_items: int = 0) -> None:
+        delay = self.latency + self.latency_per_item * num_items
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.stats.requests += 1
+            if self.fail_next > 0:
+                self.fail_next -= 1
+            elif not (self.error_rate and self._random.random() < self.error_rate):
+                return False
+            self.stats.errors += 1
+            return True
+
+    def _respond(self, request: web.Request, body: dict) -> web.Response:
+        payload = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        self.stats.bytes_sent += len(payload)
+        return web.Response(body=payload, content_type="application/json", headers={"ETag": etag})
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        if not request.headers.get("Authorization", "").startswith("Token "):
+            return web.json_response({"detail": "Authentication required"}, status=401)
+        if self._should_fail():
+            await self._delay()
+            return web.json_response({}, status=503, headers={"Retry-After": "0"})
+
+        base_url = str(request.url.with_query(None))
+        body = self.page(dict(request.query), base_url)
+        await self._delay(len(body["results"]))
+        return self._respond(request, body)
+
+    async def handle_detail(self, request: web.Request) -> web.Response:
+        if not request.headers.get("Authorization", "").startswith("Token "):
+            return web.json_response({"detail": "Authentication required"}, status=401)
+        if self._should_fail():
+            await self._delay()
+            return web.json_response({}, status=503, headers={"Retry-After": "0"})
+
+        finding_id = int(request.match_info["id"])
+        await self._delay(1)
+        if not 1 <= finding_id <= self.count:
+            return web.json_response({"detail": "Not found."}, status=404)
+        if request.method == "PATCH":
+            self.close(finding_id)
+        return self._respond(request, self.item(finding_id))
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/api/v2/findings", self.handle_list)
+        app.router.add_get("/api/v2/findings/", self.handle_list)
+        app.router.add_get("/api/v2/findings/{id}/", self.handle_detail)
+        app.router.add_patch("/api/v2/findings/{id}/", self.handle_detail)
+        return app
+
+    @contextmanager
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """Serve from a background thread; yields the base URL."""
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.app())
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, host, port)
+        loop.run_until_complete(site.start())
+        bound_port = site._server.sockets[0].getsockname()[1]
+
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{bound_port}"
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+def _flag(filters: dict, name: str, value: bool) -> bool:
+    """Whether a boolean attribute passes an optional "true"/"false" filter."""
+    if name not in filters:
+        return True
+    return (filters[name].lower() == "true") == value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--findings", type=int, default=10000)
+    parser.add_argument("--products", type=int, nargs="+", default=[1])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-per-item", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-limit", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    fake = FakeDojo(
+        count=args.findings,
+        products=tuple(args.products),
+        latency=args.latency,
+        latency_per_item=args.latency_per_item,
+        error_rate=args.error_rate,
+        max_limit=args.max_limit,
+    )
+    web.run_app(fake.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+A lightweight stand-in for the GitHub and GitLab pull request APIs.
+
+Serves just what ForgeClient uses: the repository/project (for its
+default branch) and listing and creating pull/merge requests. Supports
+ETag revalidation, duplicate-PR errors, a rate-limit budget with reset
+headers, Retry-After rejections and latency injection.
+
+Run standalone:
+    python -m tests.fake_forge --platform gitlab --latency 0.05 --port 8081
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+from urllib.parse import quote
+
+from aiohttp import web
+
+
+@dataclass
+class FakeForgeStats:
+    """What the fake forge has served so far."""
+
+    requests: int = 0
+    not_modified: int = 0
+    rate_limited: int = 0
+    max_in_flight: int = 0
+    created: list[str] = field(default_factory=list)
+
+
+class FakeForge:
+    """
+    Synthetic GitHub (``/repos/{repo}``) or GitLab (``/projects/{id}``) API.
+
+    Args:
+        platform: "github" or "gitlab".
+        repo: Repository path, e.g. "org/infra".
+        default_branch: Reported default branch.
+        token: Token the client must send.
+        latency: Seconds added to every response.
+        rate_limit: Requests allowed per window; unlimited when None.
+        reset_seconds: Length of a rate-limit window.
+    """
+
+    def __init__(
+        self,
+        platform: str = "github",
+        repo: str = "org/infra",
+        default_branch: str = "main",
+        token: str = "test-token",
+        latency: float = 0.0,
+        rate_limit: int | None = None,
+        reset_seconds: int = 1,
+    ):
+        self.platform = platform
+        self.repo = repo
+        self.default_branch = default_branch
+        self.token = token
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.reset_seconds = reset_seconds
+        # Requests to reject with 429 and Retry-After: 0
+        self.reject_next = 0
+        self.stats = FakeForgeStats()
+        self.pulls: list[dict] = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._window_start = time.time()
+        self._used = 0
+
+    @property
+    def repo_path(self) -> str:
+        if self.platform == "github":
+            return f"/repos/{self.repo}"
+        return f"/projects/{quote(self.repo, safe='')}"
+
+    def _authorized(self, request: web.Request) -> bool:
+        if self.platform == "github":
+            return request.headers.get("Authorization") == f"Bearer {self.token}"
+        return request.headers.get("PRIVATE-TOKEN") == self.token
+
+    def _rate_limit_headers(self) -> tuple[dict[str, str], bool]:
+        """Spend one request from the budget; returns headers and whether it was refused."""
+        if self.rate_limit is None:
+            return {}, False
+        prefix = "X-RateLimit" if self.platform == "github" else "RateLimit"
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.reset_seconds:
+                self._window_start = now
+                self._used = 0
+            refused = self._used >= self.rate_limit
+            if not refused:
+                self._used += 1
+            headers = {
+                f"{prefix}-Limit": str(self.rate_limit),
+                f"{prefix}-Remaining": str(self.rate_limit - self._used),
+                f"{prefix}-Reset": str(int(self._window_start + self.reset_seconds + 0.999)),
+            }
+        return headers, refused
+
+    def _respond(self, request: web.Request, body, headers: dict[str, str], status: int = 200) -> web.Response:
+        payload = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if request.method == "GET" and request.headers.get("If-None-Match") == etag:
+            self.stats.not_modified += 1
+            return web.Response(status=304, headers={**headers, "ETag": etag})
+        return web.Response(
+            body=payload, status=status, content_type="application/json", headers={**headers, "ETag": etag}
+        )
+
+    def _open_pulls(self, head: str, base: str) -> list[dict]:
+        return [p for p in self.pulls if p["head"] == head and p["base"] == base]
+
+    def _render(self, pull: dict) -> dict:
+        if self.platform == "github":
+            return {"number": pull["number"], "html_url": pull["url"], "title": pull["title"]}
+        return {"iid": pull["number"], "web_url": pull["url"], "title": pull["title"]}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        with self._lock:
+            self.stats.requests += 1
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return await self._route(request)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _route(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"message": "Bad credentials"}, status=401)
+        headers, refused = self._rate_limit_headers()
+        with self._lock:
+            rejected = self.reject_next > 0
+            self.reject_next -= int(rejected)
+        if refused or rejected:
+            self.stats.rate_limited += 1
+            if rejected:
+                headers = {**headers, "Retry-After": "0"}
+            status = 403 if self.platform == "github" and not rejected else 429
+            return web.json_response({"message": "API rate limit exceeded"}, status=status, headers=headers)
+
+        path = request.raw_path.split("?")[0]
+        pulls_path = f"{self.repo_path}/{'pulls' if self.platform == 'github' else 'merge_requests'}"
+        if path == self.repo_path and request.method == "GET":
+            return self._respond(request, {"default_branch": self.default_branch}, headers)
+        if path == pulls_path and request.method == "GET":
+            return self._list(request, headers)
+        if path == pulls_path and request.method == "POST":
+            return self._create(request, await request.json(), headers)
+        return web.json_response({"message": "Not Found"}, status=404, headers=headers)
+
+    def _list(self, request: web.Request, headers: dict[str, str]) -> web.Response:
+        query = request.query
+        if self.platform == "github":
+            head, base = query.get("head", "").partition(":")[2], query.get("base", "")
+        else:
+            head, base = query.get("source_branch", ""), query.get("target_branch", "")
+        return self._respond(request, [self._render(p) for p in self._open_pulls(head, base)], headers)
+
+    def _create(self, request: web.Request, body: dict, headers: dict[str, str]) -> web.Response:
+        if self.platform == "github":
+            head, base, description = body["head"], body["base"], body.get("body", "")
+        else:
+            head, base, description = body["source_branch"], body["target_branch"], body.get("description", "")
+        with self._lock:
+            if self._open_pulls(head, base):
+                if self.platform == "github":
+                    message = {"message": "Validation Failed", "errors": [
+                        {"message": f"A pull request already exists for {self.repo.split('/')[0]}:{head}."}
+                    ]}
+                    return web.json_response(message, status=422, headers=headers)
+                return web.json_response(
+                    {"message": ["Another open merge request already exists for this source branch"]},
+                    status=409, headers=headers,
+                )
+            number = len(self.pulls) + 1
+            kind = "pull" if self.platform == "github" else "-/merge_requests"
+            pull = {
+                "number": number,
+                "head": head,
+                "base": base,
+                "title": body["title"],
+                "body": description,
+                "url": f"https://forge.example.com/{self.repo}/{kind}/{number}",
+            }
+            self.pulls.append(pull)
+            self.stats.created.append(head)
+        return self._respond(request, self._render(pull), headers, status=201)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+    @contextmanager
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """Serve from a background thread; yields the API base URL."""
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.app())
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, host, port)
+        loop.run_until_complete(site.start())
+        bound_port = site._server.sockets[0].getsockname()[1]
+
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{bound_port}"
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub/GitLab pull request API")
+    parser.add_argument("--platform", choices=["github", "gitlab"], default="github")
+    parser.add_argument("--repo", default="org/infra")
+    parser.add_argument("--token", default="test-token")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    forge = FakeForge(
+        platform=args.platform,
+        repo=args.repo,
+        token=args.token,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+    )
+    print(f"Fake {args.platform} API for {args.repo} on http://{args.host}:{args.port}")
+    web.run_app(forge.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Tests for the asyncio DefectDojo client."""
+
+import asyncio
+
+from aiohttp import web
+
+from autofix.async_dojo_client import AsyncDojoClient, create_http_session
+from autofix.config import Config
+
+
+def make_items(count: int, severity: str = "High") -> list[dict]:
+    return [
+        {
+            "id": i,
+            "title": f"CVE-{i}",
+            "severity": severity,
+            "component_name": f"image-{i % 3}",
+            "component_version": "1.0.0",
+            "description": "long text",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_app(items: list[dict], state: dict) -> web.Application:
+    async def findings(request: web.Request) -> web.Response:
+        state["requests"] = state.get("requests", 0) + 1
+        if state.get("fail_next"):
+            state["fail_next"] -= 1
+            return web.json_response({}, status=503, headers={"Retry-After": "0"})
+
+        severity = request.query.get("severity")
+        product = request.query.get("test__engagement__product")
+        state.setdefault("products", []).append(product)
+        matching = [
+            i for i in items
+            if (not severity or i["severity"] == severity)
+            and (not product or i.get("product", int(product)) == int(product))
+        ]
+        limit = int(request.query.get("limit", 100))
+        offset = int(request.query.get("offset", 0))
+        next_url = str(request.url) if offset + limit < len(matching) else None
+        return web.json_response({
+            "count": len(matching),
+            "next": next_url,
+            "results": matching[offset:offset + limit],
+        })
+
+    async def finding(request: web.Request) -> web.Response:
+        finding_id = int(request.match_info["id"])
+        if request.method == "PATCH":
+            state.setdefault("patched", []).append(finding_id)
+            return web.json_response({}, status=200 if finding_id != 99 else 400)
+        for item in items:
+            if item["id"] == finding_id:
+                return web.json_response(item)
+        return web.json_response({}, status=404)
+
+    app = web.Application()
+    app.router.add_get("/api/v2/findings/", findings)
+    app.router.add_get("/api/v2/findings/{id}/", finding)
+    app.router.add_patch("/api/v2/findings/{id}/", finding)
+    return app
+
+
+async def with_server(items: list[dict], state: dict, body):
+    runner = web.AppRunner(make_app(items, state))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    config = Config(
+        defectdojo_url=f"http://127.0.0.1:{port}",
+        defectdojo_api_key="test-key",
+        defectdojo_max_retries=2,
+    )
+    try:
+        return await body(config)
+    finally:
+        await runner.cleanup()
+
+
+def test_concurrent_pagination_preserves_order():
+    async def body(config: Config):
+        config.defectdojo_page_size = 100
+        async with AsyncDojoClient(config) as client:
+            findings = [f async for f in client.iter_open_findings(["High"], concurrency=4)]
+        return findings, client
+
+    findings, client = asyncio.run(with_server(make_items(730), {}, body))
+
+    assert [f.id for f in findings] == list(range(1, 731))
+    assert findings[0].description == ""
+    assert client.stats.requests == 8
+    assert client.session.closed
+
+
+def test_shared_session_is_not_closed_by_client():
+    async def body(config: Config):
+        session = create_http_session(config)
+        try:
+            async with AsyncDojoClient(config, session=session) as first:
+                a = await first.fetch_open_findings(["High"])
+            async with AsyncDojoClient(config, session=session) as second:
+                b = await second.get_finding_by_id(2)
+            return a, b, session.closed
+        finally:
+            await session.close()
+
+    findings, single, closed = asyncio.run(with_server(make_items(5), {}, body))
+
+    assert len(findings) == 5
+    assert findings[0].description == "long text"
+    assert single.id == 2
+    assert closed is False
+
+
+def test_retries_and_missing_finding():
+    state = {"fail_next": 2}
+
+    async def body(config: Config):
+        async with AsyncDojoClient(config) as client:
+            findings = await client.fetch_open_findings(["High"])
+            missing = await client.get_finding_by_id(12345)
+        return findings, missing
+
+    findings, missing = asyncio.run(with_server(make_items(3), state, body))
+
+    assert len(findings) == 3
+    assert missing is None
+    assert state["requests"] == 3  # two 503s, then the page
+
+
+def test_multiple_products_fetched_concurrently():
+    items = [{**item, "product": 1} for item in make_items(120)] + [
+        {**item, "id": item["id"] + 500, "product": 2} for item in make_items(40)
+    ]
+
+    async def body(config: Config):
+        config.defectdojo_product_ids = [1, 2]
+        async with AsyncDojoClient(config) as client:
+            return await client.fetch_open_findings(["High"])
+
+    findings = asyncio.run(with_server(items, {}, body))
+
+    assert len(findings) == 160
+    assert [f.product_id for f in findings] == [1] * 120 + [2] * 40
+
+
+def test_products_stream_through_bounded_buffers(monkeypatch):
+    from autofix import async_dojo_client
+
+    monkeypatch.setattr(async_dojo_client, "PRODUCT_BUFFER_ITEMS", 5)
+    items = [{**item, "product": 1} for item in make_items(30)] + [
+        {**item, "id": item["id"] + 500, "product": 2} for item in make_items(300)
+    ]
+    state = {}
+
+    async def body(config: Config):
+        config.defectdojo_product_ids = [1, 2]
+        config.defectdojo_page_size = 10
+        async with AsyncDojoClient(config) as client:
+            findings = client.iter_open_findings(["High"], concurrency=1)
+            first = await findings.__anext__()
+            await asyncio.sleep(0.2)
+            product_2_pages = state["products"].count("2")
+            rest = [f async for f in findings]
+            return first, product_2_pages, rest
+
+    first, product_2_pages, rest = asyncio.run(with_server(items, state, body))
+
+    # Product 2 stops after filling its buffer instead of fetching all 30 pages
+    assert first.product_id == 1
+    assert product_2_pages == 1
+    assert len(rest) == 329
+
+
+def test_close_findings():
+    state = {}
+
+    async def body(config: Config):
+        async with AsyncDojoClient(config) as client:
+            return await client.close_findings([1, 2, 99], "Fixed", concurrency=2)
+
+    results = asyncio.run(with_server(make_items(3), state, body))
+
+    assert results == {1: True, 2: True, 99: False}
+    assert sorted(state["patched"]) == [1, 2, 99]
+
+
+def test_cancellation_cancels_in_flight_pages():
+    async def body(config: Config):
+        async with AsyncDojoClient(config) as client:
+            async def consume():
+                async for _ in client.iter_open_findings(["High"], concurrency=4):
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+        return False
+
+    assert asyncio.run(with_server(make_items(2000), {}, body)) is True
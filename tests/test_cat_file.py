@@ -0,0 +1,90 @@
+"""Tests for the persistent cat-file reader."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from autofix.cat_file import CatFile
+from autofix.config import Config
+from autofix.git_client import GitClient
+from autofix.models import FixSuggestion
+
+from .conftest import git
+
+
+@pytest.fixture
+def repo(make_repo) -> Path:
+    return make_repo({
+        "apps/web.yaml": "image: nginx:1.23.1\n",
+        "apps/values.yaml": "image:\n  tag: 1.23.1\n",
+        "logo.bin": bytes(range(256)) * 4,
+    }, remote=False)
+
+
+def test_reads_files_at_any_ref_with_one_process(repo: Path, monkeypatch):
+    git(repo, "checkout", "-q", "-b", "autofix/bump")
+    (repo / "apps/web.yaml").write_text("image: nginx:1.23.4\n")
+    git(repo, "commit", "-q", "-am", "bump")
+    popen = []
+    original = subprocess.Popen
+    monkeypatch.setattr(subprocess, "Popen", lambda *a, **kw: popen.append(a[0]) or original(*a, **kw))
+
+    with CatFile(repo) as objects:
+        assert objects.read_text("main", "apps/web.yaml") == "image: nginx:1.23.1\n"
+        assert objects.read_text("autofix/bump", "apps/web.yaml") == "image: nginx:1.23.4\n"
+        assert objects.read("main:logo.bin") == bytes(range(256)) * 4
+        assert objects.read("main:apps/missing.yaml") is None
+        assert objects.read_text("main", "logo.bin") is None
+        assert objects.read_text("main", "apps") is None
+        for _ in range(50):
+            objects.read("main:apps/values.yaml")
+
+    assert popen == [["git", "cat-file", "--batch"]]
+
+
+def test_batch_check_reports_type_and_size(repo: Path):
+    with CatFile(repo) as objects:
+        info = objects.info("main:apps/web.yaml")
+        assert info.type == "blob"
+        assert info.size == len("image: nginx:1.23.1\n")
+        assert info.sha == git(repo, "rev-parse", "main:apps/web.yaml")
+        assert objects.info("main:apps").type == "tree"
+        assert objects.info("nope:apps") is None
+
+
+def test_restarts_after_close(repo: Path):
+    objects = CatFile(repo)
+    assert objects.read("main:apps/web.yaml")
+    objects.close()
+
+    assert objects.read("main:apps/web.yaml") == b"image: nginx:1.23.1\n"
+    objects.close()
+
+
+def test_pending_fix_branch(repo: Path, tmp_path_factory):
+    remote = tmp_path_factory.mktemp("remote") / "origin.git"
+    git(repo, "init", "-q", "--bare", str(remote))
+    git(repo, "remote", "add", "origin", str(remote))
+    git(repo, "checkout", "-q", "-b", "autofix/partial")
+    (repo / "apps/web.yaml").write_text("image: nginx:1.23.4\n")
+    git(repo, "commit", "-q", "-am", "web only")
+    git(repo, "checkout", "-q", "-b", "autofix/full")
+    (repo / "apps/values.yaml").write_text("image:\n  tag: 1.23.4\n")
+    git(repo, "commit", "-q", "-am", "values too")
+    git(repo, "push", "-q", "origin", "autofix/partial", "autofix/full")
+
+    nginx = FixSuggestion(finding_id=1, current_image="nginx", current_tag="1.23.1", suggested_tag="1.23.4")
+    redis = FixSuggestion(finding_id=2, current_image="redis", current_tag="7.0.0", suggested_tag="7.0.14")
+    with GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=repo,
+    )) as client:
+        assert client.pending_fix_branch(nginx, ["apps/web.yaml", "apps/values.yaml"]) == "origin/autofix/full"
+        assert client.pending_fix_branch(nginx, ["apps/web.yaml"]) is not None
+        assert client.pending_fix_branch(redis, ["apps/redis.yaml"]) is None
+        procs = list(client.objects()._procs.values())
+
+    # Leaving the block reaps the cat-file processes
+    assert procs and all(proc.poll() is not None for proc in procs)
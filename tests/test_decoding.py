@@ -0,0 +1,63 @@
+"""Tests for the pluggable JSON decoders."""
+
+import json
+
+import pytest
+
+from autofix.decoding import available_decoders, get_decoder
+from autofix.dojo_client import _finding_from_item
+
+from .fake_dojo import FakeDojo
+
+DECODERS = available_decoders()
+
+
+@pytest.fixture(scope="module")
+def page_body() -> bytes:
+    page = FakeDojo(count=300).page({"limit": "100"}, "http://fake/api/v2/findings/")
+    # Fields autofix never reads must be tolerated and skipped
+    for item in page["results"]:
+        item["found_by"] = [1, 2]
+        item["tags"] = ["prod"]
+        item["mitigation"] = None
+    return json.dumps(page).encode()
+
+
+@pytest.mark.parametrize("name", DECODERS)
+def test_decoders_build_identical_findings(name: str, page_body: bytes):
+    expected = [_finding_from_item(item) for item in json.loads(page_body)["results"]]
+
+    page = get_decoder(name).decode_page(page_body)
+
+    assert page.get("count") == 300
+    assert page.get("next")
+    assert [_finding_from_item(item) for item in page.get("results", [])] == expected
+
+
+@pytest.mark.parametrize("name", DECODERS)
+def test_items_accept_product_tag(name: str, page_body: bytes):
+    item = get_decoder(name).decode_page(page_body)["results"][0]
+
+    item["product_id"] = 7
+
+    assert item["id"] == 1
+    assert _finding_from_item(item).product_id == 7
+
+
+def test_unexpected_schema_falls_back_to_generic_decoding():
+    msgspec = pytest.importorskip("msgspec")  # noqa: F841
+    body = json.dumps({"id": 5, "title": "CVE-5", "severity": "High", "active": "yes"}).encode()
+
+    item = get_decoder("msgspec").decode_finding(body)
+
+    assert item == {"id": 5, "title": "CVE-5", "severity": "High", "active": "yes"}
+
+
+def test_auto_picks_fastest_available():
+    assert get_decoder("auto").name == DECODERS[0]
+    assert get_decoder("json").name == "json"
+
+
+def test_unknown_decoder_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON decoder"):
+        get_decoder("simdjson")
@@ -1,11 +1,187 @@
 """Tests for DefectDojo client."""
 
+import json
+
 import pytest
 
-from autofix.dojo_client import group_findings_by_image
+from autofix.config import Config
+from autofix.dojo_client import DojoClient, first_finding_by_image, group_findings_by_image
 from autofix.models import Finding, Severity
 
 
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, data: dict, status_code: int = 200):
+        self._data = data
+        self.status_code = status_code
+        self.content = json.dumps(data).encode()
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._data
+
+
+class FakeSession:
+    """Serves DefectDojo-style pages from an in-memory list of items."""
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.headers: dict = {}
+        self.calls: list[dict] = []
+        self.patches: list[tuple[int, bytes | None]] = []
+        self.missing: set[int] = set()
+
+    def mount(self, prefix, adapter) -> None:
+        pass
+
+    def patch(self, url: str, data: bytes | None = None, json: dict | None = None) -> FakeResponse:
+        finding_id = int(url.rstrip("/").rsplit("/", 1)[-1])
+        self.patches.append((finding_id, data))
+        return FakeResponse({}, status_code=404 if finding_id in self.missing else 200)
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        retry_reads: bool = True,
+    ) -> FakeResponse:
+        params = dict(params or {})
+        if "?" in url:
+            url, query = url.split("?", 1)
+            params.update(dict(pair.split("=") for pair in query.split("&")))
+        self.calls.append(params)
+
+        items = self.items
+        if "severity" in params:
+            items = [i for i in items if i["severity"] == params["severity"]]
+        if "test__engagement__product" in params:
+            product = int(params["test__engagement__product"])
+            items = [i for i in items if i.get("product", product) == product]
+
+        limit = int(params.get("limit", 100))
+        offset = int(params.get("offset", 0))
+        page = items[offset:offset + limit]
+        next_offset = offset + limit
+        next_url = None
+        if next_offset < len(items):
+            query = "&".join(f"{k}={v}" for k, v in params.items() if k not in ("limit", "offset"))
+            next_url = f"{url}?limit={limit}&offset={next_offset}&{query}".rstrip("&")
+        return FakeResponse({
+            "count": len(items),
+            "next": next_url,
+            "results": page,
+        })
+
+
+def make_items(count: int, severity: str = "High") -> list[dict]:
+    return [
+        {
+            "id": i,
+            "title": f"CVE-{i}",
+            "severity": severity,
+            "component_name": f"image-{i % 7}",
+            "component_version": "1.0.0",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def dojo_config() -> Config:
+    return Config(defectdojo_url="https://dojo.example.com", defectdojo_api_key="test-key")
+
+
+def make_client(config: Config, items: list[dict]) -> DojoClient:
+    client = DojoClient(config)
+    client.session = FakeSession(items)
+    return client
+
+
+def test_paginated_sequential_by_offset(dojo_config: Config):
+    client = make_client(dojo_config, make_items(250))
+
+    results = list(client._get_paginated("findings", {"limit": 100}))
+
+    assert [r["id"] for r in results] == list(range(1, 251))
+    assert [int(c["offset"]) for c in client.session.calls] == [0, 100, 200]
+
+
+def test_paginated_uses_tuned_page_size(dojo_config: Config):
+    client = make_client(dojo_config, make_items(250))
+
+    results = list(client._get_paginated("findings"))
+
+    assert len(results) == 250
+    assert [int(c["limit"]) for c in client.session.calls] == [1000]
+
+
+def test_paginated_concurrent_preserves_order(dojo_config: Config):
+    client = make_client(dojo_config, make_items(1050))
+
+    results = list(client._get_paginated("findings", {"limit": 100}, concurrency=4))
+
+    assert [r["id"] for r in results] == list(range(1, 1051))
+    offsets = sorted(int(c.get("offset", 0)) for c in client.session.calls)
+    assert offsets == list(range(0, 1100, 100))
+
+
+def test_paginated_concurrent_single_page(dojo_config: Config):
+    client = make_client(dojo_config, make_items(5))
+
+    results = list(client._get_paginated("findings", concurrency=8))
+
+    assert len(results) == 5
+    assert len(client.session.calls) == 1
+
+
+def test_fetch_open_findings_concurrency(dojo_config: Config):
+    client = make_client(dojo_config, make_items(300))
+
+    findings = client.fetch_open_findings(["High"], concurrency=3)
+
+    assert [f.id for f in findings] == list(range(1, 301))
+
+
+def test_fetch_open_findings_filters_severity_server_side(dojo_config: Config):
+    items = make_items(150, "Medium") + [
+        {**item, "id": item["id"] + 1000} for item in make_items(20, "Critical")
+    ] + [
+        {**item, "id": item["id"] + 2000} for item in make_items(30, "High")
+    ]
+    client = make_client(dojo_config, items)
+
+    findings = client.fetch_open_findings(["Critical", "High"])
+
+    assert len(findings) == 50
+    assert {c["severity"] for c in client.session.calls} == {"Critical", "High"}
+    assert client.stats.records_transferred == 50
+    assert client.stats.records_kept == 50
+    assert client.stats.bytes_transferred > 0
+
+
+def test_fetch_open_findings_guards_unfiltered_server(dojo_config: Config):
+    items = make_items(10, "Low") + [
+        {**item, "id": item["id"] + 100} for item in make_items(5, "High")
+    ]
+    client = make_client(dojo_config, items)
+
+    # A server that ignores the severity filter returns everything
+    original_get = client.session.get
+    client.session.get = lambda url, params=None, headers=None, retry_reads=True: original_get(
+        url, {k: v for k, v in (params or {}).items() if k != "severity"}
+    )
+
+    findings = client.fetch_open_findings(["High"])
+
+    assert [f.id for f in findings] == list(range(101, 106))
+    assert client.stats.records_transferred == 15
+    assert client.stats.records_discarded == 10
+
+
 def test_group_findings_by_image_single():
     """Test grouping with single finding."""
     findings = [
@@ -92,3 +268,242 @@ def test_group_findings_no_version():
 
     assert len(grouped) == 1
     assert "myapp" in grouped
+
+
+def test_iter_open_findings_is_lazy_and_slim(dojo_config: Config):
+    items = [{**item, "description": "x" * 4096, "mitigation": "y" * 1024} for item in make_items(250)]
+    client = make_client(dojo_config, items)
+
+    stream = client.iter_open_findings(["High"])
+    first = next(stream)
+
+    assert first.id == 1
+    assert first.description == ""
+    assert first.mitigation == ""
+    assert len(client.session.calls) == 1
+
+    assert len(list(stream)) == 249
+    assert client.stats.records_kept == 250
+
+
+def test_fetch_open_findings_keeps_text_fields(dojo_config: Config):
+    items = [{**item, "description": "details"} for item in make_items(3)]
+    client = make_client(dojo_config, items)
+
+    findings = client.fetch_open_findings(["High"])
+
+    assert all(f.description == "details" for f in findings)
+
+
+def test_group_findings_by_image_accepts_generator(dojo_config: Config):
+    client = make_client(dojo_config, make_items(70))
+
+    grouped = group_findings_by_image(client.iter_open_findings(["High"]))
+
+    assert len(grouped) == 7
+    assert sum(len(group) for group in grouped.values()) == 70
+
+
+def test_first_finding_by_image_matches_grouping(dojo_config: Config):
+    client = make_client(dojo_config, make_items(70))
+    grouped = group_findings_by_image(client.fetch_open_findings(["High"]))
+
+    total, first = first_finding_by_image(client.iter_open_findings(["High"]))
+
+    assert total == 70
+    assert list(first) == list(grouped)
+    assert [f.id for f in first.values()] == [group[0].id for group in grouped.values()]
+
+
+def test_close_findings_reports_per_id(dojo_config: Config):
+    client = make_client(dojo_config, [])
+    client.session.missing = {3}
+
+    results = client.close_findings([1, 2, 3, 2], "Fixed in PR #1", concurrency=4)
+
+    assert results == {1: True, 2: True, 3: False}
+    assert sorted(fid for fid, _ in client.session.patches) == [1, 2, 3]
+    body = json.loads(client.session.patches[0][1])
+    assert body == {
+        "active": False,
+        "is_mitigated": True,
+        "notes": [{"entry": "Fixed in PR #1"}],
+    }
+
+
+def test_close_findings_coalesces_notes(dojo_config: Config):
+    client = make_client(dojo_config, [])
+    notes = {1: "Fixed nginx", 2: "Fixed nginx", 3: "Fixed redis"}
+
+    client.close_findings([1, 2, 3], notes)
+
+    bodies = {fid: body for fid, body in client.session.patches}
+    assert bodies[1] is bodies[2]
+    assert bodies[1] is not bodies[3]
+
+
+def test_close_finding_single(dojo_config: Config):
+    client = make_client(dojo_config, [])
+
+    assert client.close_finding(7) is True
+    assert json.loads(client.session.patches[0][1]) == {"active": False, "is_mitigated": True}
+
+
+def test_fetch_multiple_products_tags_and_dedupes(dojo_config: Config):
+    dojo_config.defectdojo_product_ids = [1, 2, 1]
+    items = [{**item, "product": 1} for item in make_items(150)] + [
+        {**item, "id": item["id"] + 1000, "product": 2} for item in make_items(30)
+    ]
+    client = make_client(dojo_config, items)
+
+    findings = client.fetch_open_findings(["High"], concurrency=2)
+
+    assert len(findings) == 180
+    assert len({f.id for f in findings}) == 180
+    assert {f.product_id for f in findings[:150]} == {1}
+    assert {f.product_id for f in findings[150:]} == {2}
+    assert {int(c["test__engagement__product"]) for c in client.session.calls} == {1, 2}
+
+
+def test_products_stream_through_bounded_buffers(dojo_config: Config, monkeypatch):
+    import time
+
+    from autofix import dojo_client
+
+    monkeypatch.setattr(dojo_client, "PRODUCT_BUFFER_ITEMS", 5)
+    dojo_config.defectdojo_product_ids = [1, 2]
+    dojo_config.defectdojo_page_size = 10
+    items = [{**item, "product": 1} for item in make_items(30)] + [
+        {**item, "id": item["id"] + 1000, "product": 2} for item in make_items(300)
+    ]
+    client = make_client(dojo_config, items)
+
+    findings = client.iter_open_findings(["High"], concurrency=1)
+    first = next(findings)
+    time.sleep(0.2)
+
+    # Product 2 stops after filling its buffer instead of fetching all 30 pages
+    product_2_pages = [c for c in client.session.calls if int(c["test__engagement__product"]) == 2]
+    assert first.product_id == 1
+    assert len(product_2_pages) == 1
+    assert len(list(findings)) == 329
+
+
+def test_pool_sized_for_every_product(dojo_config: Config):
+    dojo_config.defectdojo_product_ids = [1, 2, 3]
+    dojo_config.defectdojo_concurrency = 8
+
+    client = DojoClient(dojo_config)
+
+    assert client.session.adapters["https://"]._pool_maxsize == 24
+
+
+def test_config_parses_product_list(monkeypatch):
+    monkeypatch.setenv("DEFECTDOJO_URL", "https://dojo.example.com/")
+    monkeypatch.setenv("DEFECTDOJO_API_KEY", "key")
+    monkeypatch.setenv("DEFECTDOJO_PRODUCT_ID", "3, 5,3")
+
+    config = Config.from_env()
+
+    assert config.defectdojo_product_id == 3
+    assert config.product_ids == [3, 5]
+
+
+class DeltaSession(FakeSession):
+    """FakeSession that honours the updated-since filter used by delta syncs."""
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        retry_reads: bool = True,
+    ) -> FakeResponse:
+        params = dict(params or {})
+        since = params.pop("last_status_update__gte", None)
+        if since is None:
+            open_items = [i for i in self.items if i.get("active", True)]
+            return FakeSession(open_items).get(url, params)
+        changed = [i for i in self.items if i["last_status_update"] >= since]
+        self.calls.append({**params, "since": since})
+        return FakeSession(changed).get(url, params)
+
+
+class TestIncrementalSync:
+    """Tests for watermark-based delta sync."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        from autofix.finding_store import FindingStore
+
+        store = FindingStore(tmp_path / "findings.db")
+        yield store
+        store.close()
+
+    def _items(self) -> list[dict]:
+        return [
+            {**item, "last_status_update": f"2023-12-0{item['id']}T00:00:00+00:00"}
+            for item in make_items(5)
+        ]
+
+    def test_first_sync_is_full(self, dojo_config: Config, store):
+        client = DojoClient(dojo_config)
+        client.session = DeltaSession(self._items())
+
+        total = client.sync_open_findings(store, ["High"])
+
+        assert total == 5
+        assert store.get_state("watermark") == "2023-12-05T00:00:00+00:00"
+        assert all("since" not in c for c in client.session.calls)
+
+    def test_delta_sync_merges_changes(self, dojo_config: Config, store):
+        items = self._items()
+        client = DojoClient(dojo_config)
+        client.session = DeltaSession(items)
+        client.sync_open_findings(store, ["High"])
+
+        # Finding 2 gets closed, finding 6 appears
+        items[1] = {**items[1], "active": False, "last_status_update": "2024-01-02T00:00:00+00:00"}
+        items.append({**make_items(6)[-1], "last_status_update": "2024-01-03T00:00:00+00:00"})
+        client.session = DeltaSession(items)
+
+        client.sync_open_findings(store, ["High"])
+
+        assert [f.id for f in store.load_findings(["High"])] == [1, 3, 4, 5, 6]
+        assert client.session.calls[0]["since"] == "2023-12-05T00:00:00+00:00"
+        # The two changed findings plus finding 5 sitting on the watermark
+        assert client.stats.records_transferred == 3
+        assert store.get_state("watermark") == "2024-01-03T00:00:00+00:00"
+
+    def test_new_severity_forces_full_sync(self, dojo_config: Config, store):
+        client = DojoClient(dojo_config)
+        client.session = DeltaSession(self._items())
+        client.sync_open_findings(store, ["Critical"])
+
+        client.session = DeltaSession(self._items())
+        total = client.sync_open_findings(store, ["High"])
+
+        assert total == 5
+        assert all("since" not in c for c in client.session.calls)
+
+    def test_failed_sync_keeps_previous_snapshot(self, dojo_config: Config, store):
+        import requests
+
+        client = DojoClient(dojo_config)
+        client.session = DeltaSession(self._items())
+        client.sync_open_findings(store, ["High"])
+
+        class FailingSession(DeltaSession):
+            def get(self, url, params=None, headers=None, retry_reads=True):
+                if (params or {}).get("severity") == "High":
+                    raise requests.ConnectionError("connection reset")
+                return super().get(url, params, headers, retry_reads)
+
+        client.session = FailingSession(self._items())
+        # A new severity forces a full sync, which fails after fetching Critical
+        with pytest.raises(requests.ConnectionError):
+            client.sync_open_findings(store, ["Critical", "High"])
+
+        assert store.count(["High"]) == 5
+        assert store.get_state("watermark") == "2023-12-05T00:00:00+00:00"
+        assert store.get_state("severities") == '["High"]'
@@ -0,0 +1,91 @@
+"""Tests for the fake DefectDojo server, driven through the real clients."""
+
+import asyncio
+
+import pytest
+
+from autofix.async_dojo_client import AsyncDojoClient
+from autofix.config import Config
+from autofix.dojo_client import DojoClient, _is_open
+from autofix.finding_store import FindingStore
+
+from .fake_dojo import FakeDojo
+
+
+@pytest.fixture
+def fake() -> FakeDojo:
+    return FakeDojo(count=2000, products=(1, 2))
+
+
+def expected_open(fake: FakeDojo, severities: list[str], product: int | None = None) -> list[int]:
+    return [
+        i for i in range(1, fake.count + 1)
+        if _is_open(item := fake.item(i))
+        and item["severity"] in severities
+        and (product is None or item["product"] == product)
+    ]
+
+
+def make_config(base_url: str, **overrides) -> Config:
+    return Config(defectdojo_url=base_url, defectdojo_api_key="test-key", **overrides)
+
+
+def test_filters_match_generated_data(fake: FakeDojo):
+    with fake.run_in_thread() as base_url:
+        client = DojoClient(make_config(base_url))
+        findings = client.fetch_open_findings(["Critical", "High"], concurrency=4)
+
+    expected = expected_open(fake, ["Critical"]) + expected_open(fake, ["High"])
+    assert [f.id for f in findings] == expected
+    assert client.stats.records_discarded == 0
+
+
+def test_sequential_pagination(fake: FakeDojo):
+    with fake.run_in_thread() as base_url:
+        client = DojoClient(make_config(
+            base_url, defectdojo_product_ids=[2], defectdojo_page_size=100
+        ))
+        findings = client.fetch_open_findings(["High"], concurrency=1)
+
+    assert [f.id for f in findings] == expected_open(fake, ["High"], product=2)
+    assert client.stats.requests == -(-len(findings) // 100)
+
+
+def test_injected_errors_are_retried():
+    fake = FakeDojo(count=500, error_rate=0.3, seed=1)
+
+    async def fetch(base_url: str):
+        config = make_config(base_url, defectdojo_max_retries=10)
+        async with AsyncDojoClient(config) as client:
+            return await client.fetch_open_findings(["Medium"], concurrency=3)
+
+    with fake.run_in_thread() as base_url:
+        findings = asyncio.run(fetch(base_url))
+
+    assert [f.id for f in findings] == expected_open(fake, ["Medium"])
+    assert fake.stats.errors > 0
+
+
+def test_closed_findings_show_up_in_delta_sync(fake: FakeDojo, tmp_path):
+    store = FindingStore(tmp_path / "findings.db")
+    with fake.run_in_thread() as base_url:
+        client = DojoClient(make_config(base_url))
+        before = client.sync_open_findings(store, ["High"])
+        closing = expected_open(fake, ["High"])[:5]
+        assert all(client.close_findings(closing).values())
+
+        after = client.sync_open_findings(store, ["High"])
+
+    assert after == before - 5
+    assert client.stats.requests == 1
+    assert fake.stats.patched == closing
+    store.close()
+
+
+def test_max_limit_caps_page_size():
+    fake = FakeDojo(count=300, max_limit=25)
+
+    page = fake.page({"limit": "100", "severity": "Medium"}, "http://fake/api/v2/findings/")
+
+    assert len(page["results"]) == 25
+    assert "limit=25" in page["next"]
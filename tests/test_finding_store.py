@@ -0,0 +1,132 @@
+"""Tests for the local finding store."""
+
+from pathlib import Path
+
+import pytest
+
+from autofix.dojo_client import group_findings_by_image
+from autofix.finding_store import FindingStore
+from autofix.fixer import generate_fix_suggestions
+from autofix.models import Finding, Severity
+
+
+@pytest.fixture
+def findings() -> list[Finding]:
+    return [
+        Finding(id=1, title="CVE-1", severity=Severity.HIGH,
+                component_name="nginx", component_version="1.23.1"),
+        Finding(id=2, title="CVE-2", severity=Severity.CRITICAL,
+                component_name="redis", component_version="7.0.0"),
+        Finding(id=3, title="CVE-3", severity=Severity.CRITICAL,
+                component_name="nginx", component_version="1.23.1"),
+        Finding(id=4, title="CVE-4", severity=Severity.MEDIUM,
+                component_name="postgres", component_version="15.0"),
+        Finding(id=5, title="CVE-5", severity=Severity.HIGH,
+                component_name="myapp", component_version=None),
+    ]
+
+
+@pytest.fixture
+def store(tmp_path: Path, findings: list[Finding]) -> FindingStore:
+    store = FindingStore(tmp_path / "findings.db")
+    store.upsert_findings(findings)
+    yield store
+    store.close()
+
+
+def test_indexes_created(store: FindingStore):
+    rows = store._conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'findings'"
+    ).fetchall()
+    names = {row[0] for row in rows}
+
+    assert {
+        "idx_findings_image",
+        "idx_findings_version",
+        "idx_findings_severity",
+        "idx_findings_active",
+    } <= names
+
+
+def test_load_findings_filters_and_limits(store: FindingStore):
+    loaded = store.load_findings(["Critical", "High"], limit=2)
+
+    assert [f.id for f in loaded] == [1, 2]
+    assert store.count(["Critical", "High"]) == 4
+
+
+def test_group_by_image_matches_in_memory(store: FindingStore, findings: list[Finding]):
+    severities = ["Critical", "High"]
+    expected = group_findings_by_image(
+        [f for f in findings if f.severity.value in severities]
+    )
+
+    grouped = store.group_by_image(severities)
+
+    assert {k: [f.id for f in v] for k, v in grouped.items()} == {
+        k: [f.id for f in v] for k, v in expected.items()
+    }
+
+
+def test_image_representatives_match_suggestions(store: FindingStore, findings: list[Finding]):
+    representatives = store.image_representatives(["Critical", "High"])
+
+    assert [f.id for f in representatives] == [1, 2]
+    assert generate_fix_suggestions(representatives) == generate_fix_suggestions(
+        [f for f in findings if f.severity.value in ("Critical", "High")]
+    )
+
+
+def test_product_id_round_trip(tmp_path: Path):
+    store = FindingStore(tmp_path / "products.db")
+    store.upsert_findings([
+        Finding(id=1, title="CVE-1", severity=Severity.HIGH, product_id=4),
+    ])
+
+    assert store.load_findings()[0].product_id == 4
+    store.close()
+
+
+def test_adds_product_column_to_old_store(tmp_path: Path):
+    import sqlite3
+
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE findings (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+        "severity TEXT NOT NULL, component_name TEXT, component_version TEXT, "
+        "file_path TEXT, description TEXT NOT NULL DEFAULT '', "
+        "mitigation TEXT NOT NULL DEFAULT '', active INTEGER NOT NULL DEFAULT 1, "
+        "verified INTEGER NOT NULL DEFAULT 0, duplicate INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    store = FindingStore(db_path)
+
+    assert store.load_findings() == []
+    store.close()
+
+
+def test_delete_and_state(store: FindingStore):
+    store.delete_findings([1, 3])
+    store.set_state("watermark", "2024-01-01T00:00:00+00:00")
+
+    assert "nginx:1.23.1" not in store.group_by_image()
+    assert store.get_state("watermark") == "2024-01-01T00:00:00+00:00"
+    assert store.get_state("missing") is None
+
+
+def test_transaction_rolls_back_on_error(store: FindingStore, tmp_path: Path):
+    store.set_state("watermark", "2024-01-01T00:00:00+00:00")
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.clear()
+            store.set_state("watermark", "2024-02-01T00:00:00+00:00")
+            raise RuntimeError("sync failed")
+
+    reopened = FindingStore(tmp_path / "findings.db")
+    assert reopened.count() == 5
+    assert reopened.get_state("watermark") == "2024-01-01T00:00:00+00:00"
+    reopened.close()
@@ -0,0 +1,140 @@
+"""Tests for batching fix suggestions into shared branches and PRs."""
+
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.fix_batches import group_suggestions
+from autofix.git_client import GitClient, apply_fix_batch
+from autofix.models import FixSuggestion
+
+from .conftest import git
+
+
+def suggestion(finding_id: int, image: str, confidence: str = "medium") -> FixSuggestion:
+    return FixSuggestion(
+        finding_id=finding_id, current_image=image, current_tag="1.0.0",
+        suggested_tag="1.0.1", confidence=confidence,
+    )
+
+
+WEB = suggestion(1, "nginx", "high")
+CACHE = suggestion(2, "redis")
+DB = suggestion(3, "postgres", "high")
+QUEUE = suggestion(4, "rabbitmq")
+MISSING = suggestion(5, "mysql")
+
+PLAN = {
+    WEB: ["apps/web/deployment.yaml"],
+    CACHE: ["apps/web/cache.yaml"],
+    DB: ["apps/db/statefulset.yaml"],
+    QUEUE: ["infra/queue.yaml"],
+    MISSING: [],
+}
+
+
+def test_group_by_directory(tmp_path: Path):
+    batches = group_suggestions(list(PLAN), PLAN, "directory", 10, tmp_path)
+
+    assert [(b.label, b.suggestions) for b in batches] == [
+        ("apps/db", [DB]),
+        ("apps/web", [WEB, CACHE]),
+        ("infra", [QUEUE]),
+    ]
+
+
+def test_groups_are_packed_into_branch_limit(tmp_path: Path):
+    batches = group_suggestions(list(PLAN), PLAN, "directory", 2, tmp_path)
+
+    assert [(b.keys, len(b.suggestions)) for b in batches] == [
+        (["apps/db", "infra"], 2),
+        (["apps/web"], 2),
+    ]
+
+
+def test_group_by_confidence_and_namespace(tmp_path: Path):
+    for path, namespace in (
+        ("apps/web/deployment.yaml", "frontend"),
+        ("apps/web/cache.yaml", "frontend"),
+        ("apps/db/statefulset.yaml", "data"),
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(f"---\nkind: Service\n---\nmetadata:\n  namespace: {namespace}\n")
+
+    by_confidence = group_suggestions(list(PLAN), PLAN, "confidence", 5, tmp_path)
+    by_namespace = group_suggestions(list(PLAN), PLAN, "namespace", 5, tmp_path)
+
+    assert [(b.label, b.suggestions) for b in by_confidence] == [("high", [WEB, DB]), ("medium", [CACHE, QUEUE])]
+    assert [(b.label, b.suggestions) for b in by_namespace] == [
+        ("data", [DB]),
+        ("default", [QUEUE]),
+        ("frontend", [WEB, CACHE]),
+    ]
+
+
+def test_unknown_key_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        group_suggestions(list(PLAN), PLAN, "team", 1, tmp_path)
+
+
+@pytest.fixture
+def repo(make_repo) -> Path:
+    return make_repo({
+        "apps/web.yaml": "image: nginx:1.0.0\n",
+        "apps/cache.yaml": "image: redis:1.0.0\n",
+    })
+
+
+@pytest.mark.parametrize("mode", ["worktree", "plumbing"])
+def test_batch_is_one_commit_push_and_pr(repo: Path, tmp_path: Path, monkeypatch, mode: str):
+    client = GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=repo,
+        git_commit_mode=mode,
+    ))
+    prs = []
+    pushes = []
+    push_branch = GitClient.push_branch
+    monkeypatch.setattr(GitClient, "push_branch", lambda self, branch: pushes.append(branch) or push_branch(self, branch))
+    monkeypatch.setattr(
+        GitClient, "create_pull_request",
+        lambda self, branch, title, body: prs.append((title, body)) or f"https://pr/{len(prs)}",
+    )
+
+    results = apply_fix_batch(client, [WEB, CACHE, MISSING], "apps")
+
+    assert [(r.success, r.files_changed) for r in results] == [
+        (True, ["apps/web.yaml"]),
+        (True, ["apps/cache.yaml"]),
+        (False, []),
+    ]
+    assert results[2].error == "No manifests found referencing mysql:1.0.0"
+    assert len(pushes) == 1 and len(prs) == 1
+    assert {r.pr_url for r in results[:2]} == {"https://pr/1"}
+    title, body = prs[0]
+    assert title == "[Autofix] Bump 2 images in apps"
+    assert "| `redis` | `1.0.0` | `1.0.1` | #2 | medium |" in body
+    branch = results[0].branch_name
+    remote = tmp_path / "remote.git"
+    assert git(remote, "rev-list", "--count", f"main..{branch}") == "1"
+    assert git(remote, "show", f"{branch}:apps/cache.yaml") == "image: redis:1.0.1"
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_batch_pr_is_recorded_once(tmp_path: Path):
+    from autofix.slo_tracker import SLOTracker
+
+    tracker = SLOTracker(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        slo_db_path=tmp_path / "slo.json",
+    ))
+    tracker.start_run(total_findings=5, auto_fixable=3)
+
+    tracker.record_fix("https://pr/1", fixes=3)
+    record = tracker.complete_run()
+
+    assert record.auto_fixed == 3
+    assert record.prs_created == ["https://pr/1"]
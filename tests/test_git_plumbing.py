@@ -0,0 +1,104 @@
+"""Tests for checkout-free fix commits."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient, apply_fix
+from autofix.models import FixSuggestion
+
+from .conftest import git
+
+DEPLOYMENT = """containers:
+- name: web
+  image: nginx:1.23.1
+- name: cache
+  image: redis:7.0.0
+"""
+
+
+@pytest.fixture
+def repo(make_repo) -> Path:
+    return make_repo({
+        "apps/deployment.yaml": DEPLOYMENT,
+        "apps/values.yaml": b"image:\r\n  repository: nginx\r\n  tag: 1.23.1\r\n",
+        "apps/other.yaml": "image: postgres:15.0\n",
+    })
+
+
+@pytest.fixture
+def client(repo: Path) -> GitClient:
+    return GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=repo,
+        git_commit_mode="plumbing",
+    ))
+
+
+def suggestion(image: str, current: str, suggested: str) -> FixSuggestion:
+    return FixSuggestion(finding_id=7, current_image=image, current_tag=current, suggested_tag=suggested)
+
+
+def test_commit_built_without_touching_work_tree(client: GitClient, repo: Path):
+    head = git(repo, "rev-parse", "HEAD")
+    (repo / "apps/other.yaml").write_text("image: postgres:16.0\n")  # local edit survives
+    nginx = suggestion("nginx", "1.23.1", "1.23.4")
+
+    changes = client.build_fix_commit("autofix/test", [nginx], "bump nginx")
+
+    assert changes == {nginx: ["apps/deployment.yaml", "apps/values.yaml"]}
+    assert git(repo, "rev-parse", "HEAD") == head
+    assert git(repo, "rev-parse", "autofix/test^") == head
+    assert git(repo, "show", "autofix/test:apps/deployment.yaml") == DEPLOYMENT.replace("1.23.1", "1.23.4").strip()
+    assert git(repo, "diff", "--name-only", "main", "autofix/test").split() == [
+        "apps/deployment.yaml",
+        "apps/values.yaml",
+    ]
+    assert (repo / "apps/deployment.yaml").read_text() == DEPLOYMENT
+    assert (repo / "apps/other.yaml").read_text() == "image: postgres:16.0\n"
+    assert git(repo, "status", "--porcelain") == "M apps/other.yaml"
+
+
+def test_blob_bytes_are_preserved(client: GitClient, repo: Path):
+    client.build_fix_commit("autofix/crlf", [suggestion("nginx", "1.23.1", "1.23.4")], "bump")
+
+    blob = subprocess.run(
+        ["git", "cat-file", "blob", "autofix/crlf:apps/values.yaml"],
+        cwd=repo, check=True, capture_output=True,
+    ).stdout
+    assert blob == b"image:\r\n  repository: nginx\r\n  tag: 1.23.4\r\n"
+
+
+def test_no_branch_when_nothing_matches(client: GitClient, repo: Path):
+    mysql = suggestion("mysql", "8.0.0", "8.0.35")
+
+    assert client.build_fix_commit("autofix/none", [mysql], "bump") == {mysql: []}
+    assert git(repo, "branch", "--list", "autofix/none") == ""
+
+
+def test_existing_branch_is_never_overwritten(client: GitClient, repo: Path):
+    git(repo, "branch", "autofix/taken")
+    before = git(repo, "rev-parse", "autofix/taken")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        client.build_fix_commit("autofix/taken", [suggestion("nginx", "1.23.1", "1.23.4")], "bump")
+    assert git(repo, "rev-parse", "autofix/taken") == before
+
+
+def test_apply_fix_pushes_plumbing_branch(client: GitClient, repo: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(GitClient, "create_pull_request", lambda self, branch, title, body: f"https://pr/{branch}")
+    git(repo, "checkout", "-q", "-b", "elsewhere")
+
+    result = apply_fix(client, suggestion("redis", "7.0.0", "7.0.14"))
+
+    assert result.success, result.error
+    assert result.files_changed == ["apps/deployment.yaml"]
+    assert git(repo, "rev-parse", "--abbrev-ref", "HEAD") == "elsewhere"
+    pushed = git(tmp_path / "remote.git", "show", f"{result.branch_name}:apps/deployment.yaml")
+    assert "image: redis:7.0.14" in pushed
+    assert "Vulnerability remediation for finding #7" in git(
+        tmp_path / "remote.git", "log", "-1", "--format=%B", result.branch_name
+    )
@@ -0,0 +1,73 @@
+"""Tests for batched staging and git subprocess accounting."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient, GitStats, apply_fix
+from autofix.models import FixSuggestion
+
+from .conftest import git
+
+
+@pytest.fixture
+def repo(make_repo) -> Path:
+    return make_repo({f"apps/team {i}/deployment.yaml": "image: nginx:1.23.1\n" for i in range(40)})
+
+
+@pytest.fixture
+def client(repo: Path) -> GitClient:
+    return GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=repo,
+    ))
+
+
+def test_one_add_stages_every_file(client: GitClient, repo: Path):
+    files = client.update_manifests_for_image("nginx:1.23.1", "nginx:1.23.4")
+    client.stats = GitStats()
+
+    client.commit_changes(files, "bump nginx")
+
+    assert len(files) == 40
+    assert client.stats.by_command == {"git add": 1, "git commit": 1}
+    assert git(repo, "status", "--porcelain") == ""
+    assert len(git(repo, "show", "--name-only", "--format=", "HEAD").splitlines()) == 40
+
+
+def test_fix_fork_count_does_not_grow_with_files(client: GitClient, monkeypatch):
+    monkeypatch.setattr(GitClient, "create_pull_request", lambda self, branch, title, body: "https://pr")
+    suggestion = FixSuggestion(finding_id=1, current_image="nginx", current_tag="1.23.1", suggested_tag="1.23.4")
+
+    result = apply_fix(client, suggestion)
+
+    assert result.success, result.error
+    assert len(result.files_changed) == 40
+    assert client.stats.by_command == {
+        "git status": 1,
+        "git checkout": 3,  # main, -b <branch>, back to main
+        "git pull": 1,
+        "git add": 1,
+        "git commit": 1,
+        "git push": 1,
+        "git rev-parse": 3,  # HEAD when indexing and after returning to main, index cache path
+        "git ls-files": 1,  # manifest index
+    }
+    assert client.stats.processes == 12
+    assert client.stats.total_seconds > 0
+
+
+def test_stats_shared_and_counted_on_failure(repo: Path):
+    stats = GitStats()
+    config = Config(defectdojo_url="https://example.com", defectdojo_api_key="test-key", git_repo_path=repo)
+    first, second = GitClient(config, stats), GitClient(config, stats)
+
+    first._run_git("status")
+    with pytest.raises(subprocess.CalledProcessError):
+        second._run_git("rev-parse", "no-such-ref")
+
+    assert stats.processes == 2
+    assert stats.by_command == {"git status": 1, "git rev-parse": 1}
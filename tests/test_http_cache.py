@@ -0,0 +1,161 @@
+"""Tests for the conditional-GET response cache."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+from autofix.config import Config
+from autofix.dojo_client import DojoClient
+from autofix.http_cache import ResponseCache
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serves a finding and a one-page findings list with strong ETags."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/api/v2/findings/1":
+            body = {"id": 1, "title": "CVE-1", "severity": "High", "version": server.version}
+        elif path == "/api/v2/findings":
+            body = {"count": 1, "next": None, "results": [{"id": 1, "title": "CVE-1", "severity": "High"}]}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    server.requests = []
+    server.version = 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cached_client(etag_server, tmp_path: Path) -> DojoClient:
+    config = Config(
+        defectdojo_url=f"http://127.0.0.1:{etag_server.server_address[1]}",
+        defectdojo_api_key="test-key",
+        defectdojo_cache_path=tmp_path / "cache.db",
+    )
+    client = DojoClient(config)
+    yield client
+    client.cache.close()
+
+
+def test_second_get_is_conditional(cached_client: DojoClient, etag_server):
+    first = cached_client.get_finding_by_id(1)
+    second = cached_client.get_finding_by_id(1)
+
+    assert first == second
+    assert etag_server.requests[0] is None
+    assert etag_server.requests[1] is not None
+    assert cached_client.stats.not_modified == 1
+
+
+def test_changed_resource_is_refetched(cached_client: DojoClient, etag_server):
+    cached_client.get_finding_by_id(1)
+    etag_server.version = 2
+
+    cached_client.get_finding_by_id(1)
+
+    assert cached_client.stats.not_modified == 0
+    assert cached_client.stats.requests == 2
+
+
+def test_pages_revalidate(cached_client: DojoClient, etag_server):
+    cached_client.fetch_open_findings(["High"])
+    findings = cached_client.fetch_open_findings(["High"])
+
+    assert [f.id for f in findings] == [1]
+    assert cached_client.stats.not_modified == 1
+    assert cached_client.stats.bytes_transferred == 0
+
+
+def test_only_detail_responses_are_memoized(cached_client: DojoClient):
+    cached_client.fetch_open_findings(["High"])
+    cached_client.fetch_open_findings(["High"])
+    assert not cached_client.cache._decoded
+
+    cached_client.get_finding_by_id(1)
+    assert len(cached_client.cache._decoded) == 1
+
+
+def test_missing_finding_not_cached(cached_client: DojoClient):
+    assert cached_client.get_finding_by_id(404) is None
+    assert cached_client.cache.total_bytes() == 0
+
+
+class TestResponseCache:
+    """Unit tests for ResponseCache storage and eviction."""
+
+    def test_key_ignores_param_order(self):
+        assert ResponseCache.make_key("u", {"a": 1, "b": 2}) == ResponseCache.make_key("u", {"b": 2, "a": 1})
+        assert ResponseCache.make_key("u", {"a": 1}) != ResponseCache.make_key("u", {"a": 2})
+
+    def test_skips_responses_without_validators(self, tmp_path: Path):
+        cache = ResponseCache(tmp_path / "cache.db")
+
+        cache.put("k", "u", b"{}", etag=None, last_modified=None)
+
+        assert cache.get("k") is None
+        cache.close()
+
+    def test_lru_eviction_bounds_size(self, tmp_path: Path):
+        cache = ResponseCache(tmp_path / "cache.db", max_bytes=250)
+        body = b'{"results": []}'.ljust(100)
+
+        cache.put("a", "u/a", body, etag='"a"', last_modified=None)
+        cache.put("b", "u/b", body, etag='"b"', last_modified=None)
+        # Revalidating "a" makes "b" the least recently used entry
+        cache.decode(cache.get("a"))
+        cache.put("c", "u/c", body, etag='"c"', last_modified=None)
+
+        assert cache.total_bytes() <= 250
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        cache.close()
+
+    def test_conditional_headers(self, tmp_path: Path):
+        cache = ResponseCache(tmp_path / "cache.db")
+        cache.put("k", "u", b"{}", etag='"v1"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+
+        headers = cache.get("k").conditional_headers()
+
+        assert headers == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+        cache.close()
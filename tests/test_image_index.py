@@ -0,0 +1,117 @@
+"""Tests for the inverted image-reference index."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient
+from autofix.image_index import ImageRef, ImageRefIndex, default_cache_path
+from autofix.manifest_index import ManifestIndex
+
+from .conftest import git
+
+DEPLOYMENT = """apiVersion: apps/v1
+kind: Deployment
+spec:
+  template:
+    spec:
+      containers:
+      - name: web
+        image: "nginx:1.23.1"
+      - name: cache
+        image: redis:7.0.0
+"""
+
+VALUES = """image:
+  repository: nginx
+  tag: 1.23.1
+"""
+
+
+@pytest.fixture
+def repo(make_repo) -> Path:
+    return make_repo({
+        "apps/deployment.yaml": DEPLOYMENT,
+        "apps/values.yaml": VALUES,
+        "apps/other.yaml": "image: postgres:15.0\n",
+    }, remote=False)
+
+
+def open_index(repo: Path) -> ImageRefIndex:
+    return ImageRefIndex.open(repo, ManifestIndex.build(repo), default_cache_path(repo))
+
+
+def test_refs_carry_line_spans(repo: Path):
+    index = open_index(repo)
+
+    assert index.refs_for("nginx:1.23.1") == [
+        ImageRef("apps/deployment.yaml", "image", "nginx:1.23.1", 8, 16, 28),
+        ImageRef("apps/values.yaml", "tag", "1.23.1", 3, 7, 13),
+    ]
+    assert index.files_for("redis:7.0.0") == ["apps/deployment.yaml"]
+    assert index.files_for("mysql:8.0") == []
+
+
+def test_persisted_under_git_dir(repo: Path):
+    open_index(repo).save()
+
+    assert (repo / ".git/autofix/image-index.json").exists()
+
+
+def test_reopen_rescans_only_changed_files(repo: Path):
+    open_index(repo).save()
+    (repo / "apps/other.yaml").write_text("image: postgres:16.1\n")
+    (repo / "apps/new.yml").write_text("image: nginx:1.23.1\n")
+    (repo / "apps/values.yaml").unlink()
+
+    manifests = ManifestIndex.build(repo)
+    index = ImageRefIndex(repo, default_cache_path(repo))
+    index._load()
+    rescanned = index.sync(manifests)
+
+    assert rescanned == 2
+    assert index.files_for("nginx:1.23.1") == ["apps/deployment.yaml", "apps/new.yml"]
+    assert index.files_for("postgres:16.1") == ["apps/other.yaml"]
+
+
+def test_git_diff_catches_changes_stat_misses(repo: Path):
+    open_index(repo).save()
+    path = repo / "apps/other.yaml"
+    before = os.stat(path)
+    # Same size and mtime: only git diff can tell the file changed
+    path.write_text("image: postgres:15.9\n")
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    git(repo, "commit", "-q", "-am", "bump postgres")
+
+    index = open_index(repo)
+
+    assert index.files_for("postgres:15.9") == ["apps/other.yaml"]
+    assert index.head == git(repo, "rev-parse", "HEAD")
+
+
+def test_update_reads_only_indexed_files(repo: Path, monkeypatch):
+    client = GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=repo,
+    ))
+    read = []
+    original = GitClient._update_file
+    monkeypatch.setattr(
+        GitClient, "_update_file",
+        lambda self, path, old, new: read.append(path.name) or original(self, path, old, new),
+    )
+
+    changed = client.update_manifests_for_image("nginx:1.23.1", "nginx:1.23.4")
+
+    assert changed == ["apps/deployment.yaml", "apps/values.yaml"]
+    assert read == ["deployment.yaml", "values.yaml"]
+    assert client.image_index().files_for("nginx:1.23.4") == changed
+    assert client.image_index().files_for("nginx:1.23.1") == []
+
+    # Going back to main restores the old references in the index
+    git(repo, "checkout", "--", ".")
+    client._revalidate_indexes()
+    assert client.image_index().files_for("nginx:1.23.1") == changed
@@ -0,0 +1,103 @@
+"""Tests for the one-pass manifest index."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient
+from autofix.manifest_index import ManifestIndex
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    write(tmp_path / "apps/web/deployment.yaml", "image: nginx:1.23.1\n")
+    write(tmp_path / "apps/web/values-prod.yaml", "image:\n  repository: nginx\n  tag: 1.23.1\n")
+    write(tmp_path / "charts/web/Chart.yaml", "name: web\n")
+    write(tmp_path / "apps/db/statefulset.yml", "image: redis:7.0.0\n")
+    write(tmp_path / "apps/web/README.md", "nginx:1.23.1\n")
+    write(tmp_path / "vendor/chart/values.yaml", "image:\n  repository: nginx\n  tag: 1.23.1\n")
+    write(tmp_path / ".gitignore", "vendor/\n")
+    return tmp_path
+
+
+def git_init(path: Path) -> None:
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "add", "apps/web"], check=True)
+
+
+def test_git_index_honours_gitignore(tree: Path):
+    git_init(tree)
+
+    index = ManifestIndex.build(tree)
+
+    # Tracked and untracked manifests, but nothing ignored or inside .git
+    assert sorted(f.path for f in index) == [
+        "apps/db/statefulset.yml",
+        "apps/web/deployment.yaml",
+        "apps/web/values-prod.yaml",
+        "charts/web/Chart.yaml",
+    ]
+
+
+def test_deleted_tracked_file_is_skipped(tree: Path):
+    git_init(tree)
+    (tree / "apps/web/deployment.yaml").unlink()
+
+    assert "apps/web/deployment.yaml" not in ManifestIndex.build(tree)
+
+
+def test_walk_fallback_skips_dot_git(tree: Path):
+    write(tree / ".git/config.yaml", "not a manifest\n")
+
+    index = ManifestIndex.build(tree)
+
+    assert "vendor/chart/values.yaml" in index
+    assert not any(f.path.startswith(".git/") for f in index)
+    assert index.head is None
+
+
+def test_records_stat_and_detects_changes(tree: Path):
+    index = ManifestIndex.build(tree)
+    entry = index.get("apps/web/deployment.yaml")
+
+    assert entry.size == len("image: nginx:1.23.1\n")
+    assert not index.is_stale(entry.path)
+
+    (tree / entry.path).write_text("image: nginx:1.23.4-alpine\n")
+    assert index.is_stale(entry.path)
+
+    index.refresh(entry.path)
+    assert not index.is_stale(entry.path)
+
+
+def test_git_client_walks_once_for_many_images(tree: Path, monkeypatch):
+    config = Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=tree,
+    )
+    client = GitClient(config)
+    builds = []
+    original = ManifestIndex.build
+    monkeypatch.setattr(
+        ManifestIndex, "build",
+        classmethod(lambda cls, path, stats=None: builds.append(path) or original(path, stats)),
+    )
+
+    first = client.update_manifests_for_image("nginx:1.23.1", "nginx:1.23.4")
+    second = client.update_manifests_for_image("redis:7.0.0", "redis:7.0.14")
+
+    assert len(builds) == 1
+    assert first == [
+        "apps/web/deployment.yaml",
+        "apps/web/values-prod.yaml",
+        "vendor/chart/values.yaml",
+    ]
+    assert second == ["apps/db/statefulset.yml"]
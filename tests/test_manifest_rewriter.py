@@ -0,0 +1,258 @@
+"""Tests for the batch manifest rewriter."""
+
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient
+from autofix.manifest_rewriter import (
+    ByteChange,
+    ManifestRewriter,
+    byte_changes,
+    rewrite_image,
+    image_pattern,
+    rewrite_file,
+    write_atomic,
+)
+from autofix.models import FixSuggestion
+
+MANIFEST = """containers:
+- name: web
+  image: nginx:1.23.1
+- name: cache
+  image: "redis:7.0.0"
+- name: db
+  image: postgres:15.0
+"""
+
+
+def test_one_pass_applies_every_replacement():
+    rewriter = ManifestRewriter([
+        ("nginx:1.23.1", "nginx:1.23.4"),
+        ("redis:7.0.0", "redis:7.0.14"),
+        ("mysql:8.0.0", "mysql:8.0.35"),
+    ])
+
+    content, applied = rewriter.rewrite(MANIFEST)
+
+    assert "image: nginx:1.23.4" in content
+    assert 'image: "redis:7.0.14"' in content
+    assert "image: postgres:15.0" in content
+    assert applied == {0, 1}
+
+
+def test_matches_the_per_image_pattern(tmp_path: Path):
+    values = "image:\n  repository: nginx\n  tag: '1.23.1'\nother:\n  tag: 1.23.1\n"
+    config = Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=tmp_path,
+    )
+    client = GitClient(config)
+    for name in ("a.yaml", "b.yaml"):
+        (tmp_path / name).write_text(MANIFEST + values)
+
+    client._update_file(tmp_path / "a.yaml", "nginx:1.23.1", "nginx:1.23.4")
+    client._update_file(tmp_path / "a.yaml", "redis:7.0.0", "redis:7.0.14")
+    rewritten, _ = ManifestRewriter([
+        ("nginx:1.23.1", "nginx:1.23.4"),
+        ("redis:7.0.0", "redis:7.0.14"),
+    ]).rewrite((tmp_path / "b.yaml").read_text())
+
+    assert rewritten == (tmp_path / "a.yaml").read_text()
+
+
+def test_longest_value_wins():
+    rewriter = ManifestRewriter([
+        ("app:1.2", "app:1.3"),
+        ("app:1.2.5", "app:1.2.8"),
+    ])
+
+    content, applied = rewriter.rewrite("image: app:1.2.5\nimage: app:1.2\n")
+
+    assert content == "image: app:1.2.8\nimage: app:1.3\n"
+    assert applied == {0, 1}
+
+
+def test_replacements_do_not_chain():
+    rewriter = ManifestRewriter([
+        ("api:1.0", "api:1.1"),
+        ("worker:1.1", "worker:1.2"),
+    ])
+
+    content, applied = rewriter.rewrite("repository: worker\ntag: 1.0\n---\nrepository: api\ntag: 1.0\n")
+
+    assert content == "repository: worker\ntag: 1.0\n---\nrepository: api\ntag: 1.1\n"
+    assert applied == {0}
+
+
+def test_shared_tag_goes_to_its_own_repository():
+    rewriter = ManifestRewriter([
+        ("api:1.0.0", "api:1.0.3"),
+        ("worker:1.0.0", "worker:1.0.5"),
+    ])
+    values = "api:\n  repository: api\n  tag: 1.0.0\nworker:\n  repository: worker\n  tag: 1.0.0\n"
+
+    assert rewriter.rewrite(values) == (
+        "api:\n  repository: api\n  tag: 1.0.3\nworker:\n  repository: worker\n  tag: 1.0.5\n",
+        {0, 1},
+    )
+    assert rewriter.rewrite(values, only={1}) == (
+        "api:\n  repository: api\n  tag: 1.0.0\nworker:\n  repository: worker\n  tag: 1.0.5\n",
+        {1},
+    )
+
+
+def test_unrelated_tags_are_left_alone():
+    values = """web:
+  image:
+    repository: nginx
+    tag: "1.0.0"
+metrics:
+  image:
+    repository: prom/statsd-exporter
+    tag: 1.0.0
+chart:
+  tag: 1.0.0
+"""
+    rewriter = ManifestRewriter([("nginx:1.0.0", "nginx:1.0.2")])
+
+    content, applied = rewriter.rewrite(values)
+
+    assert content == values.replace('"1.0.0"', '"1.0.2"')
+    assert applied == {0}
+    assert rewrite_image(values, "nginx:1.0.0", "nginx:1.0.2") == (content, 1)
+
+
+@pytest.fixture
+def client(tmp_path: Path) -> GitClient:
+    (tmp_path / "web.yaml").write_text("image: nginx:1.23.1\n")
+    (tmp_path / "stack.yaml").write_text(MANIFEST)
+    (tmp_path / "other.yaml").write_text("image: busybox:1.36\n")
+    return GitClient(Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=tmp_path,
+    ))
+
+
+def suggestion(image: str, current: str, suggested: str) -> FixSuggestion:
+    return FixSuggestion(finding_id=1, current_image=image, current_tag=current, suggested_tag=suggested)
+
+
+def test_plan_reports_files_without_writing(client: GitClient, tmp_path: Path):
+    nginx = suggestion("nginx", "1.23.1", "1.23.4")
+    redis = suggestion("redis", "7.0.0", "7.0.14")
+    mysql = suggestion("mysql", "8.0.0", "8.0.35")
+
+    plan = client.plan_manifest_updates([nginx, redis, mysql])
+
+    assert plan == {nginx: ["stack.yaml", "web.yaml"], redis: ["stack.yaml"], mysql: []}
+    assert (tmp_path / "web.yaml").read_text() == "image: nginx:1.23.1\n"
+
+
+def test_batch_update_scans_each_file_once(client: GitClient, tmp_path: Path, monkeypatch):
+    scanned = []
+    original = ManifestRewriter._apply
+    monkeypatch.setattr(
+        ManifestRewriter, "_apply",
+        lambda self, content, only: scanned.append(content) or original(self, content, only),
+    )
+
+    changed = client.update_manifests_for_images([
+        suggestion("nginx", "1.23.1", "1.23.4"),
+        suggestion("redis", "7.0.0", "7.0.14"),
+        suggestion("postgres", "15.0", "15.5"),
+    ])
+
+    assert len(scanned) == 2
+    assert sorted({path for files in changed.values() for path in files}) == ["stack.yaml", "web.yaml"]
+    assert "image: postgres:15.5" in (tmp_path / "stack.yaml").read_text()
+    assert client.image_index().files_for("nginx:1.23.1") == []
+
+
+def test_rewrite_file_reports_byte_changes(tmp_path: Path):
+    path = tmp_path / "values.yaml"
+    path.write_bytes(b"image:\r\n  repository: nginx\r\n  tag: '1.23.1'\r\n")
+
+    result = rewrite_file(path, "nginx:1.23.1", "nginx:1.23.10")
+
+    assert result.replacements == 1
+    assert result.changes == [ByteChange(43, b"", b"0")]
+    # Line endings are kept byte for byte
+    assert path.read_bytes() == b"image:\r\n  repository: nginx\r\n  tag: '1.23.10'\r\n"
+
+
+def test_rewrite_files_reports_byte_changes(tmp_path: Path):
+    (tmp_path / "stack.yaml").write_text(MANIFEST)
+    (tmp_path / "other.yaml").write_text("image: busybox:1.36\n")
+    rewriter = ManifestRewriter([("nginx:1.23.1", "nginx:1.23.4"), ("redis:7.0.0", "redis:7.0.14")])
+
+    results = rewriter.rewrite_files(tmp_path, ["stack.yaml", "other.yaml", "missing.yaml"], write=False)
+
+    assert list(results) == ["stack.yaml", "other.yaml"]
+    stack = results["stack.yaml"]
+    assert (stack.replacements, stack.applied) == (2, {0, 1})
+    assert stack.changes == [ByteChange(44, b"1", b"4"), ByteChange(80, b"0", b"14")]
+    assert not results["other.yaml"].changed
+    assert (tmp_path / "stack.yaml").read_text() == MANIFEST
+
+
+def test_unchanged_file_is_not_written(tmp_path: Path):
+    path = tmp_path / "web.yaml"
+    path.write_text("image: nginx:1.23.4\n")
+    before = path.stat().st_mtime_ns
+
+    result = rewrite_file(path, "nginx:1.23.4", "nginx:1.23.4")
+
+    assert result.replacements == 1
+    assert not result.changed
+    assert path.stat().st_mtime_ns == before
+
+
+def test_patterns_are_compiled_once_per_image(tmp_path: Path):
+    image_pattern.cache_clear()
+    for name in ("a.yaml", "b.yaml", "c.yaml"):
+        (tmp_path / name).write_text(MANIFEST)
+        rewrite_file(tmp_path / name, "nginx:1.23.1", "nginx:1.23.4")
+
+    info = image_pattern.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_byte_changes_fall_back_to_difflib():
+    assert byte_changes(b"a\nb\n", b"a\nx\ny\n") == [
+        ByteChange(2, b"b", b"x"),
+        ByteChange(4, b"", b"y\n"),
+    ]
+
+
+def test_atomic_write_keeps_mode_and_symlinks(tmp_path: Path):
+    target = tmp_path / "real.yaml"
+    target.write_text("image: nginx:1.23.1\n")
+    target.chmod(0o640)
+    link = tmp_path / "link.yaml"
+    link.symlink_to(target)
+
+    write_atomic(link, b"image: nginx:1.23.4\n")
+
+    assert link.is_symlink()
+    assert target.read_text() == "image: nginx:1.23.4\n"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["link.yaml", "real.yaml"]
+
+
+def test_failed_write_leaves_original(tmp_path: Path, monkeypatch):
+    path = tmp_path / "web.yaml"
+    path.write_text("image: nginx:1.23.1\n")
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", crash)
+    with pytest.raises(OSError):
+        write_atomic(path, b"image: nginx:1.23.4\n")
+
+    assert path.read_text() == "image: nginx:1.23.1\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["web.yaml"]
@@ -0,0 +1,73 @@
+"""Tests for data models."""
+
+import dataclasses
+
+import pytest
+
+from autofix.models import Finding, FixResult, FixSuggestion, Severity
+
+
+def make_finding(**kwargs) -> Finding:
+    defaults = {
+        "id": 1,
+        "title": "CVE-2023-1234",
+        "severity": Severity.HIGH,
+        "component_name": "nginx",
+        "component_version": "1.23.1",
+    }
+    return Finding(**{**defaults, **kwargs})
+
+
+def test_finding_is_slotted_and_frozen():
+    finding = make_finding()
+
+    assert not hasattr(finding, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        finding.component_version = "1.23.4"
+
+
+def test_finding_interns_repeated_strings():
+    first = make_finding(component_name="".join(["ng", "inx"]))
+    second = make_finding(id=2, component_name="".join(["ngi", "nx"]))
+
+    assert first.component_name is second.component_name
+    assert first.image_tag is second.image_tag
+
+
+def test_finding_image_tag():
+    assert make_finding().image_tag == "nginx:1.23.1"
+    assert make_finding(component_version=None).image_tag is None
+
+
+def test_finding_replace_recomputes_image_tag():
+    finding = dataclasses.replace(make_finding(), component_version="1.23.4")
+
+    assert finding.image_tag == "nginx:1.23.4"
+
+
+def test_finding_equality_ignores_cached_fields():
+    assert make_finding() == make_finding()
+    assert hash(make_finding()) == hash(make_finding())
+
+
+def test_fix_suggestion_cached_images():
+    suggestion = FixSuggestion(
+        finding_id=1,
+        current_image="nginx",
+        current_tag="1.23.1",
+        suggested_tag="1.23.4",
+    )
+
+    assert suggestion.full_current_image == "nginx:1.23.1"
+    assert suggestion.full_suggested_image == "nginx:1.23.4"
+    assert "_full_current_image" not in repr(suggestion)
+
+
+def test_fix_result_is_mutable():
+    suggestion = FixSuggestion(1, "nginx", "1.23.1", "1.23.4")
+    result = FixResult(suggestion=suggestion)
+
+    result.error = "failed"
+
+    assert result.error == "failed"
+    assert not hasattr(result, "__dict__")
@@ -0,0 +1,130 @@
+"""Tests for adaptive page sizing."""
+
+import json
+from pathlib import Path
+
+from autofix.config import Config
+from autofix.dojo_client import DojoClient
+from autofix.paging import PageSizeTuner
+
+from .fake_dojo import FakeDojo
+
+
+def test_slow_pages_shrink_in_proportion():
+    tuner = PageSizeTuner(initial=1000, target_seconds=2.0)
+
+    tuner.record("findings", 1000, seconds=8.0, num_records=1000)
+
+    assert tuner.limit_for("findings") == 250
+
+
+def test_fast_full_pages_grow_up_to_ceiling():
+    tuner = PageSizeTuner(initial=1000, target_seconds=2.0)
+    tuner.record_timeout("findings", 1000)
+    tuner.record("findings", 500, seconds=5.0, num_records=500)
+    assert tuner.limit_for("findings") == 200
+
+    tuner.record("findings", 200, seconds=0.1, num_records=200)
+    tuner.record("findings", 400, seconds=0.1, num_records=400)
+    tuner.record("findings", 500, seconds=0.1, num_records=500)
+
+    # Never grows back past the size that timed out
+    assert tuner.limit_for("findings") == 500
+
+
+def test_partial_and_stale_pages_do_not_grow():
+    tuner = PageSizeTuner(initial=1000, target_seconds=2.0)
+    tuner.record("findings", 1000, seconds=4.0, num_records=1000)
+
+    tuner.record("findings", 500, seconds=0.1, num_records=20)  # last page
+    tuner.record("findings", 100, seconds=0.1, num_records=100)  # fetched before shrinking
+
+    assert tuner.limit_for("findings") == 500
+
+
+def test_timeout_at_minimum_gives_up():
+    tuner = PageSizeTuner(initial=100, minimum=50)
+
+    assert tuner.record_timeout("findings", 100) is True
+    assert tuner.limit_for("findings") == 50
+    assert tuner.record_timeout("findings", 50) is False
+
+
+def test_state_round_trip(tmp_path: Path):
+    state_path = tmp_path / "paging.json"
+    tuner = PageSizeTuner(state_path, initial=1000)
+    tuner.record_server_cap("findings", 250)
+    tuner.save()
+
+    assert json.loads(state_path.read_text()) == {"findings": 250}
+    assert PageSizeTuner(state_path, initial=1000).limit_for("findings") == 250
+    # Saved sizes are clamped to the configured maximum
+    assert PageSizeTuner(state_path, initial=100).limit_for("findings") == 100
+
+
+def test_unreadable_state_is_ignored(tmp_path: Path):
+    state_path = tmp_path / "paging.json"
+    state_path.write_text("not json")
+
+    assert PageSizeTuner(state_path, initial=300).limit_for("findings") == 300
+
+
+def make_client(base_url: str, **overrides) -> DojoClient:
+    return DojoClient(Config(
+        defectdojo_url=base_url,
+        defectdojo_api_key="test-key",
+        **overrides,
+    ))
+
+
+def test_server_cap_leaves_no_gaps():
+    fake = FakeDojo(count=3000, max_limit=200)
+
+    with fake.run_in_thread() as base_url:
+        client = make_client(base_url)
+        ids = [r["id"] for r in client._get_paginated("findings", concurrency=4)]
+
+    assert ids == list(range(1, 3001))
+    assert client.page_sizes.limit_for("findings") == 200
+
+
+def test_timeouts_shrink_pages_and_persist(tmp_path: Path):
+    # A 1000-finding page takes 2s here, well past the 0.5s client timeout
+    fake = FakeDojo(count=1200, latency_per_item=0.002)
+    state_path = tmp_path / "paging.json"
+
+    with fake.run_in_thread() as base_url:
+        client = make_client(
+            base_url,
+            defectdojo_timeout=0.5,
+            defectdojo_max_retries=0,
+            defectdojo_page_seconds=0.3,
+            defectdojo_page_state_path=state_path,
+        )
+        ids = [r["id"] for r in client._get_paginated("findings", concurrency=2)]
+
+    assert ids == list(range(1, 1201))
+    tuned = json.loads(state_path.read_text())["findings"]
+    assert tuned < 250
+    assert make_client("http://unused", defectdojo_page_state_path=state_path) \
+        .page_sizes.limit_for("findings") == tuned
+
+
+def test_first_timeout_shrinks_page_without_retrying(tmp_path: Path):
+    # 400 findings take 0.8s and 200 take 0.4s, past the 0.3s timeout
+    fake = FakeDojo(count=400, latency_per_item=0.002)
+
+    with fake.run_in_thread() as base_url:
+        client = make_client(
+            base_url,
+            defectdojo_timeout=0.3,
+            defectdojo_max_retries=3,
+            defectdojo_page_size=400,
+            defectdojo_page_state_path=tmp_path / "paging.json",
+        )
+        url = f"{base_url}/api/v2/findings"
+        page = client._get_sized_page("findings", url, {}, 0, 400)
+
+    assert len(page["results"]) == 100
+    # One request per size tried; read retries would have sent 4 at each
+    assert fake.stats.requests == 3
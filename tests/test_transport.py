@@ -0,0 +1,121 @@
+"""Tests for the resilient HTTP transport, against a local stub server."""
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from autofix.transport import ResilientSession
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Replays a scripted list of (status, headers, body, delay) responses."""
+
+    def do_GET(self):
+        server = self.server
+        server.seen_headers.append(dict(self.headers))
+        status, headers, body, delay = server.script.pop(0) if server.script else (200, {}, {"ok": True}, 0)
+        if delay:
+            time.sleep(delay)
+
+        payload = json.dumps(body).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            headers = {**headers, "Content-Encoding": "gzip"}
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_PATCH = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.script = []
+    server.seen_headers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url_for(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/api/v2/findings/"
+
+
+def test_retries_transient_errors(stub_server):
+    stub_server.script = [
+        (502, {}, {"error": "bad gateway"}, 0),
+        (503, {"Retry-After": "0"}, {"error": "unavailable"}, 0),
+    ]
+    session = ResilientSession(max_retries=3, backoff_factor=0.01)
+
+    response = session.get(url_for(stub_server))
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert session.metrics.requests == 1
+    assert session.metrics.retries == 2
+
+
+def test_honours_retry_after(stub_server):
+    stub_server.script = [(429, {"Retry-After": "1"}, {"error": "slow down"}, 0)]
+    session = ResilientSession(max_retries=2, backoff_factor=0)
+
+    start = time.perf_counter()
+    response = session.get(url_for(stub_server))
+
+    assert response.status_code == 200
+    assert time.perf_counter() - start >= 1.0
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.script = [(500, {}, {"error": "boom"}, 0)] * 3
+    session = ResilientSession(max_retries=2, backoff_factor=0.01)
+
+    response = session.get(url_for(stub_server))
+
+    assert response.status_code == 500
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_default_timeout(stub_server):
+    stub_server.script = [(200, {}, {"ok": True}, 1.0)]
+    session = ResilientSession(timeout=0.2, max_retries=0)
+
+    with pytest.raises(requests.ConnectionError):
+        session.get(url_for(stub_server))
+
+
+def test_negotiates_gzip(stub_server):
+    session = ResilientSession()
+
+    response = session.get(url_for(stub_server))
+
+    assert "gzip" in stub_server.seen_headers[0]["Accept-Encoding"]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == {"ok": True}
+
+
+def test_retries_patch(stub_server):
+    stub_server.script = [(503, {"Retry-After": "0"}, {}, 0)]
+    session = ResilientSession(max_retries=1, backoff_factor=0)
+
+    response = session.patch(url_for(stub_server), json={"active": False})
+
+    assert response.status_code == 200
+    assert session.metrics.retries == 1
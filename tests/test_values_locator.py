@@ -0,0 +1,102 @@
+"""Tests for the YAML-aware repository/tag locator."""
+
+from autofix.manifest_rewriter import rewrite_image
+from autofix.values_locator import (
+    TagRef,
+    canonical_repository,
+    locate_tags,
+    replace_tags,
+    same_repository,
+)
+
+VALUES = """global:
+  imageRegistry: ""
+image:
+  registry: docker.io
+  repository: bitnami/redis
+  tag: '7.0.0'  # pinned
+sidecars:
+  - name: exporter
+    image: oliver006/redis_exporter
+    tag: v1.45.0
+  - {repository: busybox, tag: "1.36"}
+notAnImage:
+  tag: 7.0.0
+"""
+
+
+def test_pairs_tags_with_sibling_repository():
+    refs = locate_tags(VALUES)
+
+    assert [(r.repository, r.value) for r in refs] == [
+        ("docker.io/bitnami/redis", "7.0.0"),
+        ("oliver006/redis_exporter", "v1.45.0"),
+        ("busybox", "1.36"),
+    ]
+    for ref in refs:
+        assert VALUES[ref.start:ref.end] == ref.value
+
+
+def test_offsets_count_characters():
+    content = "# café ☕\nimage:\n  repository: nginx\n  tag: 1.23.1\n"
+
+    (ref,) = locate_tags(content)
+
+    assert ref == TagRef("nginx", "1.23.1", content.index("1.23.1"), content.index("1.23.1") + 6)
+
+
+def test_replace_only_paired_tags():
+    content, count = replace_tags(VALUES, "bitnami/redis:7.0.0", "bitnami/redis:7.0.14")
+
+    assert count == 1
+    assert "tag: '7.0.14'  # pinned" in content
+    assert "notAnImage:\n  tag: 7.0.0\n" in content
+
+
+def test_aliases_and_multiple_documents():
+    content = """base: &image
+  repository: nginx
+  tag: 1.23.1
+web:
+  image: *image
+---
+image:
+  repository: nginx
+  tag: 1.23.1
+"""
+    new_content, count = replace_tags(content, "nginx:1.23.1", "nginx:1.23.4")
+
+    assert count == 2
+    assert new_content == content.replace("1.23.1", "1.23.4")
+
+
+def test_unparseable_yaml_has_no_pairs():
+    template = "image:\n  repository: {{ .Values.repo }}\n  tag: 1.0.0\n  {{- if .Values.x }}\n"
+
+    assert locate_tags(template) == ()
+    assert replace_tags(template, "repo:1.0.0", "repo:1.0.1") == (template, 0)
+
+
+def test_other_namespace_is_not_rewritten():
+    content = "image:\n  repository: bitnami/nginx\n  tag: 1.23.1\n"
+
+    assert replace_tags(content, "nginx:1.23.1", "nginx:1.23.4") == (content, 0)
+    assert rewrite_image(content, "nginx:1.23.1", "nginx:1.23.4") == (content, 0)
+    assert replace_tags(VALUES, "redis:7.0.0", "redis:7.0.14") == (VALUES, 0)
+
+
+def test_canonical_repository():
+    assert canonical_repository("nginx") == "docker.io/library/nginx"
+    assert canonical_repository("index.docker.io/bitnami/nginx:1.23") == "docker.io/bitnami/nginx"
+    assert canonical_repository("localhost:5000/app@sha256:abc") == "localhost:5000/app"
+    assert canonical_repository("ghcr.io/org/app") == "ghcr.io/org/app"
+
+
+def test_same_repository():
+    assert same_repository("library/nginx", "nginx")
+    assert same_repository("nginx", "docker.io/library/nginx")
+    assert same_repository("docker.io/bitnami/redis", "bitnami/redis")
+    assert not same_repository("my-nginx", "nginx")
+    assert not same_repository("bitnami/nginx", "nginx")
+    assert not same_repository("nginx", "bitnami/nginx")
+    assert not same_repository("ghcr.io/org/app", "org/app")
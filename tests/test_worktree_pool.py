@@ -0,0 +1,86 @@
+"""Tests for parallel fix application in git worktrees."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from autofix.config import Config
+from autofix.git_client import GitClient
+from autofix.models import FixSuggestion
+from autofix.worktree_pool import WorktreePool
+
+from .conftest import git
+
+
+@pytest.fixture
+def config(make_repo) -> Config:
+    work = make_repo({
+        "apps/web.yaml": "image: nginx:1.23.1\n",
+        "apps/cache.yaml": "image: redis:7.0.0\n",
+    })
+    return Config(
+        defectdojo_url="https://example.com",
+        defectdojo_api_key="test-key",
+        git_repo_path=work,
+        git_workers=2,
+    )
+
+
+def suggestions() -> list[FixSuggestion]:
+    return [
+        FixSuggestion(finding_id=1, current_image="nginx", current_tag="1.23.1", suggested_tag="1.23.4"),
+        FixSuggestion(finding_id=2, current_image="redis", current_tag="7.0.0", suggested_tag="7.0.14"),
+    ]
+
+
+def test_fixes_run_concurrently_in_separate_worktrees(config: Config, tmp_path: Path, monkeypatch):
+    # Both PRs must be in flight at once for the barrier to release
+    barrier = threading.Barrier(2, timeout=10)
+    seen = []
+
+    def create_pull_request(self, branch_name, title, body):
+        seen.append(self.repo_path)
+        barrier.wait()
+        return f"https://pr/{branch_name}"
+
+    monkeypatch.setattr(GitClient, "create_pull_request", create_pull_request)
+
+    with WorktreePool(config) as pool:
+        results = pool.apply_all(suggestions())
+
+    assert [r.error for r in results] == ["", ""]
+    assert all(r.success for r in results)
+    assert len(set(seen)) == 2
+    remote = tmp_path / "remote.git"
+    assert git(remote, "show", f"{results[0].branch_name}:apps/web.yaml") == "image: nginx:1.23.4"
+    assert git(remote, "show", f"{results[1].branch_name}:apps/cache.yaml") == "image: redis:7.0.14"
+    # The main checkout never moved
+    assert git(config.git_repo_path, "rev-parse", "--abbrev-ref", "HEAD") == "main"
+    assert git(config.git_repo_path, "status", "--porcelain") == ""
+
+
+def test_worktrees_are_reused_between_runs(config: Config, monkeypatch):
+    monkeypatch.setattr(GitClient, "create_pull_request", lambda self, branch, title, body: "https://pr")
+    WorktreePool(config).apply_all(suggestions())
+    worker = config.git_repo_path / ".git/autofix/worktrees/worker-0"
+    (worker / "leftover.yaml").write_text("image: nginx:1.23.1\n")
+
+    pool = WorktreePool(config)
+    clients = pool.clients()
+
+    assert [c.repo_path for c in clients] == [worker, worker.with_name("worker-1")]
+    assert not (worker / "leftover.yaml").exists()
+    assert len(git(config.git_repo_path, "worktree", "list").splitlines()) == 3
+
+
+def test_close_releases_clients_and_forge(config: Config, monkeypatch):
+    monkeypatch.setattr(GitClient, "create_pull_request", lambda self, branch, title, body: "https://pr")
+    closed = []
+    monkeypatch.setattr(GitClient, "close", lambda self: closed.append(self.repo_path))
+
+    with WorktreePool(config) as pool:
+        pool.apply_all(suggestions())
+        workers = [c.repo_path for c in pool.clients()]
+
+    assert closed == [*workers, config.git_repo_path]